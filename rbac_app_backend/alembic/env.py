@@ -15,7 +15,7 @@ from app.db.base_class import Base
 from app.core.config import settings
 
 # Explicitly import all models so Alembic can detect them
-from app.models import users, module, permission, user_permission
+from app.models import users, module, permission, user_permission, job, app_meta
 
 # Alembic configuration
 config = context.config
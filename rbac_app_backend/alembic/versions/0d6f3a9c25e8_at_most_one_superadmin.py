@@ -0,0 +1,53 @@
+"""At most one superadmin
+
+Revision ID: 0d6f3a9c25e8
+Revises: 4c8e2b7d1a93
+Create Date: 2025-08-26 15:02:37.510284
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0d6f3a9c25e8'
+down_revision: Union[str, Sequence[str], None] = '4c8e2b7d1a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Signup checks for a superadmin and inserts in separate transactions (the
+    # connection is released while bcrypt runs), so only a unique index stops
+    # two concurrent signups. It also serves the superadmin-exists check, which
+    # makes ix_users_superadmin redundant. Fails if a race already produced two
+    # superadmins: remove one first.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uix_users_one_superadmin',
+            'users',
+            ['role'],
+            unique=True,
+            postgresql_where=sa.text("role = 'superadmin'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index('ix_users_superadmin', table_name='users', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_superadmin',
+            'users',
+            ['id'],
+            unique=False,
+            postgresql_where=sa.text("role = 'superadmin'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index('uix_users_one_superadmin', table_name='users', postgresql_concurrently=True, if_exists=True)
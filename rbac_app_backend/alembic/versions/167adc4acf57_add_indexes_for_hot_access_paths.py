@@ -0,0 +1,60 @@
+"""Add indexes for hot access paths
+
+Revision ID: 167adc4acf57
+Revises: 7f319ec7213d
+Create Date: 2025-08-21 14:03:52.118640
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '167adc4acf57'
+down_revision: Union[str, Sequence[str], None] = '7f319ec7213d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, partial-index predicate). user_id and
+# (user_id, module_id) lookups are already served by the leading columns of
+# uix_user_module_permission. The is_active predicates are spelled exactly as
+# the queries filter (`IS TRUE`/`IS FALSE`) so the planner can match them.
+INDEXES = [
+    # Offboarding reassigns grants by assigner; ON DELETE SET NULL looks them up too
+    ('ix_user_permissions_assigned_by', 'user_permissions', ['assigned_by'], 'assigned_by IS NOT NULL'),
+    # Listing (role IN ..., ORDER BY id) and the superadmin-exists check
+    ('ix_users_role_active', 'users', ['role', 'id'], 'is_active IS TRUE'),
+    # Ownership checks, bulk delete, offboarding and the self-referencing FK
+    ('ix_users_created_by', 'users', ['created_by'], 'created_by IS NOT NULL'),
+    # The reaper's backlog of soft-deleted users
+    ('ix_users_inactive', 'users', ['id'], 'is_active IS FALSE'),
+    # The job runner's scan for claimable jobs
+    ('ix_jobs_claimable', 'jobs', ['id'], "status IN ('queued', 'running')"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run inside a transaction, and doesn't block writes.
+    # if_not_exists makes a retry after an interrupted build a no-op; an
+    # interrupted build leaves an INVALID index that must be dropped first.
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_where=sa.text(where),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,52 @@
+"""Email unique among active users
+
+Revision ID: 4c8e2b7d1a93
+Revises: e9c3a1f47b20
+Create Date: 2025-08-26 10:18:44.902361
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c8e2b7d1a93'
+down_revision: Union[str, Sequence[str], None] = 'e9c3a1f47b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Soft-deleted rows keep their email until the reaper purges them; only
+    # active users need unique emails. Build the new index before dropping
+    # the old one so uniqueness is enforced throughout.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uix_users_email_active',
+            'users',
+            ['email'],
+            unique=True,
+            postgresql_where=sa.text('is_active IS TRUE'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index('ix_users_email', table_name='users', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Fails while a soft-deleted user shares an email with an active one;
+    # let the reaper purge them first.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_email',
+            'users',
+            ['email'],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index('uix_users_email_active', table_name='users', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,30 @@
+"""Add soft delete columns to users
+
+Revision ID: 7f319ec7213d
+Revises: adf158422adf
+Create Date: 2025-08-19 09:41:07.526318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f319ec7213d'
+down_revision: Union[str, Sequence[str], None] = 'adf158422adf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('is_active', sa.Boolean(), server_default=sa.true(), nullable=False))
+    op.add_column('users', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'deleted_at')
+    op.drop_column('users', 'is_active')
@@ -0,0 +1,33 @@
+"""Add app_meta table
+
+Revision ID: b5d21e9f0c47
+Revises: 167adc4acf57
+Create Date: 2025-08-22 09:27:15.604913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d21e9f0c47'
+down_revision: Union[str, Sequence[str], None] = '167adc4acf57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('app_meta',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('value', sa.String(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('app_meta')
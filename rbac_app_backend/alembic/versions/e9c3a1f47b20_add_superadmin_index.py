@@ -0,0 +1,40 @@
+"""Add superadmin index
+
+Revision ID: e9c3a1f47b20
+Revises: b5d21e9f0c47
+Create Date: 2025-08-25 11:42:08.377215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9c3a1f47b20'
+down_revision: Union[str, Sequence[str], None] = 'b5d21e9f0c47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Signup's superadmin-exists check doesn't filter on is_active, so
+    # ix_users_role_active can't serve it; without this it scans all of users.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_superadmin',
+            'users',
+            ['id'],
+            unique=False,
+            postgresql_where=sa.text("role = 'superadmin'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_superadmin', table_name='users', postgresql_concurrently=True, if_exists=True)
@@ -4,9 +4,9 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.auth import LoginRequest, TokenResponse
 from app.services.auth_service import login_user
-from app.db.session import get_db
+from app.db.session import get_db, traffic_class, TrafficClass
 
-router = APIRouter(tags=["Auth"])
+router = APIRouter(tags=["Auth"], dependencies=[Depends(traffic_class(TrafficClass.auth))])
 
 @router.post("/login", response_model=TokenResponse)
 async def login(
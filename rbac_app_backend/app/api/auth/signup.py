@@ -4,9 +4,9 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.auth import SignupRequest, MessageResponse
 from app.services.auth_service import signup_superadmin
-from app.db.session import get_db
+from app.db.session import get_db, traffic_class, TrafficClass
 
-router = APIRouter(tags=["Auth"])
+router = APIRouter(tags=["Auth"], dependencies=[Depends(traffic_class(TrafficClass.auth))])
 
 @router.post("/signup", response_model=MessageResponse)
 async def signup(
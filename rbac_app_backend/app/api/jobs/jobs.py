@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db, read_only
+from app.core.dependencies import get_current_user
+from app.core.principal import Principal
+from app.schemas.job import BulkRevokeRequest, JobResponse
+from app.services.bulk_revoke_service import enqueue_bulk_revoke
+from app.services.job_service import get_job
+
+router = APIRouter(tags=["Background Jobs"])
+
+
+@router.post(
+    "/jobs/bulk-revoke",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Revoke module permissions from many users in the background"
+)
+async def bulk_revoke(
+    payload: BulkRevokeRequest,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    return await enqueue_bulk_revoke(payload, current_user, db)
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobResponse,
+    summary="Poll the status and progress of a background job",
+    dependencies=[Depends(read_only)],
+)
+async def read_job(
+    job_id: int,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    return await get_job(db, job_id, current_user)
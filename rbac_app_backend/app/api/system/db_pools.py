@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends
+
+from app.core.dependencies import get_superadmin_user
+from app.db.session import pool_stats
+
+router = APIRouter(tags=["System"])
+
+@router.get(
+    "/system/db-pools",
+    summary="Connection pool saturation per traffic class (superadmin only)",
+    dependencies=[Depends(get_superadmin_user)],
+)
+async def db_pools():
+    return pool_stats()
@@ -0,0 +1,48 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+
+from app.core.dependencies import get_superadmin_user
+from app.schemas.memory_trace_schema import SnapshotDiffResponse, StartTraceRequest, TraceStatus
+from app.services.memory_trace_service import memory_tracer
+
+router = APIRouter(
+    tags=["System"],
+    dependencies=[Depends(get_superadmin_user)],
+)
+
+@router.get(
+    "/system/memory/trace",
+    response_model=TraceStatus,
+    summary="tracemalloc status on this worker (superadmin only)",
+)
+async def read_trace():
+    return memory_tracer.status()
+
+@router.post(
+    "/system/memory/trace/start",
+    response_model=TraceStatus,
+    summary="Start tracing allocations; stops by itself after `duration` (superadmin only)",
+)
+async def start_trace(payload: StartTraceRequest):
+    return await memory_tracer.start(payload.frames, payload.duration)
+
+@router.post(
+    "/system/memory/trace/stop",
+    response_model=TraceStatus,
+    summary="Stop tracing allocations (superadmin only)",
+)
+async def stop_trace():
+    return memory_tracer.stop()
+
+@router.post(
+    "/system/memory/snapshots",
+    response_model=SnapshotDiffResponse,
+    summary="Snapshot and return the top allocation changes by file:line or file (superadmin only)",
+)
+async def take_snapshot(
+    group_by: Literal["lineno", "filename"] = Query("lineno"),
+    limit: int = Query(25, ge=1, le=200),
+    against: Literal["baseline", "previous"] = Query("baseline"),
+):
+    return await memory_tracer.diff(group_by, limit, against)
@@ -0,0 +1,21 @@
+import secrets
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+
+from app.core.config import settings
+
+router = APIRouter(tags=["System"])
+
+
+@router.get(
+    "/metrics",
+    summary="Prometheus metrics (bearer METRICS_TOKEN when configured)",
+    response_class=Response,
+)
+async def metrics(request: Request):
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}".encode()
+        if not secrets.compare_digest(request.headers.get("authorization", "").encode(), expected):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
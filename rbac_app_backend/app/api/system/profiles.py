@@ -0,0 +1,50 @@
+import asyncio
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse, PlainTextResponse
+
+from app.core.config import settings
+from app.core.dependencies import get_superadmin_user
+from app.core.profiling import create_profile_token, list_profiles, profile_path, to_callgrind
+from app.core.principal import Principal
+from app.schemas.profiling_schema import ProfileFormat, ProfileInfo, ProfileTokenResponse
+
+router = APIRouter(tags=["System"])
+
+@router.post(
+    "/system/profiles/token",
+    response_model=ProfileTokenResponse,
+    summary="Issue a short-lived token that profiles requests sent with X-Profile (superadmin only)",
+)
+async def issue_profile_token(current_user: Principal = Depends(get_superadmin_user)):
+    return ProfileTokenResponse(
+        token=create_profile_token(current_user.email),
+        expires_in=settings.PROFILE_TOKEN_MINUTES * 60,
+    )
+
+@router.get(
+    "/system/profiles",
+    response_model=List[ProfileInfo],
+    summary="Stored request profiles on this worker, newest first (superadmin only)",
+    dependencies=[Depends(get_superadmin_user)],
+)
+async def read_profiles():
+    return await asyncio.to_thread(list_profiles)
+
+@router.get(
+    "/system/profiles/{profile_id}",
+    summary="Download a request profile (superadmin only)",
+    dependencies=[Depends(get_superadmin_user)],
+)
+async def download_profile(profile_id: str, format: ProfileFormat = Query("callgrind")):
+    path = profile_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    if format == "pstats":
+        return FileResponse(path, media_type="application/octet-stream", filename=path.name)
+    body = await asyncio.to_thread(to_callgrind, path)
+    return PlainTextResponse(
+        body,
+        headers={"Content-Disposition": f'attachment; filename="callgrind.out.{profile_id}"'},
+    )
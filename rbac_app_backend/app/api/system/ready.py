@@ -0,0 +1,20 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.core.lifecycle import lifecycle
+
+router = APIRouter(tags=["health"])
+
+@router.get(
+    "/ready",
+    summary="Readiness: pools warmed and not draining",
+)
+async def ready():
+    body = {
+        "status": "ready" if lifecycle.ready else (
+            "draining" if lifecycle.stopping or lifecycle.draining else "starting"
+        ),
+        "time_to_ready_ms": lifecycle.time_to_ready_ms,
+        "in_flight": lifecycle.in_flight,
+    }
+    return JSONResponse(status_code=200 if lifecycle.ready else 503, content=body)
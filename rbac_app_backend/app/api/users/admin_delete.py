@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 
+from app.core.config import settings
+from app.db.fast_path import fetch_target_user
 from app.db.session import get_db
 from app.core.dependencies import get_current_user
 from app.models.users import User
+from app.core.principal import Principal
+from app.services.user_purge_service import soft_delete_user
 from app.schemas.permission import RoleEnum  # Ensure RoleEnum is defined
 
 router = APIRouter(tags=["Admin Deletion"])
@@ -17,7 +20,7 @@ router = APIRouter(tags=["Admin Deletion"])
 async def delete_admin(
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     # Ensure only Superadmin can delete admins
     if current_user.role != RoleEnum.superadmin:
@@ -26,9 +29,8 @@ async def delete_admin(
             detail="Only superadmins can delete admin users"
         )
 
-    # Fetch user by ID
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    # Fetch user by ID (role/ownership only; no entity load)
+    user = await fetch_target_user(db, user_id)
 
     if not user:
         raise HTTPException(
@@ -43,7 +45,24 @@ async def delete_admin(
             detail="Only admin users can be deleted via this route"
         )
 
-    await db.delete(user)
-    await db.commit()
+    if settings.USER_SOFT_DELETE:
+        # O(1): hide the account now, the reaper purges rows + grants later
+        if not await soft_delete_user(db, user_id):
+            # Deleted by a concurrent request since the check above
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+    else:
+        # ORM delete so the `creator` backref nulls out created_by on its users
+        entity = await db.get(User, user_id)
+        if entity is None:
+            # Deleted by a concurrent request since the check above
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        await db.delete(entity)
+        await db.commit()
 
     return {"message": f"Admin user with ID {user_id} has been deleted."}
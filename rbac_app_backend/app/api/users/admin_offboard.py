@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db
+from app.core.dependencies import get_current_user
+from app.core.principal import Principal
+from app.schemas.admin_offboard_schema import OffboardAdminRequest, OffboardAdminResponse
+from app.services.admin_offboard_service import offboard_admin
+
+router = APIRouter(tags=["Admin Deletion"])
+
+@router.post(
+    "/admins/{user_id}/offboard",
+    response_model=OffboardAdminResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Delete an admin and hand their users and grants to a successor (superadmin only)"
+)
+async def offboard_admin_view(
+    user_id: int,
+    payload: OffboardAdminRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    return await offboard_admin(user_id, payload.successor_id, current_user, db)
@@ -5,7 +5,7 @@ from app.schemas.permission import AssignPermissionRequest, UserPermissionsRespo
 from app.services.admin_permission_service import assign_permissions_to_admin
 from app.db.session import get_db
 from app.core.dependencies import get_current_user
-from app.models.users import User
+from app.core.principal import Principal
 
 router = APIRouter(tags=['Assign Permission only done by SuperAdmin'])
 
@@ -18,7 +18,7 @@ async def put_admin_permissions(
     id: int,
     payload: AssignPermissionRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     return await assign_permissions_to_admin(
         user_id=id,
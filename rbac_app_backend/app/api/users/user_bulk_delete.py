@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db
+from app.core.dependencies import get_current_user
+from app.core.principal import Principal
+from app.schemas.user_bulk_delete_schema import BulkDeleteUsersRequest, BulkDeleteUsersResponse
+from app.services.user_bulk_delete_service import bulk_delete_users
+
+router = APIRouter(tags=["User Deletion"])
+
+@router.post(
+    "/users/bulk-delete",
+    response_model=BulkDeleteUsersResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Delete many user accounts at once (admin only)"
+)
+async def bulk_delete_users_view(
+    payload: BulkDeleteUsersRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    return await bulk_delete_users(payload.user_ids, current_user, db)
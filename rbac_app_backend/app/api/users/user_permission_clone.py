@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, Path, Body
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db
+from app.core.dependencies import get_current_user
+from app.core.principal import Principal
+from app.schemas.user_permission_clone_schema import (
+    CloneUserPermissionsRequest,
+    CloneUserPermissionsResponse,
+)
+from app.services.user_permission_clone_service import clone_user_permissions
+
+router = APIRouter(tags=["Clone User Permissions"])
+
+@router.post(
+    "/users/{user_id}/permissions/clone-from/{source_id}",
+    response_model=CloneUserPermissionsResponse,
+)
+async def clone_user_permissions_view(
+    user_id: int = Path(..., description="User who receives the permissions"),
+    source_id: int = Path(..., description="Template user to copy permissions from"),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    return await clone_user_permissions(source_id, [user_id], current_user, db)
+
+@router.post(
+    "/users/permissions/clone-from/{source_id}",
+    response_model=CloneUserPermissionsResponse,
+)
+async def clone_user_permissions_many_view(
+    source_id: int = Path(..., description="Template user to copy permissions from"),
+    payload: CloneUserPermissionsRequest = Body(...),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    return await clone_user_permissions(source_id, payload.target_ids, current_user, db)
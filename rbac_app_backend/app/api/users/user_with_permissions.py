@@ -3,13 +3,15 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.db.session import get_db, read_only
 from app.core.dependencies import get_current_user
-from app.models.users import User, RoleEnum
+from app.models.users import RoleEnum
+from app.core.principal import Principal
 from app.schemas.get_all_users_with_permission import UserWithPermissionsResponse
 from app.services.user_with_permissions_service import get_users_with_permissions
 
-router = APIRouter(tags=["Admins & Users Permissions"])
+# Read-only: served from the replica when one is configured
+router = APIRouter(tags=["Admins & Users Permissions"], dependencies=[Depends(read_only)])
 
 
 @router.get(
@@ -18,7 +20,7 @@ router = APIRouter(tags=["Admins & Users Permissions"])
     summary="List all admins/users and their module permissions"
 )
 async def list_users_with_permissions(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     # Allow superadmins, admins, or the user themself
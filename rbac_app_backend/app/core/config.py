@@ -1,5 +1,12 @@
+import logging
+from typing import Dict, Literal, Optional
+
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
+logger = logging.getLogger(__name__)
+
+
 class Settings(BaseSettings):
     PROJECT_NAME: str = "RBAC App"
     API_V1_STR: str = "/api"
@@ -7,30 +14,225 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
 
-    POSTGRES_USER: str
-    POSTGRES_PASSWORD: str
-    POSTGRES_DB: str
+    # "postgresql", or "sqlite" for single-node edge installs (embedded file
+    # database, schema created from the models; no replica/PgBouncer/migrations)
+    DB_BACKEND: Literal["postgresql", "sqlite"] = "postgresql"
+
+    POSTGRES_USER: str = ""      # required with the postgresql backend
+    POSTGRES_PASSWORD: str = ""
+    POSTGRES_DB: str = ""
     POSTGRES_SERVER: str = "localhost"
     POSTGRES_PORT: str = "5432"
 
-    # Connection pool tuning
-    DB_POOL_SIZE: int = 50
-    DB_MAX_OVERFLOW: int = 100
+    # SQLite backend
+    SQLITE_PATH: str = "rbac.db"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000          # how long a writer waits for the write lock
+    SQLITE_CACHE_SIZE_KB: int = 65536           # page cache per connection
+    SQLITE_MMAP_SIZE: int = 268435456           # bytes memory-mapped for reads
+
+    # Connection pool tuning. Requests use the bulkhead pools below; the
+    # background pool serves jobs, the reaper, startup and scripts.
+    DB_BACKGROUND_POOL_SIZE: int = 5
+    DB_BACKGROUND_MAX_OVERFLOW: int = 5
+    # Deprecated, removed in the next release: these sized the one request
+    # pool before the bulkheads. If set, they size the background pool (unless
+    # the DB_BACKGROUND_ name is set too) and startup logs a warning.
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
     DB_POOL_TIMEOUT: int = 30
     DB_POOL_RECYCLE: int = 1800
     DB_STMT_TIMEOUT_MS: int = 0  # in milliseconds; 0 disables per-statement timeout
 
+    # Connection liveness: idle connections are validated in the background
+    # instead of pinging on every checkout. After a disconnect is seen, every
+    # checkout pings for DB_FAILOVER_PING_WINDOW seconds.
+    DB_POOL_PRE_PING: bool = False           # force the per-checkout ping permanently
+    DB_HEALTH_CHECK_INTERVAL: float = 15.0   # seconds between idle-connection sweeps; 0 disables
+    DB_FAILOVER_PING_WINDOW: float = 60.0
+
+    # Bulkheads: request traffic gets one pool per class so a login or list
+    # storm can't starve superadmin writes. Exhausted class → 503 after the timeout.
+    DB_AUTH_POOL_SIZE: int = 10
+    DB_AUTH_MAX_OVERFLOW: int = 10
+    DB_READ_POOL_SIZE: int = 20
+    DB_READ_MAX_OVERFLOW: int = 20
+    DB_WRITE_POOL_SIZE: int = 10
+    DB_WRITE_MAX_OVERFLOW: int = 10
+    DB_BULKHEAD_TIMEOUT: float = 2.0  # seconds to wait for a connection before 503
+
+    # PgBouncer (transaction pooling) in front of Postgres: no named prepared
+    # statements, and little or no local pooling (PgBouncer does the pooling)
+    DB_PGBOUNCER_MODE: bool = False
+    DB_PGBOUNCER_LOCAL_POOL_SIZE: int = 0  # 0 = NullPool; >0 caps each pool's idle size
+
+    # Startup / shutdown
+    DB_WARMUP_CONNECTIONS: int = 2       # connections opened per pool before serving (capped at pool size)
+    # On SIGTERM (app/core/lifecycle.py): /ready fails for SHUTDOWN_DRAIN_DELAY
+    # while requests are still served, then new ones get 503s and in-flight
+    # ones get SHUTDOWN_DRAIN_TIMEOUT; only then does the server stop.
+    SHUTDOWN_DRAIN_DELAY: float = 5.0    # seconds for the load balancer to notice /ready failing
+    SHUTDOWN_DRAIN_TIMEOUT: float = 20.0 # seconds to let in-flight requests finish before disposing pools
+
+    # Per-route request deadlines, keyed "METHOD /path/template" (as declared on
+    # the route). Over budget, the request is cancelled — in-flight queries
+    # included — and answered 504. Each transaction it opens gets
+    # statement_timeout/lock_timeout from the budget that's left.
+    ROUTE_DEADLINES_MS: Dict[str, int] = {
+        "POST /login": 3000,
+        "POST /signup": 5000,
+        "GET /users-with-permissions": 10000,
+        "GET /jobs/{job_id}": 1000,
+        "POST /jobs/bulk-revoke": 3000,
+        "POST /users/bulk-delete": 15000,
+        "POST /admins/{user_id}/offboard": 15000,
+    }
+    DEFAULT_ROUTE_DEADLINE_MS: int = 0  # unlisted routes; 0 = no deadline
+    DEADLINE_GRACE_MS: int = 100        # server-side statement_timeout slack past the deadline
+
+    # Prometheus metrics at GET /metrics. With METRICS_TOKEN set, scrapes must
+    # send "Authorization: Bearer <token>".
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: Optional[str] = None
+
+    # Per-request query accounting. SERVER_TIMING_ENABLED adds a Server-Timing
+    # header (db, hash, jwt, serialize, total); keep it off where response
+    # timings would help an attacker (e.g. telling unknown logins apart).
+    # Routes over their budget in ROUTE_QUERY_BUDGETS ("METHOD /path/template"
+    # -> max statements), or running one statement N_PLUS_ONE_THRESHOLD times,
+    # are logged; QUERY_BUDGET_ENFORCE (test mode) turns them into 500s,
+    # checked before each commit so an over-budget write is rolled back.
+    SERVER_TIMING_ENABLED: bool = False
+    QUERY_BUDGET_ENFORCE: bool = False
+    N_PLUS_ONE_THRESHOLD: int = 5  # 0 disables
+    # Budgets are the counts measured on Postgres 16 by
+    # perf/measure_query_budgets.py (soft and hard delete); the deadline's
+    # SET LOCAL isn't counted. Postgres only: SQLite inserts ORM rows one
+    # statement each, so there the checks are skipped and enforcing is refused.
+    ROUTE_QUERY_BUDGETS: Dict[str, int] = {
+        "POST /login": 1,
+        "POST /signup": 2,
+        "POST /admins/": 2,
+        "POST /users/": 2,
+        "GET /users-with-permissions": 2,
+        "PUT /admins/{id}/permissions": 7,
+        "PUT /users/{user_id}/permissions": 7,
+        "POST /users/{user_id}/permissions/clone-from/{source_id}": 3,
+        "POST /users/permissions/clone-from/{source_id}": 3,
+        "DELETE /users/{user_id}": 5,
+        "POST /users/bulk-delete": 2,
+        "DELETE /admins/{user_id}": 6,
+        "POST /admins/{user_id}/offboard": 6,
+        "POST /jobs/bulk-revoke": 6,
+        "GET /jobs/{job_id}": 2,
+        "GET /system/db-pools": 1,
+    }
+
+    # On-demand request profiling (app/core/profiling.py): superadmins get a
+    # short-lived token and send it as X-Profile on the request to profile.
+    PROFILING_ENABLED: bool = True
+    PROFILE_DIR: str = "profiles"       # per-worker storage for the stats files
+    PROFILE_MAX_FILES: int = 50         # oldest profiles are deleted beyond this
+    PROFILE_TOKEN_MINUTES: int = 10
+
+    # On-demand tracemalloc sessions (superadmin /system/memory/*), per worker
+    MEMORY_TRACE_MAX_SECONDS: int = 900      # hard cap; a session always stops by itself
+    MEMORY_TRACE_MAX_FRAMES: int = 25
+    MEMORY_SNAPSHOT_MIN_INTERVAL: int = 10   # seconds between snapshots
+
+    # Event-loop lag monitor (app/core/loop_monitor.py). Stalls longer than the
+    # threshold log the loop thread's stack; 0 interval = off. The sampling
+    # interval is capped at threshold / 4 so short stalls aren't missed (a
+    # larger value logs a warning); the default is that cap.
+    LOOP_MONITOR_INTERVAL: float = 0.0625
+    LOOP_BLOCK_THRESHOLD: float = 0.25
+    # asyncio debug mode: also logs each callback slower than the threshold (costly)
+    LOOP_DEBUG_SLOW_CALLBACKS: bool = False
+
+    # Principal/permission lookups straight on the pooled asyncpg connection,
+    # skipping the ORM (identity map, hydration, greenlet hop). Off = ORM path.
+    AUTH_FAST_PATH: bool = False
+
+    # Optional streaming replica for read-only routes (unset = everything on the primary)
+    POSTGRES_REPLICA_SERVER: Optional[str] = None
+    POSTGRES_REPLICA_PORT: Optional[str] = None  # defaults to POSTGRES_PORT
+    REPLICA_STICKY_SECONDS: int = 30  # how long a writer's watermark cookie pins reads
+
+    # Background jobs (bulk admin work off the request path)
+    JOB_WORKER_CONCURRENCY: int = 2   # jobs running at once per worker process
+    JOB_BATCH_SIZE: int = 500         # rows per batch/checkpoint
+    JOB_POLL_INTERVAL: int = 30       # seconds between scans for queued/orphaned jobs
+    JOB_STALE_AFTER: int = 120        # seconds without heartbeat before a running job is resumed elsewhere
+
+    # User deletion: soft delete marks the row inactive, a background reaper purges it later
+    USER_SOFT_DELETE: bool = True
+    USER_PURGE_INTERVAL: int = 60         # seconds between reaper runs
+    USER_PURGE_BATCH_SIZE: int = 200      # users purged per transaction
+    USER_PURGE_BATCH_PAUSE_MS: int = 100  # pause between batches to throttle load
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
 
+    @model_validator(mode="after")
+    def _map_deprecated_pool_settings(self):
+        for old, new in (
+            ("DB_POOL_SIZE", "DB_BACKGROUND_POOL_SIZE"),
+            ("DB_MAX_OVERFLOW", "DB_BACKGROUND_MAX_OVERFLOW"),
+        ):
+            value = getattr(self, old)
+            if value is None:
+                continue
+            if new in self.model_fields_set:
+                logger.warning("%s is deprecated and ignored: %s is set. Remove it.", old, new)
+                continue
+            setattr(self, new, value)
+            logger.warning(
+                "%s is deprecated and now sizes the background pool; request connections "
+                "come from the DB_AUTH_/DB_READ_/DB_WRITE_POOL_SIZE and _MAX_OVERFLOW "
+                "bulkheads. Rename it to %s.",
+                old, new,
+            )
+        return self
+
+    @model_validator(mode="after")
+    def _require_postgres_credentials(self):
+        if self.DB_BACKEND == "postgresql":
+            missing = [
+                name for name in ("POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DB")
+                if not getattr(self, name)
+            ]
+            if missing:
+                raise ValueError(f"{', '.join(missing)} must be set for the postgresql backend")
+        return self
+
+    @model_validator(mode="after")
+    def _budgets_are_postgres_only(self):
+        if self.QUERY_BUDGET_ENFORCE and self.DB_BACKEND == "sqlite":
+            raise ValueError(
+                "QUERY_BUDGET_ENFORCE needs the postgresql backend: ROUTE_QUERY_BUDGETS "
+                "are Postgres statement counts"
+            )
+        return self
+
     @property
     def DATABASE_URL(self) -> str:
+        if self.DB_BACKEND == "sqlite":
+            return f"sqlite+aiosqlite:///{self.SQLITE_PATH}"
         return (
             f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
             f"@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
+    @property
+    def REPLICA_DATABASE_URL(self) -> Optional[str]:
+        if not self.POSTGRES_REPLICA_SERVER or self.DB_BACKEND == "sqlite":
+            return None
+        return (
+            f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+            f"@{self.POSTGRES_REPLICA_SERVER}:{self.POSTGRES_REPLICA_PORT or self.POSTGRES_PORT}"
+            f"/{self.POSTGRES_DB}"
+        )
+
     @property
     def SERVER_SETTINGS(self) -> dict[str, str]:
         """Optional per-connection server settings for asyncpg."""
@@ -0,0 +1,85 @@
+# app/core/deadlines.py
+import asyncio
+import logging
+import time
+from typing import List, Optional, Tuple
+
+from starlette.responses import JSONResponse
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.db.session import request_deadline
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineMiddleware:
+    """
+    Enforces ROUTE_DEADLINES_MS. The request runs under `asyncio.timeout`;
+    when it expires the task is cancelled, which makes asyncpg send a cancel
+    for any query in flight (and the pool discards that connection), and the
+    client gets a 504. The deadline is also published to `request_deadline`
+    so each transaction gets a matching SET LOCAL statement_timeout.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._table: Optional[List[Tuple[BaseRoute, str, float]]] = None
+
+    def _build_table(self, routes) -> List[Tuple[BaseRoute, str, float]]:
+        configured = dict(settings.ROUTE_DEADLINES_MS)
+        table = []
+        for route in routes:
+            for method in getattr(route, "methods", None) or ():
+                ms = configured.pop(f"{method} {route.path}", None)
+                if ms:
+                    table.append((route, method, ms / 1000))
+        for key in configured:
+            logger.warning("ROUTE_DEADLINES_MS entry %r matches no route", key)
+        return table
+
+    def _budget(self, scope: Scope) -> float:
+        if self._table is None:
+            self._table = self._build_table(scope["app"].routes)
+        method, path = scope["method"], scope["path"]
+        for route, route_method, seconds in self._table:
+            if route_method == method and route.path_regex.match(path):
+                return seconds
+        return settings.DEFAULT_ROUTE_DEADLINE_MS / 1000
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        budget = self._budget(scope)
+        if budget <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_tracking(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        token = request_deadline.set(time.monotonic() + budget)
+        timeout = asyncio.timeout(budget)
+        try:
+            async with timeout:
+                await self.app(scope, receive, send_tracking)
+        except TimeoutError:
+            if not timeout.expired() or response_started:
+                raise
+            logger.warning(
+                "Deadline of %d ms exceeded: %s %s", budget * 1000, scope["method"], scope["path"]
+            )
+            response = JSONResponse(
+                status_code=504,
+                content={"detail": "Request deadline exceeded."},
+            )
+            await response(scope, receive, send)
+        finally:
+            request_deadline.reset(token)
@@ -1,13 +1,12 @@
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 
-from app.core.config import settings
+from app.core.security import decode_access_token
 from app.db.session import get_db
-from app.models.users import User
+from app.db.fast_path import fetch_principal
+from app.core.principal import Principal
 from app.schemas.create_admin import RoleEnum
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
@@ -15,33 +14,28 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
-) -> User:
+) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str | None = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
+    payload = decode_access_token(token)
+    email: str | None = payload.get("sub") if payload else None
+    if email is None:
         raise credentials_exception
 
-    result = await db.execute(
-        select(User).where(User.email == email)
-    )
-    user = result.scalar_one_or_none()
+    # Column projection, not the ORM entity: services only need id/role
+    user = await fetch_principal(db, email)
 
     if user is None:
         raise credentials_exception
     return user
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(current_user: Principal = Depends(get_current_user)) -> Principal:
     return current_user
 
-async def get_superadmin_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_superadmin_user(current_user: Principal = Depends(get_current_user)) -> Principal:
     if current_user.role != RoleEnum.superadmin:
         raise HTTPException(status_code=403, detail="Superadmin access required")
     return current_user
@@ -0,0 +1,147 @@
+# app/core/lifecycle.py
+"""
+Readiness and graceful shutdown.
+
+Draining has to start before the server stops accepting connections: by the
+time uvicorn runs the lifespan shutdown it has already closed its sockets
+and waited for open requests, so a drain there is never seen by a load
+balancer. `install_sigterm_drain` therefore takes over SIGTERM:
+
+  1. /ready answers 503 "draining" while requests are still served, for
+     SHUTDOWN_DRAIN_DELAY seconds, so the load balancer's health checks
+     take the worker out of rotation;
+  2. new requests get a 503 with `Connection: close`, in-flight ones get up
+     to SHUTDOWN_DRAIN_TIMEOUT to finish;
+  3. SIGTERM is handed back to the server, which stops as usual.
+
+A second SIGTERM skips straight to 3. Keep the orchestrator's grace period
+(e.g. Kubernetes terminationGracePeriodSeconds, 30 s by default) above
+delay + timeout. Where signals can't be handled here (not the main thread,
+Windows), use a preStop hook that sleeps for the delay instead.
+"""
+import asyncio
+import logging
+import signal
+import time
+from typing import Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class Lifecycle:
+    """Readiness and in-flight tracking for warmup and graceful drain."""
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.ready_at: Optional[float] = None
+        self.stopping = False  # SIGTERM received: not ready, still serving
+        self.draining = False  # refusing new requests
+        self.in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def ready(self) -> bool:
+        return self.ready_at is not None and not (self.stopping or self.draining)
+
+    @property
+    def time_to_ready_ms(self) -> Optional[float]:
+        if self.ready_at is None:
+            return None
+        return round((self.ready_at - self.started_at) * 1000, 1)
+
+    def mark_ready(self) -> None:
+        self.ready_at = time.monotonic()
+        logger.info("Ready to serve in %.0f ms", self.time_to_ready_ms)
+
+    def request_started(self) -> None:
+        self.in_flight += 1
+        self._idle.clear()
+
+    def request_finished(self) -> None:
+        self.in_flight -= 1
+        if self.in_flight == 0:
+            self._idle.set()
+
+    async def drain(self, timeout: float) -> None:
+        """Stop admitting requests and wait for in-flight ones, up to `timeout`."""
+        self.draining = True
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            logger.info("Drained in %.0f ms", (time.monotonic() - start) * 1000)
+        except asyncio.TimeoutError:
+            logger.warning("Drain timed out with %d request(s) still in flight", self.in_flight)
+
+
+lifecycle = Lifecycle()
+
+_drain_task: Optional[asyncio.Task] = None
+
+
+def install_sigterm_drain(delay: float, timeout: float) -> None:
+    """Drain on SIGTERM before the server stops accepting connections (see above)."""
+    loop = asyncio.get_running_loop()
+    previous = signal.getsignal(signal.SIGTERM)
+    try:
+        loop.add_signal_handler(signal.SIGTERM, _on_sigterm, loop, previous, delay, timeout)
+    except (NotImplementedError, RuntimeError, ValueError):
+        # Not the main thread (test clients) or no signal support
+        logger.info("SIGTERM drain not installed; drain relies on a preStop delay")
+
+
+def _on_sigterm(loop: asyncio.AbstractEventLoop, previous, delay: float, timeout: float) -> None:
+    global _drain_task
+    if lifecycle.stopping:
+        logger.warning("Second SIGTERM, stopping without waiting")
+        _hand_over(loop, previous)
+        return
+    lifecycle.stopping = True
+    logger.info("SIGTERM: not ready; draining in %.1f s", delay)
+    _drain_task = loop.create_task(_drain_then_stop(loop, previous, delay, timeout), name="sigterm-drain")
+
+
+async def _drain_then_stop(loop: asyncio.AbstractEventLoop, previous, delay: float, timeout: float) -> None:
+    await asyncio.sleep(delay)
+    await lifecycle.drain(timeout)
+    _hand_over(loop, previous)
+
+
+def _hand_over(loop: asyncio.AbstractEventLoop, previous) -> None:
+    # Give SIGTERM back to the server's own handler (uvicorn: stop serving,
+    # then the lifespan shutdown) and deliver it again
+    loop.remove_signal_handler(signal.SIGTERM)
+    signal.signal(signal.SIGTERM, previous if previous is not None else signal.SIG_DFL)
+    signal.raise_signal(signal.SIGTERM)
+
+
+class LifecycleMiddleware:
+    """
+    Counts in-flight HTTP requests; while draining, new ones get a 503 with
+    `Connection: close` so clients and load balancers move elsewhere.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if lifecycle.draining:
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Shutting down, please retry."},
+                headers={"Connection": "close", "Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+
+        lifecycle.request_started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            lifecycle.request_finished()
@@ -0,0 +1,113 @@
+# app/core/loop_monitor.py
+"""
+Event-loop lag and blocking-call detection.
+
+A task sleeps a short tick at a time and records how late it wakes up
+(event_loop_lag_seconds): that is how long every other coroutine in the
+worker was kept waiting. The tick is LOOP_MONITOR_INTERVAL, capped at a
+quarter of LOOP_BLOCK_THRESHOLD: the watchdog can only date a stall from
+the last tick, so a long tick would hide stalls that started just after
+one. A watchdog thread checks the task's heartbeat every half tick; when
+the loop has been stuck for LOOP_BLOCK_THRESHOLD it logs the loop
+thread's stack *while it is still blocked*, which points at the offending
+call (a bcrypt on the loop, a huge serialization...). Any stall longer
+than the threshold plus 1.5 ticks is caught wherever it starts.
+
+LOOP_DEBUG_SLOW_CALLBACKS turns on asyncio debug mode, which logs every
+callback/task step slower than the threshold after it finishes. Debug mode
+has real overhead; use it on one worker while investigating.
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from app.core.config import settings
+from app.core.metrics import EVENT_LOOP_BLOCKED, EVENT_LOOP_LAG
+
+logger = logging.getLogger(__name__)
+
+_STACK_LIMIT = 30  # innermost frames logged
+
+
+class LoopMonitor:
+    """
+    Measures event-loop lag and dumps the loop thread's stack when it blocks.
+    """
+
+    def __init__(self, interval: float, block_threshold: float, debug_slow_callbacks: bool):
+        self._interval = min(interval, block_threshold / 4) if interval > 0 else 0
+        if 0 < self._interval < interval:
+            logger.warning(
+                "LOOP_MONITOR_INTERVAL=%gs is above LOOP_BLOCK_THRESHOLD / 4; ticking at %gs",
+                interval, self._interval,
+            )
+        self._threshold = block_threshold
+        self._debug = debug_slow_callbacks
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat = time.monotonic()
+        self._beat = 0
+
+    async def start(self) -> None:
+        if self._interval <= 0:
+            return
+        loop = asyncio.get_running_loop()
+        if self._debug:
+            loop.set_debug(True)
+            loop.slow_callback_duration = self._threshold
+            logging.getLogger("asyncio").setLevel(logging.WARNING)
+
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._loop(), name="loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._watchdog:
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+
+    async def _loop(self) -> None:
+        while True:
+            expected = time.monotonic() + self._interval
+            await asyncio.sleep(self._interval)
+            now = time.monotonic()
+            EVENT_LOOP_LAG.observe(max(now - expected, 0.0))
+            self._heartbeat = now
+            self._beat += 1
+
+    def _watch(self) -> None:
+        reported_beat = -1
+        while not self._stopping.wait(self._interval / 2):
+            beat, heartbeat = self._beat, self._heartbeat
+            stalled = time.monotonic() - heartbeat - self._interval
+            if stalled < self._threshold or beat == reported_beat:
+                continue
+            reported_beat = beat  # once per stall
+            EVENT_LOOP_BLOCKED.inc()
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)[-_STACK_LIMIT:]) if frame else "(unavailable)\n"
+            logger.warning(
+                "Event loop blocked for %.0f ms so far; loop thread is at:\n%s",
+                stalled * 1000, stack,
+            )
+
+
+loop_monitor = LoopMonitor(
+    interval=settings.LOOP_MONITOR_INTERVAL,
+    block_threshold=settings.LOOP_BLOCK_THRESHOLD,
+    debug_slow_callbacks=settings.LOOP_DEBUG_SLOW_CALLBACKS,
+)
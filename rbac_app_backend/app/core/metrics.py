@@ -0,0 +1,143 @@
+# app/core/metrics.py
+"""
+Prometheus metrics, served at GET /metrics (app/api/system/metrics.py).
+
+The request path only pays for histogram observations (a lock and a few
+adds). In-flight requests and pool state are read when Prometheus scrapes.
+Metrics are per process: with several workers, scrape each one.
+"""
+import time
+from typing import Callable, Dict, Iterator, Tuple
+
+from prometheus_client import Counter, Gauge, Histogram, disable_created_metrics
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+from prometheus_client.registry import Collector
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.lifecycle import lifecycle
+
+# No *_created series: they double the scrape size and Prometheus ignores them
+disable_created_metrics()
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template and status",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 15),
+)
+
+REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests being served")
+REQUESTS_IN_FLIGHT.set_function(lambda: lifecycle.in_flight)
+
+DB_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time to get a connection from the pool (includes connecting)",
+    ["pool"],
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 2.5, 5),
+)
+
+PASSWORD_HASH_QUEUE = Gauge(
+    "password_hash_queue_depth", "bcrypt calls submitted but not yet running on a thread"
+)
+PASSWORD_HASH_WAIT = Histogram(
+    "password_hash_queue_wait_seconds",
+    "Time a bcrypt call waited for a thread",
+    buckets=(0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "bcrypt time per call, on the thread",
+    ["op"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.35, 0.5, 1, 2.5),
+)
+
+JWT_DECODE = Histogram(
+    "jwt_decode_duration_seconds",
+    "Access token decode and verification time",
+    ["outcome"],
+    buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005),
+)
+JWT_DECODE_VALID = JWT_DECODE.labels("valid")
+JWT_DECODE_INVALID = JWT_DECODE.labels("invalid")
+
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "How late the loop monitor's timer fired (app/core/loop_monitor.py)",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+EVENT_LOOP_BLOCKED = Counter(
+    "event_loop_blocked", "Stalls longer than LOOP_BLOCK_THRESHOLD (stack logged for each)"
+)
+
+# Anything else is labelled "OTHER" so junk methods can't mint new series
+HTTP_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+
+class PoolCollector(Collector):
+    """Pool gauges from `stats()` (app.db.session.pool_stats) at scrape time."""
+
+    def __init__(self, stats: Callable[[], Dict[str, dict]]):
+        self._stats = stats
+
+    def collect(self) -> Iterator[Metric]:
+        size = GaugeMetricFamily("db_pool_size", "Pool size (persistent connections)", labels=["pool"])
+        checked_out = GaugeMetricFamily("db_pool_checked_out", "Connections in use", labels=["pool"])
+        overflow = GaugeMetricFamily("db_pool_overflow", "Connections open beyond the pool size", labels=["pool"])
+        saturation = GaugeMetricFamily("db_pool_saturation", "checked_out / (size + max_overflow)", labels=["pool"])
+        rejected = CounterMetricFamily("db_pool_rejected", "Checkouts refused by the bulkhead", labels=["pool"])
+        for name, stats in self._stats().items():
+            rejected.add_metric([name], stats["rejected"])
+            if stats.get("pool") == "null":
+                continue
+            size.add_metric([name], stats["size"])
+            checked_out.add_metric([name], stats["checked_out"])
+            overflow.add_metric([name], stats["overflow"])
+            saturation.add_metric([name], stats["saturation"])
+        yield from (size, checked_out, overflow, saturation, rejected)
+
+
+class MetricsMiddleware:
+    """
+    Records REQUEST_LATENCY for every HTTP request, labelled with the route
+    template the router matched (so /users/7 and /users/8 share a series)
+    or "unmatched".
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        # (method, route, status) -> histogram child; skips labels() per request
+        self._series: Dict[Tuple[str, str, int], Histogram] = {}
+
+    def _observe(self, method: str, route: str, status: int, seconds: float) -> None:
+        key = (method, route, status)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = REQUEST_LATENCY.labels(method, route, str(status))
+        series.observe(seconds)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the (shared) scope
+            route = scope.get("route")
+            method = scope["method"]
+            self._observe(
+                method if method in HTTP_METHODS else "OTHER",
+                route.path if route is not None else "unmatched",
+                status,
+                time.perf_counter() - start,
+            )
@@ -0,0 +1,41 @@
+# app/core/principal.py
+from typing import Optional
+
+from app.schemas.create_admin import RoleEnum
+
+
+class UserRef:
+    """
+    A user as the auth and role checks see it: id, email, role, created_by.
+    Built from a column projection, so no hashed_password, no identity-map
+    entry and no lazy loads. Use the ORM `User` only where an entity is
+    actually needed (creating, ORM deletes).
+    """
+
+    __slots__ = ("id", "email", "role", "created_by")
+
+    def __init__(self, id: int, email: str, role: RoleEnum, created_by: Optional[int]):
+        self.id = id
+        self.email = email
+        self.role = role
+        self.created_by = created_by
+
+    @classmethod
+    def from_row(cls, row):
+        # (id, email, role, created_by) — role already a RoleEnum or its value
+        return cls(row[0], row[1], RoleEnum(row[2]), row[3])
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(id={self.id}, email={self.email!r}, role={self.role.value})"
+
+
+class Principal(UserRef):
+    """The authenticated caller (`get_current_user`)."""
+
+    __slots__ = ()
+
+
+class TargetUser(UserRef):
+    """A user a request acts on (role/ownership checks before a change)."""
+
+    __slots__ = ()
@@ -0,0 +1,189 @@
+# app/core/profiling.py
+"""
+On-demand profiling of single requests.
+
+A superadmin gets a short-lived profiling token (POST /system/profiles/token)
+and replays the slow request with `X-Profile: <token>`. That request runs
+under cProfile, the stats are saved in PROFILE_DIR and the response carries
+`X-Profile-Id`. GET /system/profiles/{id}?format=callgrind|pstats downloads
+them (callgrind for KCachegrind/QCachegrind, pstats for snakeviz/pstats).
+
+cProfile traces the event-loop thread, so other requests the worker serves
+meanwhile show up too: profile on a quiet worker, or read the tree from the
+route's handler down. Threads (bcrypt) aren't traced. One profile runs at a
+time per worker. Requests without the header only pay for a header scan.
+
+Profiling tokens are signed with a key derived from SECRET_KEY, so they
+can't be used as access tokens (or the other way round).
+"""
+import asyncio
+import cProfile
+import json
+import logging
+import pstats
+import re
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+_PROFILE_ID_RE = re.compile(r"^[0-9]{14}-[0-9a-f]{8}$")
+_TOKEN_SCOPE = "profile"
+
+
+def _signing_key() -> str:
+    return f"{settings.SECRET_KEY}:profiling"
+
+
+def create_profile_token(subject: str) -> str:
+    from jose import jwt
+
+    claims = {
+        "sub": subject,
+        "scope": _TOKEN_SCOPE,
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=settings.PROFILE_TOKEN_MINUTES),
+    }
+    return jwt.encode(claims, _signing_key(), algorithm=settings.ALGORITHM)
+
+
+def verify_profile_token(token: str) -> Optional[str]:
+    """Subject of a valid, unexpired profiling token; None otherwise."""
+    from jose import JWTError, jwt
+
+    try:
+        claims = jwt.decode(token, _signing_key(), algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    return claims.get("sub") if claims.get("scope") == _TOKEN_SCOPE else None
+
+
+def profile_dir() -> Path:
+    return Path(settings.PROFILE_DIR)
+
+
+def profile_path(profile_id: str) -> Optional[Path]:
+    """Path of a stored profile's stats, or None for a malformed/unknown id."""
+    if not _PROFILE_ID_RE.match(profile_id):
+        return None
+    path = profile_dir() / f"{profile_id}.prof"
+    return path if path.is_file() else None
+
+
+def list_profiles() -> List[Dict]:
+    profiles = []
+    for meta in sorted(profile_dir().glob("*.json"), reverse=True):
+        try:
+            profiles.append(json.loads(meta.read_text()))
+        except (OSError, ValueError):
+            continue
+    return profiles
+
+
+def _save(profile_id: str, profiler: cProfile.Profile, meta: Dict) -> None:
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(directory / f"{profile_id}.prof")
+    (directory / f"{profile_id}.json").write_text(json.dumps(meta))
+    # Keep the newest PROFILE_MAX_FILES
+    for old in sorted(directory.glob("*.json"), reverse=True)[settings.PROFILE_MAX_FILES:]:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".prof").unlink(missing_ok=True)
+
+
+def to_callgrind(path: Path) -> str:
+    """Convert saved cProfile stats to callgrind format (costs in microseconds)."""
+    stats = pstats.Stats(str(path)).stats
+
+    callees = defaultdict(list)
+    for callee, (_, _, _, _, callers) in stats.items():
+        for caller, (_, calls, _, cumulative) in callers.items():
+            callees[caller].append((callee, calls, cumulative))
+
+    def us(seconds: float) -> int:
+        return int(seconds * 1_000_000)
+
+    lines = ["version: 1", "creator: rbac_app cProfile", "events: Microseconds", ""]
+    for (filename, line, name), (_, _, self_time, _, _) in stats.items():
+        lines += [f"fl={filename}", f"fn={name}:{line}", f"{line} {us(self_time)}"]
+        for (c_filename, c_line, c_name), calls, cumulative in callees[(filename, line, name)]:
+            lines += [
+                f"cfl={c_filename}",
+                f"cfn={c_name}:{c_line}",
+                f"calls={calls} {c_line}",
+                f"{line} {us(cumulative)}",
+            ]
+        lines.append("")
+    return "\n".join(lines)
+
+
+class ProfilingMiddleware:
+    """Runs requests carrying a valid `X-Profile` token under cProfile."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._busy = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = next((v for k, v in scope["headers"] if k == PROFILE_HEADER), None)
+        if token is None:
+            await self.app(scope, receive, send)
+            return
+
+        subject = verify_profile_token(token.decode("latin-1"))
+        if subject is None:
+            response = JSONResponse(status_code=403, content={"detail": "Invalid or expired profiling token"})
+            await response(scope, receive, send)
+            return
+        if self._busy:
+            # cProfile can't nest; serve the request unprofiled
+            async def send_busy(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    MutableHeaders(scope=message).append("X-Profile-Id", "busy")
+                await send(message)
+
+            await self.app(scope, receive, send_busy)
+            return
+
+        profile_id = f"{datetime.now(timezone.utc):%Y%m%d%H%M%S}-{uuid4().hex[:8]}"
+        status = 500
+
+        async def send_with_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+            await send(message)
+
+        self._busy = True
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profiler.disable()
+            self._busy = False
+            meta = {
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status,
+                "wall_ms": round((time.perf_counter() - start) * 1000, 1),
+                "requested_by": subject,
+            }
+            logger.info("Profiled %s %s as %s (requested by %s)", meta["method"], meta["path"], profile_id, subject)
+            await asyncio.to_thread(_save, profile_id, profiler, meta)
@@ -0,0 +1,49 @@
+# app/core/read_your_writes.py
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.db.session import (
+    WATERMARK_COOKIE,
+    WATERMARK_HEADER,
+    replica_engine,
+    request_writes,
+)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Stamps responses of requests that committed a write with the primary's
+    WAL position right after that commit (read by the session on its own
+    connection), as a header and a short-lived cookie. `get_db` keeps
+    later read-only requests carrying it off the replica until it catches up.
+    A no-op when no replica is configured.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or replica_engine is None:
+            await self.app(scope, receive, send)
+            return
+
+        writes = {"lsn": None}
+        token = request_writes.set(writes)
+
+        async def send_with_watermark(message: Message) -> None:
+            lsn = writes["lsn"]
+            if message["type"] == "http.response.start" and lsn is not None:
+                headers = MutableHeaders(scope=message)
+                headers.append(WATERMARK_HEADER, lsn)
+                headers.append(
+                    "set-cookie",
+                    f"{WATERMARK_COOKIE}={lsn}; Max-Age={settings.REPLICA_STICKY_SECONDS}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_watermark)
+        finally:
+            request_writes.reset(token)
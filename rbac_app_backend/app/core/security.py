@@ -1,26 +1,95 @@
 # app/core/security.py
+import asyncio
+import time
 from datetime import datetime, timedelta
-from typing import Optional, Dict
+from functools import lru_cache
+from typing import Callable, Optional, Dict, TypeVar
 
-from jose import jwt
-from passlib.context import CryptContext
+from app.core.metrics import (
+    JWT_DECODE_INVALID,
+    JWT_DECODE_VALID,
+    PASSWORD_HASH_DURATION,
+    PASSWORD_HASH_QUEUE,
+    PASSWORD_HASH_WAIT,
+)
+from app.core.server_timing import record
 
 # Keep this module lightweight and free of app-internal imports at top-level.
-# (No imports from app.models, app.schemas, etc.)
+# (No imports from app.models, app.schemas, etc.; the metrics and timing
+# modules imported above are leaves.)
+# passlib and python-jose are imported on first use (or by `preload` once the
+# app is ready): together they are a sizeable share of worker import time.
 
-# In tests / load tests you can lower rounds:
-# pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=8)
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=None)
+def pwd_context():
+    from passlib.context import CryptContext
+
+    # In tests / load tests you can lower rounds:
+    # CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=8)
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def preload() -> None:
+    """Import the deferred dependencies ahead of the first request that needs them."""
+    import jose.jwt  # noqa: F401
+
+    pwd_context()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    # CPU-bound; call from a thread with asyncio.to_thread in async paths
-    return pwd_context.verify(plain_password, hashed_password)
+    # CPU-bound; async paths use verify_password_async
+    return pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    # CPU-bound; call from a thread with asyncio.to_thread in async paths
-    return pwd_context.hash(password)
+    # CPU-bound; async paths use get_password_hash_async
+    return pwd_context().hash(password)
+
+
+T = TypeVar("T")
+
+
+async def _run_bcrypt(op: str, fn: Callable[..., T], *args) -> T:
+    """
+    Run a bcrypt call on the default thread pool, tracking how many calls are
+    waiting for a thread and how long they wait and run.
+    """
+    submitted = time.perf_counter()
+    PASSWORD_HASH_QUEUE.inc()
+    queued = [True]
+
+    def dequeue() -> None:
+        # Exactly once: when a thread picks the call up, or when the caller
+        # is cancelled before that happens (list.pop is atomic)
+        try:
+            queued.pop()
+        except IndexError:
+            return
+        PASSWORD_HASH_QUEUE.dec()
+
+    def run() -> T:
+        dequeue()
+        started = time.perf_counter()
+        PASSWORD_HASH_WAIT.observe(started - submitted)
+        try:
+            return fn(*args)
+        finally:
+            PASSWORD_HASH_DURATION.labels(op).observe(time.perf_counter() - started)
+
+    try:
+        return await asyncio.to_thread(run)
+    finally:
+        dequeue()
+        record("hash", time.perf_counter() - submitted)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_bcrypt("verify", verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_bcrypt("hash", get_password_hash, password)
 
 
 def create_access_token(
@@ -34,9 +103,29 @@ def create_access_token(
     """
     # Lazy import eliminates circulars at import time
     from app.core.config import settings
+    from jose import jwt
 
     to_encode: Dict = {"sub": subject, "exp": datetime.utcnow() + expires_delta}
     if custom_claims:
         to_encode.update(custom_claims)
 
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def decode_access_token(token: str) -> Optional[Dict]:
+    """Claims of a valid, unexpired JWT; None for anything else."""
+    from app.core.config import settings
+    from jose import JWTError, jwt
+
+    start = time.perf_counter()
+    try:
+        claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        elapsed = time.perf_counter() - start
+        JWT_DECODE_INVALID.observe(elapsed)
+        record("jwt", elapsed)
+        return None
+    elapsed = time.perf_counter() - start
+    JWT_DECODE_VALID.observe(elapsed)
+    record("jwt", elapsed)
+    return claims
@@ -0,0 +1,185 @@
+# app/core/server_timing.py
+"""
+Per-request accounting of database round trips and time spent in the
+expensive steps (bcrypt, JWT, response rendering), reported in a
+`Server-Timing` header and checked against ROUTE_QUERY_BUDGETS.
+
+Statements are counted by engine events (app/db/session.py) and by the
+asyncpg fast path; the other steps record themselves through `record`.
+Nothing is collected outside a request handled by ServerTimingMiddleware.
+Tasks spawned from a request copy its context, so background work started
+there must use a fresh `contextvars.Context()` (see JobRunner.submit) or
+its statements are charged to the request.
+"""
+import logging
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTiming:
+    __slots__ = ("scope", "queries", "db", "hash", "jwt", "serialize", "statements", "committed_writes")
+
+    def __init__(self, scope: Optional[Scope] = None):
+        self.scope = scope
+        self.queries = 0
+        self.db = 0.0
+        self.hash = 0.0
+        self.jwt = 0.0
+        self.serialize = 0.0
+        self.statements: Dict[str, int] = {}
+        self.committed_writes = False  # set by app/db/session.py after a write commits
+
+    def header(self, total: float) -> str:
+        return ", ".join((
+            f'db;dur={self.db * 1000:.2f};desc="{self.queries} queries"',
+            f"hash;dur={self.hash * 1000:.2f}",
+            f"jwt;dur={self.jwt * 1000:.2f}",
+            f"serialize;dur={self.serialize * 1000:.2f}",
+            f"total;dur={total * 1000:.2f}",
+        ))
+
+    def repeated_statements(self, threshold: int) -> List[str]:
+        if threshold <= 0:
+            return []
+        return [sql for sql, count in self.statements.items() if count >= threshold]
+
+
+request_timing: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+
+def record_query(statement: str, seconds: float) -> None:
+    timing = request_timing.get()
+    if timing is None:
+        return
+    timing.queries += 1
+    timing.db += seconds
+    timing.statements[statement] = timing.statements.get(statement, 0) + 1
+
+
+def record(step: str, seconds: float) -> None:
+    """Add `seconds` to "hash", "jwt" or "serialize" for the current request."""
+    timing = request_timing.get()
+    if timing is not None:
+        setattr(timing, step, getattr(timing, step) + seconds)
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse that records its render time as "serialize"."""
+
+    def render(self, content) -> bytes:
+        start = time.perf_counter()
+        body = super().render(content)
+        record("serialize", time.perf_counter() - start)
+        return body
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def budget_violations(timing: RequestTiming) -> List[str]:
+    """The route's query budget and repeated statements, once routing has run."""
+    scope = timing.scope
+    route = scope.get("route") if scope is not None else None
+    if route is None or settings.DB_BACKEND != "postgresql":
+        return []  # budgets are Postgres counts
+    key = f"{scope['method']} {route.path}"
+    violations = []
+    budget = settings.ROUTE_QUERY_BUDGETS.get(key)
+    if budget is not None and timing.queries > budget:
+        violations.append(f"{key} ran {timing.queries} queries (budget {budget})")
+    for sql in timing.repeated_statements(settings.N_PLUS_ONE_THRESHOLD):
+        violations.append(
+            f"{key} ran the same statement {timing.statements[sql]} times: {' '.join(sql.split())[:200]}"
+        )
+    return violations
+
+
+def enforce_budget_before_commit() -> None:
+    """
+    Called by the session's before_commit hook (app/db/session.py): with
+    QUERY_BUDGET_ENFORCE, a request already over budget fails here, so its
+    transaction rolls back instead of committing and then answering 500.
+    """
+    timing = request_timing.get()
+    if timing is None or not settings.QUERY_BUDGET_ENFORCE:
+        return
+    violations = budget_violations(timing)
+    if violations:
+        raise QueryBudgetExceeded("; ".join(violations))
+
+
+class ServerTimingMiddleware:
+    """
+    Collects a RequestTiming per HTTP request. When the response starts it
+    adds the Server-Timing header (SERVER_TIMING_ENABLED) and checks the
+    route's query budget and repeated statements (likely N+1 loops), on
+    Postgres only. Over budget is logged; with QUERY_BUDGET_ENFORCE (test
+    mode) the response is replaced by a 500 naming the violation.
+
+    Enforcement never turns a committed write into a 500: each commit is
+    checked first (enforce_budget_before_commit) and rolls back when over
+    budget. A request that goes over only after committing its writes is
+    logged as an error and answered normally.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._keys_checked = False
+
+    def _check_keys(self, routes) -> None:
+        declared = {
+            f"{method} {route.path}"
+            for route in routes
+            for method in getattr(route, "methods", None) or ()
+        }
+        for key in settings.ROUTE_QUERY_BUDGETS:
+            if key not in declared:
+                logger.warning("ROUTE_QUERY_BUDGETS entry %r matches no route", key)
+        self._keys_checked = True
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if not self._keys_checked:
+            self._check_keys(scope["app"].routes)
+
+        timing = RequestTiming(scope)
+        token = request_timing.set(timing)
+        start = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                violations = budget_violations(timing)
+                for violation in violations:
+                    logger.warning("Query budget: %s", violation)
+                if violations and settings.QUERY_BUDGET_ENFORCE:
+                    if not timing.committed_writes:
+                        raise QueryBudgetExceeded("; ".join(violations))
+                    logger.error(
+                        "Query budget exceeded after the request committed its writes; not failing it: %s",
+                        "; ".join(violations),
+                    )
+                if settings.SERVER_TIMING_ENABLED:
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing", timing.header(time.perf_counter() - start)
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        except QueryBudgetExceeded as e:
+            response = JSONResponse(status_code=500, content={"detail": f"Query budget exceeded: {e}"})
+            await response(scope, receive, send)
+        finally:
+            request_timing.reset(token)
@@ -0,0 +1,20 @@
+# app/db/dialect.py
+"""
+Backend-specific constructs shared by PostgreSQL and the embedded SQLite
+mode. Both dialects implement INSERT ... ON CONFLICT and RETURNING with the
+same API, so callers only need the right `insert` for the configured backend.
+"""
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.core.config import settings
+
+insert = sqlite.insert if settings.DB_BACKEND == "sqlite" else postgresql.insert
+
+
+def partial(predicate: str) -> dict:
+    """Partial-index WHERE for both backends: `Index(..., **partial("..."))`."""
+    # SQLAlchemy renders is_(True)/is_(False) as IS 1/IS 0 on SQLite, whose
+    # planner only uses a partial index when the query repeats its terms
+    sqlite_predicate = predicate.replace("IS TRUE", "IS 1").replace("IS FALSE", "IS 0")
+    return {"postgresql_where": text(predicate), "sqlite_where": text(sqlite_predicate)}
@@ -0,0 +1,103 @@
+# app/db/fast_path.py
+"""
+Raw asyncpg fast path for the per-request authorization lookups.
+
+With AUTH_FAST_PATH on, these run directly on the asyncpg connection the
+request's session already holds (same pool, same bulkhead, same connection
+later ORM statements reuse) and return plain values / `UserRef` records.
+No identity map, no entity hydration, and no greenlet hop per statement.
+
+Off, or on a non-asyncpg driver, each helper runs the equivalent registry
+statement through the session, so callers don't branch.
+"""
+import time
+from typing import Any, Optional, Set
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.principal import Principal, TargetUser
+from app.core.server_timing import record_query
+from app.db.statements import (
+    HAS_ANY_GRANT_ON_MODULE,
+    MODULE_ACTIONS_FOR_USER,
+    PRINCIPAL_BY_EMAIL,
+    TARGET_USER_BY_ID,
+)
+
+# Must stay equivalent to the registry statements they shadow
+_PRINCIPAL_BY_EMAIL_SQL = (
+    "SELECT id, email, role::text, created_by FROM users "
+    "WHERE email = $1 AND is_active IS TRUE"
+)
+_TARGET_USER_BY_ID_SQL = (
+    "SELECT id, email, role::text, created_by FROM users "
+    "WHERE id = $1 AND is_active IS TRUE"
+)
+_MODULE_ACTIONS_SQL = (
+    "SELECT p.action FROM permissions p "
+    "JOIN user_permissions up ON up.permission_id = p.id "
+    "WHERE up.user_id = $1 AND up.module_id = $2"
+)
+_HAS_GRANT_SQL = (
+    "SELECT 1 FROM user_permissions WHERE user_id = $1 AND module_id = $2 LIMIT 1"
+)
+
+
+def _enabled(db: AsyncSession) -> bool:
+    return settings.AUTH_FAST_PATH and db.bind.dialect.driver == "asyncpg"
+
+
+async def _driver_connection(db: AsyncSession):
+    # Checks out (or reuses) the session's pooled connection; the asyncpg
+    # connection underneath is only ever used by this request.
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    return raw.driver_connection
+
+
+async def _run(db: AsyncSession, method: str, sql: str, *args) -> Any:
+    """`fetchrow`/`fetch`/`fetchval` on the driver connection; counted like ORM statements."""
+    pg = await _driver_connection(db)
+    start = time.perf_counter()
+    try:
+        return await getattr(pg, method)(sql, *args)
+    finally:
+        record_query(sql, time.perf_counter() - start)
+
+
+async def fetch_principal(db: AsyncSession, email: str) -> Optional[Principal]:
+    if not _enabled(db):
+        row = (await db.execute(PRINCIPAL_BY_EMAIL, {"email": email})).first()
+    else:
+        row = await _run(db, "fetchrow", _PRINCIPAL_BY_EMAIL_SQL, email)
+    return Principal.from_row(row) if row is not None else None
+
+
+async def fetch_target_user(db: AsyncSession, user_id: int) -> Optional[TargetUser]:
+    """Active user by id, or None (soft-deleted users count as missing)."""
+    if not _enabled(db):
+        row = (await db.execute(TARGET_USER_BY_ID, {"user_id": user_id})).first()
+    else:
+        row = await _run(db, "fetchrow", _TARGET_USER_BY_ID_SQL, user_id)
+    return TargetUser.from_row(row) if row is not None else None
+
+
+async def fetch_module_actions(db: AsyncSession, user_id: int, module_id: int) -> Set[str]:
+    if not _enabled(db):
+        result = await db.execute(
+            MODULE_ACTIONS_FOR_USER, {"user_id": user_id, "module_id": module_id}
+        )
+        return set(result.scalars().all())
+
+    return {row[0] for row in await _run(db, "fetch", _MODULE_ACTIONS_SQL, user_id, module_id)}
+
+
+async def has_grant_on_module(db: AsyncSession, user_id: int, module_id: int) -> bool:
+    if not _enabled(db):
+        result = await db.execute(
+            HAS_ANY_GRANT_ON_MODULE, {"user_id": user_id, "module_id": module_id}
+        )
+        return result.first() is not None
+
+    return await _run(db, "fetchval", _HAS_GRANT_SQL, user_id, module_id) is not None
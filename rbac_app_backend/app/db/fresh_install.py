@@ -0,0 +1,73 @@
+# app/db/fresh_install.py
+"""
+Schema for a fresh PostgreSQL install.
+
+`alembic upgrade head` can't bring up an empty database: the first revisions
+(790c5b5433e1 -> 956c2e9932f6) build tables that aa2e49d60f91 creates again,
+so the released chain only replays from there. A fresh install instead gets
+the schema from the models and is stamped at the current head; every later
+revision then applies with `alembic upgrade head` as usual. The test template
+(tests/db_template.py) is built the same way, and its check_schema_sync keeps
+the models equal to what the migration chain produces.
+
+Refuses to touch a database that already has tables.
+
+Run (from the project root): python -m app.db.fresh_install
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.db.base_class import Base
+from app.models import users, module, permission, user_permission, job, app_meta  # noqa: F401  (register tables)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def migration_head() -> str:
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config(str(PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_ROOT / "alembic"))
+    return ScriptDirectory.from_config(config).get_current_head()
+
+
+async def create_schema(conn: AsyncConnection, head: str) -> None:
+    """Create every table from the models and stamp `alembic_version` at `head`."""
+    await conn.run_sync(Base.metadata.create_all)
+    await conn.execute(text(
+        "CREATE TABLE alembic_version ("
+        "version_num VARCHAR(32) NOT NULL CONSTRAINT alembic_version_pkc PRIMARY KEY)"
+    ))
+    await conn.execute(text("INSERT INTO alembic_version VALUES (:v)"), {"v": head})
+
+
+async def _main() -> int:
+    from app.core.config import settings
+    from app.db.session import engine
+
+    if settings.DB_BACKEND != "postgresql":
+        print("Only for the postgresql backend; SQLite creates its schema at startup")
+        return 2
+    try:
+        async with engine.begin() as conn:
+            tables = await conn.scalar(text(
+                "SELECT count(*) FROM pg_tables WHERE schemaname = current_schema()"
+            ))
+            if tables:
+                print(f"{settings.POSTGRES_DB} already has {tables} table(s); use `alembic upgrade head`")
+                return 1
+            head = migration_head()
+            await create_schema(conn, head)
+    finally:
+        await engine.dispose()
+    print(f"{settings.POSTGRES_DB}: schema created, stamped at {head}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main()))
@@ -0,0 +1,134 @@
+# app/db/health.py
+"""
+Connection liveness without a ping on every checkout.
+
+- `PoolHealthChecker` periodically cycles each pool's idle connections
+  through a `SELECT 1`; a dead one raises a disconnect error, which makes
+  SQLAlchemy drop it (and invalidate the rest of that pool).
+- Any disconnect, seen by the checker or by a request, opens a failover
+  window: for DB_FAILOVER_PING_WINDOW seconds every checkout from that pool
+  is pinged first, so requests don't land on stale connections while the
+  database comes back. A query cancelled by a deadline or at shutdown also
+  discards its connection, but says nothing about the database and opens
+  no window.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.db.session import NoIdleConnection, all_engines, pool_probe
+
+logger = logging.getLogger(__name__)
+
+# Pool name -> time.monotonic() until which checkouts are pinged
+_ping_until: Dict[str, float] = {}
+
+
+def _open_failover_window(name: str) -> None:
+    if _ping_until.get(name, 0) < time.monotonic():
+        logger.warning(
+            "Disconnect on the %s pool; pinging checkouts for %.0fs",
+            name, settings.DB_FAILOVER_PING_WINDOW,
+        )
+    _ping_until[name] = time.monotonic() + settings.DB_FAILOVER_PING_WINDOW
+
+
+def _install(name: str, eng: AsyncEngine) -> None:
+    sync_engine = eng.sync_engine
+
+    @event.listens_for(sync_engine, "handle_error")
+    def detect_disconnect(context):
+        if context.is_disconnect and not isinstance(context.original_exception, asyncio.CancelledError):
+            _open_failover_window(name)
+
+    if settings.DB_POOL_PRE_PING:
+        return  # the pool already pings every checkout
+
+    @event.listens_for(sync_engine, "checkout")
+    def ping_during_failover(dbapi_connection, connection_record, connection_proxy):
+        if _ping_until.get(name, 0) < time.monotonic():
+            return
+        try:
+            sync_engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            # The pool discards this connection and retries with a fresh one
+            raise exc.DisconnectionError(f"Connection failed ping: {e}") from e
+
+
+for _name, _engine in all_engines().items():
+    _install(_name, _engine)
+
+
+class PoolHealthChecker:
+    """
+    Validates idle pooled connections in the background.
+    """
+
+    def __init__(self, interval: float):
+        self._interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._interval > 0:
+            self._task = asyncio.create_task(self._loop(), name="pool-health-checker")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def check_pool(self, name: str, eng: AsyncEngine) -> int:
+        """Ping each connection idle right now, one at a time; returns how many were dead."""
+        pool = eng.sync_engine.pool
+        if isinstance(pool, NullPool):
+            return 0
+        dead = 0
+        seen = set()
+        token = pool_probe.set(True)
+        try:
+            # The queue is FIFO: each probe takes the oldest idle connection
+            # and returns it to the back, so the sweep is over when one comes
+            # round again, or as soon as none is idle. Probes hold at most one
+            # connection away from requests, never wait and never overflow.
+            while True:
+                try:
+                    async with eng.connect() as conn:
+                        dbapi_connection = (await conn.get_raw_connection()).dbapi_connection
+                        if dbapi_connection in seen:
+                            break
+                        seen.add(dbapi_connection)
+                        await conn.exec_driver_sql("SELECT 1")
+                except NoIdleConnection:
+                    break
+                except exc.DBAPIError as e:
+                    if not e.connection_invalidated:
+                        raise
+                    dead += 1
+        finally:
+            pool_probe.reset(token)
+        return dead
+
+    async def run_once(self) -> Dict[str, int]:
+        return {name: await self.check_pool(name, eng) for name, eng in all_engines().items()}
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                dead = {name: n for name, n in (await self.run_once()).items() if n}
+                if dead:
+                    logger.warning("Evicted dead pooled connections: %s", dead)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Pool health check failed; retrying")
+
+
+pool_health_checker = PoolHealthChecker(interval=settings.DB_HEALTH_CHECK_INTERVAL)
@@ -1,10 +1,23 @@
 # app/db/init_db.py
 
-from app.db.session import AsyncSessionLocal
+import hashlib
+import json
+import logging
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.schema import CreateIndex
+
+from app.core.config import settings
+from app.db.base_class import Base
+from app.db.dialect import insert
+from app.db.session import AsyncSessionLocal, engine
+from app.models import users, module, permission, user_permission, job  # noqa: F401  (register tables)
+from app.models.app_meta import AppMeta
 from app.models.module import Module
 from app.models.permission import Permission
-from sqlalchemy.future import select
-import logging
+
+logger = logging.getLogger(__name__)
 
 # Define the global permission actions
 valid_actions = ["add", "edit", "delete", "view"]
@@ -12,23 +25,95 @@ valid_actions = ["add", "edit", "delete", "view"]
 # Define the module names you want in the system
 module_names = ["MQTT", "S7", "RDBMS" , "Reports" , "Devices" , "Users" ,"Dashboard"]
 
+CATALOG_HASH_KEY = "catalog_hash"
+
+# Indexes the models used to declare; dropped from existing SQLite files
+RETIRED_SQLITE_INDEXES = (
+    "ix_users_email",       # now uix_users_email_active
+    "ix_users_superadmin",  # now uix_users_one_superadmin
+)
+
+
+def sync_sqlite_indexes(conn) -> None:
+    """
+    create_all skips tables that already exist, their indexes included. Create
+    the indexes an existing file is missing, rebuild those whose definition
+    changed, and drop the retired ones.
+    """
+    existing = dict(conn.exec_driver_sql(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"
+    ).all())
+    for name in RETIRED_SQLITE_INDEXES:
+        if name in existing:
+            conn.exec_driver_sql(f"DROP INDEX {name}")
+            logger.info("Dropped retired index %s", name)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            ddl = str(CreateIndex(index).compile(conn)).strip()
+            if existing.get(index.name) == ddl:
+                continue
+            if index.name in existing:
+                conn.exec_driver_sql(f"DROP INDEX {index.name}")
+            index.create(conn)
+            logger.info("Built index %s", index.name)
+
+
+def catalog_hash() -> str:
+    catalog = {"modules": sorted(module_names), "actions": sorted(valid_actions)}
+    return hashlib.sha256(json.dumps(catalog).encode()).hexdigest()
+
+
 async def init_db():
+    """
+    Seed modules and permissions. Runs on every worker start, so the common
+    case is one query: when the stored catalog hash matches this code's
+    catalog, there is nothing to do. Otherwise one idempotent insert per
+    table (safe when several workers start at once), then the hash.
+    With the SQLite backend the schema is created here as well.
+    """
+    start = time.perf_counter()
+    if settings.DB_BACKEND == "sqlite":
+        # No Alembic for the embedded file: the models are the schema
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(sync_sqlite_indexes)
+
+    expected = catalog_hash()
     async with AsyncSessionLocal() as session:
-        # Insert modules if not already present
-        for name in module_names:
-            result = await session.execute(select(Module).where(Module.name == name))
-            module = result.scalar_one_or_none()
-            if not module:
-                session.add(Module(name=name))
-                logging.info(f"Added module: {name}")
-
-        # Insert only the 4 global permissions once
-        for action in valid_actions:
-            result = await session.execute(select(Permission).where(Permission.action == action))
-            permission = result.scalar_one_or_none()
-            if not permission:
-                session.add(Permission(action=action))
-                logging.info(f"Added permission: {action}")
+        stored = await session.scalar(
+            select(AppMeta.value).where(AppMeta.key == CATALOG_HASH_KEY)
+        )
+        if stored == expected:
+            logger.info(
+                "Catalog unchanged, seeding skipped (%.1f ms)", (time.perf_counter() - start) * 1000
+            )
+            return
+
+        modules = await session.execute(
+            insert(Module)
+            .values([{"name": name} for name in module_names])
+            .on_conflict_do_nothing(index_elements=[Module.name])
+            .returning(Module.name)
+        )
+        permissions = await session.execute(
+            insert(Permission)
+            .values([{"action": action} for action in valid_actions])
+            .on_conflict_do_nothing(index_elements=[Permission.action])
+            .returning(Permission.action)
+        )
+        added_modules, added_actions = modules.scalars().all(), permissions.scalars().all()
 
+        meta = insert(AppMeta).values(key=CATALOG_HASH_KEY, value=expected)
+        await session.execute(
+            meta.on_conflict_do_update(
+                index_elements=[AppMeta.key],
+                set_={"value": meta.excluded.value, "updated_at": func.now()},
+            )
+        )
         await session.commit()
-        logging.info("Database initialization complete.")
+
+    if added_modules:
+        logger.info("Added modules: %s", ", ".join(added_modules))
+    if added_actions:
+        logger.info("Added permissions: %s", ", ".join(added_actions))
+    logger.info("Database initialization complete (%.1f ms)", (time.perf_counter() - start) * 1000)
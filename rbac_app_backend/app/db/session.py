@@ -1,43 +1,450 @@
 # app/db/session.py
-from typing import AsyncGenerator
+import logging
+import re
+import time
+from contextvars import ContextVar
+from enum import Enum
+from functools import lru_cache
+from typing import AsyncGenerator, Callable, Dict, Optional
+from uuid import uuid4
 
+from fastapi import Request
+from sqlalchemy import event, exc, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     create_async_engine,
 )
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from sqlalchemy.util import queue as sqla_queue
 
 from app.core.config import settings
+from app.core.metrics import DB_CHECKOUT_WAIT
+from app.core.server_timing import enforce_budget_before_commit, record_query, request_timing
 
-# Build server_settings dict (only include stmt timeout if set)
+logger = logging.getLogger(__name__)
+
+# Build server_settings dict (only include stmt timeout if set).
+# PgBouncer rejects startup parameters other than application_name & co, so in
+# that mode set statement_timeout on the role instead (ALTER ROLE ... SET).
 server_settings = {"application_name": "rbac_app"}
-if settings.DB_STMT_TIMEOUT_MS > 0:
+if settings.DB_STMT_TIMEOUT_MS > 0 and not settings.DB_PGBOUNCER_MODE:
     server_settings["statement_timeout"] = str(settings.DB_STMT_TIMEOUT_MS)
 
-# Create the async engine with tuned pools
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=False,
-    future=True,
-    pool_size=settings.DB_POOL_SIZE,
-    max_overflow=settings.DB_MAX_OVERFLOW,
-    pool_timeout=settings.DB_POOL_TIMEOUT,
-    pool_recycle=settings.DB_POOL_RECYCLE,
-    pool_pre_ping=True,
-    connect_args={"server_settings": server_settings},
+SQLITE = settings.DB_BACKEND == "sqlite"
+
+# Per connection. WAL lets readers run alongside the writer; NORMAL sync is
+# durable at checkpoints and skips an fsync per commit; foreign_keys is off by
+# default in SQLite and the ON DELETE CASCADE/SET NULL rules depend on it.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA foreign_keys=ON",
+    f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+    f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}",
+    f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+    "PRAGMA temp_store=MEMORY",
 )
 
-# One session factory for all your dependencies
-AsyncSessionLocal = sessionmaker(
-    bind=engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autoflush=False,
+
+class TrafficClass(str, Enum):
+    auth = "auth"    # login / signup
+    read = "read"    # listing, polling (replica-eligible)
+    write = "write"  # everything else
+
+
+class BulkheadRejected(Exception):
+    """A traffic class's pool stayed exhausted for DB_BULKHEAD_TIMEOUT."""
+
+    def __init__(self, traffic_class: str):
+        super().__init__(f"Database pool for '{traffic_class}' traffic is saturated")
+        self.traffic_class = traffic_class
+
+
+class NoIdleConnection(Exception):
+    """A pool probe found no idle connection to borrow."""
+
+
+# Rejections per class since start (read by pool_stats)
+bulkhead_rejections: Dict[str, int] = {c.value: 0 for c in TrafficClass}
+
+# Set while the health checker borrows idle connections: a probe checkout
+# takes an idle connection or raises NoIdleConnection; it never waits, never
+# opens an overflow connection, and stays out of the checkout-wait and
+# rejection metrics.
+pool_probe: ContextVar[bool] = ContextVar("pool_probe", default=False)
+
+
+@lru_cache(maxsize=None)
+def _checkout_wait(traffic_class: str):
+    return DB_CHECKOUT_WAIT.labels(traffic_class)
+
+
+class TimedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records checkout wait time (DB_CHECKOUT_WAIT)."""
+
+    traffic_class = "default"
+
+    def _do_get(self):
+        if pool_probe.get():
+            try:
+                return self._pool.get(False)
+            except sqla_queue.Empty:
+                raise NoIdleConnection() from None
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            _checkout_wait(self.traffic_class).observe(time.perf_counter() - start)
+
+
+class BulkheadPool(TimedPool):
+    """Queue pool that fails fast with BulkheadRejected instead of TimeoutError."""
+
+    def _do_get(self):
+        try:
+            return super()._do_get()
+        except exc.TimeoutError as e:
+            bulkhead_rejections[self.traffic_class] += 1
+            raise BulkheadRejected(self.traffic_class) from e
+
+
+def _make_engine(
+    url: str,
+    pool_size: int = settings.DB_BACKGROUND_POOL_SIZE,
+    max_overflow: int = settings.DB_BACKGROUND_MAX_OVERFLOW,
+    pool_timeout: float = settings.DB_POOL_TIMEOUT,
+    traffic_class: Optional[TrafficClass] = None,
+    pgbouncer: bool = settings.DB_PGBOUNCER_MODE,
+) -> AsyncEngine:
+    sqlite = url.startswith("sqlite")
+    connect_args: dict = {} if sqlite else {"server_settings": server_settings}
+    pool_args: dict = {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": pool_timeout,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "poolclass": TimedPool,
+    }
+    if traffic_class is not None:
+        # A subclass per class so the label survives pool.recreate()
+        pool_args["poolclass"] = type(
+            f"{traffic_class.value.title()}BulkheadPool",
+            (BulkheadPool,),
+            {"traffic_class": traffic_class.value},
+        )
+
+    if pgbouncer and not sqlite:
+        # Transaction pooling hands each transaction a different server
+        # connection: named, cached prepared statements would go missing.
+        # Disable both caches and give every prepare a unique name.
+        connect_args.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid4()}__",
+        )
+        if settings.DB_PGBOUNCER_LOCAL_POOL_SIZE <= 0:
+            # PgBouncer pools; class quotas are then enforced by its pool limits
+            pool_args = {"poolclass": NullPool}
+        else:
+            # Keep a few warm client connections; overflow still bounds the class
+            pool_args["pool_size"] = min(pool_size, settings.DB_PGBOUNCER_LOCAL_POOL_SIZE)
+
+    # Create the async engine with tuned pools
+    eng = create_async_engine(
+        url,
+        echo=False,
+        future=True,
+        connect_args=connect_args,
+        **pool_args,
+    )
+    if sqlite:
+        @event.listens_for(eng.sync_engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in SQLITE_PRAGMAS:
+                cursor.execute(pragma)
+            cursor.close()
+    return eng
+
+
+# (pool_size, max_overflow) per pool
+_POOL_LIMITS = {
+    "default": (settings.DB_BACKGROUND_POOL_SIZE, settings.DB_BACKGROUND_MAX_OVERFLOW),
+    TrafficClass.auth.value: (settings.DB_AUTH_POOL_SIZE, settings.DB_AUTH_MAX_OVERFLOW),
+    TrafficClass.read.value: (settings.DB_READ_POOL_SIZE, settings.DB_READ_MAX_OVERFLOW),
+    TrafficClass.write.value: (settings.DB_WRITE_POOL_SIZE, settings.DB_WRITE_MAX_OVERFLOW),
+}
+if SQLITE:
+    # SQLite has one writer at a time: a single connection per writing pool
+    # queues writers in-process instead of spinning on busy_timeout.
+    _POOL_LIMITS["default"] = _POOL_LIMITS[TrafficClass.write.value] = (1, 0)
+
+
+# Default engine: background jobs, the reaper, startup seeding, scripts
+engine = _make_engine(settings.DATABASE_URL, *_POOL_LIMITS["default"])
+
+# Request traffic, one bulkhead per class. Reads go to the replica when configured.
+class_engines: Dict[TrafficClass, AsyncEngine] = {
+    TrafficClass.auth: _make_engine(
+        settings.DATABASE_URL,
+        *_POOL_LIMITS[TrafficClass.auth.value],
+        settings.DB_BULKHEAD_TIMEOUT,
+        TrafficClass.auth,
+    ),
+    TrafficClass.read: _make_engine(
+        settings.REPLICA_DATABASE_URL or settings.DATABASE_URL,
+        *_POOL_LIMITS[TrafficClass.read.value],
+        settings.DB_BULKHEAD_TIMEOUT,
+        TrafficClass.read,
+    ),
+    TrafficClass.write: _make_engine(
+        settings.DATABASE_URL,
+        *_POOL_LIMITS[TrafficClass.write.value],
+        settings.DB_BULKHEAD_TIMEOUT,
+        TrafficClass.write,
+    ),
+}
+
+# Read replica: the read class engine, only when configured
+replica_engine: Optional[AsyncEngine] = (
+    class_engines[TrafficClass.read] if settings.REPLICA_DATABASE_URL else None
 )
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+
+def _sessionmaker(bind: AsyncEngine) -> sessionmaker:
+    return sessionmaker(
+        bind=bind,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autoflush=False,
+    )
+
+
+# Session factory for work outside requests
+AsyncSessionLocal = _sessionmaker(engine)
+
+# One session factory per traffic class for your dependencies
+ClassSessionLocal: Dict[TrafficClass, sessionmaker] = {
+    traffic_class: _sessionmaker(class_engine)
+    for traffic_class, class_engine in class_engines.items()
+}
+
+
+def all_engines() -> Dict[str, AsyncEngine]:
+    return {"default": engine, **{c.value: e for c, e in class_engines.items()}}
+
+
+async def dispose_engines() -> None:
+    """Close every pooled connection (shutdown)."""
+    for eng in all_engines().values():
+        await eng.dispose()
+
+
+_MAX_OVERFLOW = {name: max_overflow for name, (_, max_overflow) in _POOL_LIMITS.items()}
+
+
+def pool_stats() -> Dict[str, dict]:
+    """Point-in-time saturation of every pool."""
+    stats = {}
+    for name, eng in all_engines().items():
+        pool = eng.sync_engine.pool
+        if isinstance(pool, NullPool):
+            stats[name] = {"pool": "null", "rejected": bulkhead_rejections.get(name, 0)}
+            continue
+        size = pool.size()
+        capacity = size + _MAX_OVERFLOW[name]
+        checked_out = pool.checkedout()
+        stats[name] = {
+            "size": size,
+            "max_overflow": _MAX_OVERFLOW[name],
+            "checked_out": checked_out,
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "saturation": round(checked_out / capacity, 3) if capacity else 0.0,
+            "rejected": bulkhead_rejections.get(name, 0),
+        }
+    return stats
+
+
+# --- Read-your-writes watermark ---
+# After a request commits a write, the client gets the primary's WAL position
+# (header + cookie). Read-only requests carrying it stay on the primary until
+# the replica has replayed past that position.
+WATERMARK_HEADER = "X-DB-Watermark"
+WATERMARK_COOKIE = "rbac_db_watermark"
+_LSN_RE = re.compile(r"^[0-9A-Fa-f]{1,8}/[0-9A-Fa-f]{1,8}$")
+
+# Per-request {"lsn": ...}, filled in when a session commits a write (set by middleware)
+request_writes: ContextVar[Optional[dict]] = ContextVar("request_writes", default=None)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "before_commit")
+def _check_query_budget(session):
+    enforce_budget_before_commit()
+
+
+@event.listens_for(Session, "after_begin")
+def _remember_connection(session, transaction, connection):
+    session.info["connection"] = connection
+
+
+def _commit_lsn(connection) -> Optional[str]:
+    # Runs after COMMIT on the connection that committed, before the session
+    # releases it, so the position covers the commit record. A failure costs
+    # the watermark, not the response: the write is already saved.
+    if connection is None or connection.dialect.name != "postgresql":
+        return None
+    try:
+        return connection.exec_driver_sql(
+            "SELECT pg_current_wal_lsn()::text",
+            execution_options={"query_budget_exempt": True},
+        ).scalar()
+    except Exception:
+        logger.warning("Could not read the WAL position after a write; sending no watermark", exc_info=True)
+        return None
+
+
+@event.listens_for(Session, "after_commit")
+def _track_commit(session):
+    connection = session.info.pop("connection", None)
+    if session.info.pop("wrote", False):
+        writes = request_writes.get()
+        if writes is not None:
+            lsn = _commit_lsn(connection)
+            if lsn is not None:
+                writes["lsn"] = lsn
+        timing = request_timing.get()
+        if timing is not None:
+            timing.committed_writes = True
+
+
+# --- Per-request query accounting (set by ServerTimingMiddleware) ---
+# Statements run with the "query_budget_exempt" execution option (driver
+# bookkeeping such as the deadline's SET LOCAL) aren't counted.
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _query_started(conn, cursor, statement, parameters, context, executemany):
+    if request_timing.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _query_finished(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    if context.execution_options.get("query_budget_exempt"):
+        return
+    record_query(statement, elapsed)
+
+
+@event.listens_for(Engine, "handle_error")
+def _query_failed(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+# --- Per-request deadline (set by DeadlineMiddleware) ---
+# time.monotonic() by which the current request must finish, or None
+request_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_deadline(session, transaction, connection):
+    deadline = request_deadline.get()
+    if deadline is None or connection.dialect.name != "postgresql":
+        return
+    remaining_ms = max(int((deadline - time.monotonic()) * 1000), 1)
+    # Server-side backstop for when the client-side cancel can't reach the
+    # query; lock waits get half the budget so they fail as lock timeouts.
+    # set_config(..., true) is SET LOCAL: it ends with this transaction.
+    connection.exec_driver_sql(
+        "SELECT set_config('statement_timeout', $1, true), set_config('lock_timeout', $2, true)",
+        (str(remaining_ms + settings.DEADLINE_GRACE_MS), str(max(remaining_ms // 2, 1))),
+        execution_options={"query_budget_exempt": True},
+    )
+
+
+def _request_watermark(request: Request) -> Optional[str]:
+    watermark = request.headers.get(WATERMARK_HEADER) or request.cookies.get(WATERMARK_COOKIE)
+    if watermark and _LSN_RE.match(watermark):
+        return watermark
+    return None
+
+
+async def _replica_caught_up(watermark: str) -> bool:
+    async with replica_engine.connect() as conn:
+        # NULL when the "replica" is not in recovery (e.g. promoted) — it is current
+        return await conn.scalar(
+            text("SELECT COALESCE(pg_last_wal_replay_lsn() >= CAST(:lsn AS pg_lsn), true)"),
+            {"lsn": watermark},
+        )
+
+
+def traffic_class(cls: TrafficClass) -> Callable[[Request], None]:
+    """
+    Route/router dependency picking the pool `get_db` draws from. Route-level
+    dependencies resolve before the endpoint's own parameters, so this is set
+    before `get_db` runs. Unmarked routes are `write`.
+    """
+    def dependency(request: Request) -> None:
+        request.state.db_traffic_class = cls
+    return dependency
+
+
+# Read-only routes: read pool, replica-eligible
+read_only = traffic_class(TrafficClass.read)
+
+
+async def _session_factory(request: Request) -> sessionmaker:
+    cls = getattr(request.state, "db_traffic_class", TrafficClass.write)
+    if cls is TrafficClass.read and replica_engine is not None:
+        watermark = _request_watermark(request)
+        if watermark is not None and not await _replica_caught_up(watermark):
+            # Caller must see its own writes: primary, on the write bulkhead
+            return ClassSessionLocal[TrafficClass.write]
+    return ClassSessionLocal[cls]
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
     FastAPI dependency — yields a session and always closes it.
+    The session is lazy: no pooled connection is checked out until the first
+    statement runs, and it goes back to the pool when the transaction ends.
+    The pool is chosen by the route's traffic class; read-only routes get the
+    replica unless the caller must see its own writes.
     """
-    async with AsyncSessionLocal() as session:
+    factory = await _session_factory(request)
+    async with factory() as session:
         yield session
+
+
+async def release_connection(session: AsyncSession) -> None:
+    """
+    End the session's transaction so its connection returns to the pool
+    before slow non-DB work (e.g. bcrypt in a thread). The session stays usable;
+    the next statement checks out a connection again.
+
+    Commits rather than rolls back: with expire_on_commit=False already-loaded
+    objects (like current_user) stay readable, whereas a rollback would expire
+    them. Only call it when there is nothing pending you'd want to discard.
+    """
+    if session.in_transaction():
+        await session.commit()
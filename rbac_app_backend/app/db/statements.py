@@ -0,0 +1,177 @@
+# app/db/statements.py
+"""
+Hot statements, built once at import instead of per request.
+
+Values are supplied at execution time through bound parameters, e.g.
+    await db.execute(PRINCIPAL_BY_EMAIL, {"email": email})
+so each request skips building the select() and SQLAlchemy reuses the same
+construct (and its memoized cache key) to find the compiled SQL.
+
+On asyncpg, every new pooled connection also prepares these statements up front
+(see `_prepare_on_connect`), so the first request on a fresh connection doesn't
+pay the server-side parse/plan round trip.
+"""
+import logging
+
+import asyncpg
+import sqlalchemy
+from sqlalchemy import bindparam, event, select
+from sqlalchemy.dialects.postgresql.asyncpg import AsyncAdapt_asyncpg_connection
+
+from app.core.config import settings
+from app.db.session import all_engines
+from app.models.users import User, RoleEnum
+from app.models.module import Module
+from app.models.permission import Permission
+from app.models.user_permission import UserPermission
+
+logger = logging.getLogger(__name__)
+
+# --- Principals / target users ---
+# Column projections: (id, email, role, created_by) -> UserRef.from_row
+USER_REF_COLUMNS = (User.id, User.email, User.role, User.created_by)
+
+PRINCIPAL_BY_EMAIL = select(*USER_REF_COLUMNS).where(
+    User.email == bindparam("email"),
+    User.is_active.is_(True),
+)
+
+TARGET_USER_BY_ID = select(*USER_REF_COLUMNS).where(
+    User.id == bindparam("user_id"),
+    User.is_active.is_(True),
+)
+
+# Login is the one lookup that needs the hash
+LOGIN_BY_EMAIL = select(User.email, User.role, User.hashed_password).where(
+    User.email == bindparam("email"),
+    User.is_active.is_(True),
+)
+
+SUPERADMIN_EXISTS = select(User.id).where(User.role == RoleEnum.superadmin).limit(1)
+
+# --- Permissions ---
+MODULE_ACTIONS_FOR_USER = (
+    select(Permission.action)
+    .join(UserPermission, UserPermission.permission_id == Permission.id)
+    .where(
+        UserPermission.user_id == bindparam("user_id"),
+        UserPermission.module_id == bindparam("module_id"),
+    )
+)
+
+HAS_ANY_GRANT_ON_MODULE = (
+    select(UserPermission.id)
+    .where(
+        UserPermission.user_id == bindparam("user_id"),
+        UserPermission.module_id == bindparam("module_id"),
+    )
+    .limit(1)
+)
+
+PERMISSIONS_BY_ACTIONS = select(Permission.id, Permission.action).where(
+    Permission.action.in_(bindparam("actions", expanding=True))
+)
+
+USER_PERMISSION_MATRIX = (
+    select(Module.name, Permission.action)
+    .join(UserPermission, UserPermission.module_id == Module.id)
+    .join(Permission, Permission.id == UserPermission.permission_id)
+    .where(UserPermission.user_id == bindparam("user_id"))
+)
+
+# --- Listing (LEFT JOINs so users without permissions still show up) ---
+def _users_with_permissions(user_filter):
+    return (
+        select(
+            User.id,
+            User.email,
+            User.role,
+            User.created_by,
+            Module.name.label("module_name"),
+            Permission.action.label("action"),
+        )
+        .select_from(User)
+        .outerjoin(UserPermission, User.id == UserPermission.user_id)
+        .outerjoin(Module, Module.id == UserPermission.module_id)
+        .outerjoin(Permission, Permission.id == UserPermission.permission_id)
+        .where(user_filter, User.is_active.is_(True))
+        .order_by(User.id)
+    )
+
+
+# Superadmins/admins: every admin and user
+USERS_WITH_PERMISSIONS = _users_with_permissions(User.role.in_([RoleEnum.admin, RoleEnum.user]))
+# Regular users: only their own row
+OWN_USER_WITH_PERMISSIONS = _users_with_permissions(User.id == bindparam("user_id"))
+
+
+# Prepared on every new connection. Statements with expanding IN parameters
+# are left out: their SQL text changes with the number of values.
+PREPARED_ON_CONNECT = (
+    PRINCIPAL_BY_EMAIL,
+    TARGET_USER_BY_ID,
+    LOGIN_BY_EMAIL,
+    SUPERADMIN_EXISTS,
+    MODULE_ACTIONS_FOR_USER,
+    HAS_ANY_GRANT_ON_MODULE,
+    USER_PERMISSION_MATRIX,
+    USERS_WITH_PERMISSIONS,
+    OWN_USER_WITH_PERMISSIONS,
+)
+
+
+def prepared_sql(dialect) -> list:
+    """SQL text of PREPARED_ON_CONNECT, exactly as execution renders it."""
+    # render_postcompile: a literal IN list (USERS_WITH_PERMISSIONS' roles)
+    # otherwise compiles to a "__[POSTCOMPILE_...]" placeholder Postgres rejects.
+    return [
+        str(stmt.compile(dialect=dialect, compile_kwargs={"render_postcompile": True}))
+        for stmt in PREPARED_ON_CONNECT
+    ]
+
+
+def _prepare_on_connect(engine) -> None:
+    sync_engine = engine.sync_engine
+    if sync_engine.dialect.driver != "asyncpg" or settings.DB_PGBOUNCER_MODE:
+        return  # nothing to warm: no per-connection statement cache
+
+    # SQLAlchemy has no public way to fill the adapter's statement cache, so
+    # this calls its private _prepare (the method the cursor uses). Refuse to
+    # start if it moved, rather than warn on every connection;
+    # tests/test_statements.py checks the cache is actually filled.
+    if not hasattr(AsyncAdapt_asyncpg_connection, "_prepare"):
+        raise RuntimeError(
+            f"SQLAlchemy {sqlalchemy.__version__}'s asyncpg adapter has no _prepare; "
+            "update app/db/statements.py for it"
+        )
+    sql_texts = prepared_sql(sync_engine.dialect)
+
+    @event.listens_for(sync_engine, "connect")
+    def prepare_hot_statements(dbapi_connection, connection_record):
+        # Runs inside SQLAlchemy's greenlet; fills the same LRU the cursor
+        # consults (keyed by SQL text), so later executions skip the prepare.
+        dbapi_connection.await_(_prepare_all(dbapi_connection, sql_texts))
+
+
+async def _prepare_all(dbapi_connection, sql_texts) -> None:
+    # Inside a transaction: a bare Parse/Describe leaves Postgres' statement
+    # timer running, so with statement_timeout set, the first statement after
+    # the connection idles that long fails. Prepared statements outlive the
+    # rollback.
+    raw = dbapi_connection.driver_connection
+    transaction = raw.transaction()
+    await transaction.start()
+    for sql in sql_texts:
+        try:
+            await dbapi_connection._prepare(sql, dbapi_connection._invalidate_schema_cache_asof)
+        except asyncpg.PostgresError:
+            # One statement Postgres rejects must not leave the rest
+            # unprepared. Anything else (the adapter changed) propagates.
+            logger.warning("Could not pre-prepare %s", sql.split("\n", 1)[0], exc_info=True)
+            await transaction.rollback()  # aborted; carry on in a fresh one
+            transaction = raw.transaction()
+            await transaction.start()
+    await transaction.rollback()
+
+for _engine in all_engines().values():
+    _prepare_on_connect(_engine)
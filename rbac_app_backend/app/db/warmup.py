@@ -0,0 +1,68 @@
+# app/db/warmup.py
+import asyncio
+import logging
+import time
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import NullPool
+
+from app.db.session import all_engines
+from app.db.statements import PREPARED_ON_CONNECT
+
+logger = logging.getLogger(__name__)
+
+# NULL for every request-supplied parameter: each statement runs, matches
+# nothing. Parameterless ones (e.g. the full listing) would do real work: skipped.
+_PRIME_PARAMS = [
+    (stmt, params)
+    for stmt in PREPARED_ON_CONNECT
+    if (params := {name: None for name, value in stmt.compile().params.items() if value is None})
+]
+
+
+async def _warm_engine(name: str, eng: AsyncEngine, connections: int) -> int:
+    pool = eng.sync_engine.pool
+    if isinstance(pool, NullPool):
+        return 0  # nothing kept between checkouts
+    connections = min(connections, pool.size())
+    if connections <= 0:
+        return 0
+
+    # Held concurrently so the pool really opens `connections` distinct ones;
+    # each runs the connect-time prepare from app.db.statements.
+    conns = await asyncio.gather(*(eng.connect() for _ in range(connections)))
+    try:
+        # Once per engine is enough to fill SQLAlchemy's compiled cache
+        for stmt, params in _PRIME_PARAMS:
+            await conns[0].execute(stmt, params)
+    finally:
+        for conn in conns:
+            await conn.close()
+    return connections
+
+
+async def warm_up_pools(connections: int) -> None:
+    """
+    Open up to `connections` connections per pool and prime the statement
+    caches before the first request, so it doesn't pay connect/auth/prepare.
+    Failures are logged, not raised: a cold pool still works.
+    """
+    if connections <= 0:
+        return
+    start = time.perf_counter()
+    engines = all_engines()
+    results = await asyncio.gather(
+        *(_warm_engine(name, eng, connections) for name, eng in engines.items()),
+        return_exceptions=True,
+    )
+    opened = {}
+    for name, result in zip(engines, results):
+        if isinstance(result, BaseException):
+            logger.warning("Warmup of the %s pool failed: %s", name, result)
+        else:
+            opened[name] = result
+    logger.info(
+        "Warmed pools in %.0f ms: %s",
+        (time.perf_counter() - start) * 1000,
+        ", ".join(f"{name}={n}" for name, n in opened.items()) or "none",
+    )
@@ -1,45 +1,137 @@
 
+import asyncio
+import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
+from prometheus_client import REGISTRY
 
 from app.core.config import settings
+from app.core.deadlines import DeadlineMiddleware
+from app.core.lifecycle import LifecycleMiddleware, install_sigterm_drain, lifecycle
+from app.core.loop_monitor import loop_monitor
+from app.core.metrics import MetricsMiddleware, PoolCollector
+from app.core.profiling import ProfilingMiddleware
+from app.core.server_timing import ServerTimingMiddleware, TimedJSONResponse
+from app.core.security import preload as preload_auth_deps
+from app.core.read_your_writes import ReadYourWritesMiddleware
 from app.db.init_db import init_db
+from app.db.session import BulkheadRejected, dispose_engines, pool_stats
+from app.db.health import pool_health_checker
+from app.db.warmup import warm_up_pools
+from app.services.job_service import job_runner
+from app.services.memory_trace_service import memory_tracer
+from app.services.user_purge_service import user_reaper
 
 # Routers
 from app.api.auth import login, signup
 from app.api.users.create_admins import router as create_admin
 from app.api.users.admin_permission_update import router as admin_manage_permission
 from app.api.users.admin_delete import router as delete_permission
+from app.api.users.admin_offboard import router as admin_offboard
 from app.api.users.create_user import router as create_user
 from app.api.users.user_with_permissions import router as users_with_permission
 from app.api.users.user_delete import router as users_permission_delete
+from app.api.users.user_bulk_delete import router as users_bulk_delete
 from app.api.users.user_permission_update import router as users_permission_update
+from app.api.users.user_permission_clone import router as users_permission_clone
+from app.api.jobs.jobs import router as jobs
+from app.api.system.db_pools import router as db_pools
+from app.api.system.ready import router as ready
+from app.api.system.profiles import router as profiles
+from app.api.system.memory import router as memory
+
+logger = logging.getLogger(__name__)
+
+
+def _log_preload_failure(future: asyncio.Future) -> None:
+    # Nothing awaits the preload; without this a broken passlib/jose install
+    # would only show up as the first login's 500
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Preloading auth dependencies failed", exc_info=future.exception())
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Measure event-loop lag and log the stack of anything blocking it
+    await loop_monitor.start()
+    # Pool gauges are read at scrape time; registered here so a second
+    # import of this module can't register them twice
+    pool_collector = PoolCollector(pool_stats) if settings.METRICS_ENABLED else None
+    if pool_collector is not None:
+        REGISTRY.register(pool_collector)
     # Initialize database, seed baseline data, etc.
     await init_db()
+    # Open connections and prime statement caches before the first request
+    await warm_up_pools(settings.DB_WARMUP_CONNECTIONS)
+    # Validate idle connections in the background (no per-checkout ping)
+    await pool_health_checker.start()
+    # Pick up queued jobs and resume any interrupted by the last shutdown
+    await job_runner.start()
+    # Purge soft-deleted users in the background
+    await user_reaper.start()
+    lifecycle.mark_ready()
+    # Drain on SIGTERM while the server still accepts connections
+    install_sigterm_drain(settings.SHUTDOWN_DRAIN_DELAY, settings.SHUTDOWN_DRAIN_TIMEOUT)
+    # Import passlib/jose in the background instead of before readiness
+    preload = asyncio.get_running_loop().run_in_executor(None, preload_auth_deps)
+    preload.add_done_callback(_log_preload_failure)
     yield
+    # Refuse new requests, let in-flight ones finish, then close the pools
+    # (a no-op after a SIGTERM drain; covers other shutdowns, e.g. SIGINT)
+    await lifecycle.drain(settings.SHUTDOWN_DRAIN_TIMEOUT)
+    memory_tracer.stop()
+    await user_reaper.stop()
+    await job_runner.stop()
+    await pool_health_checker.stop()
+    await dispose_engines()
+    if pool_collector is not None:
+        REGISTRY.unregister(pool_collector)
+    await loop_monitor.stop()
 
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version="1.0.0",
     lifespan=lifespan,
-   
+    default_response_class=TimedJSONResponse,
 )
 
+# Innermost, so timings cover the handler only and over-budget 500s keep CORS headers
+if settings.SERVER_TIMING_ENABLED or settings.QUERY_BUDGET_ENFORCE:
+    app.add_middleware(ServerTimingMiddleware)
+# Inside CORS, so a 504 still gets CORS headers
+app.add_middleware(DeadlineMiddleware)
+# Outside the deadline, so a profiled request's save isn't cut short
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"], 
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-DB-Watermark"],
 )
+app.add_middleware(ReadYourWritesMiddleware)
+# Counts every request for the shutdown drain
+app.add_middleware(LifecycleMiddleware)
+# Outermost: latency includes the other middlewares, drain 503s and deadline 504s
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# --- Bulkheads: an exhausted pool fails fast instead of queueing ---
+@app.exception_handler(BulkheadRejected)
+async def bulkhead_rejected_handler(request: Request, exc: BulkheadRejected):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Service busy, please retry."},
+        headers={"Retry-After": "1"},
+    )
+
 
 # --- Health ---
 @app.get("/", tags=["health"])
@@ -54,12 +146,25 @@ app.include_router(create_admin)
 app.include_router(users_with_permission)
 app.include_router(admin_manage_permission)
 app.include_router(delete_permission)
+app.include_router(admin_offboard)
 app.include_router(create_user)
 
 
 
 app.include_router(users_permission_delete)
+app.include_router(users_bulk_delete)
 app.include_router(users_permission_update)
+app.include_router(users_permission_clone)
+app.include_router(jobs)
+app.include_router(db_pools)
+app.include_router(ready)
+app.include_router(memory)
+if settings.METRICS_ENABLED:
+    from app.api.system.metrics import router as metrics
+
+    app.include_router(metrics)
+if settings.PROFILING_ENABLED:
+    app.include_router(profiles)
 
 
 # --- OpenAPI with BearerAuth only on protected endpoints ---
@@ -88,6 +193,8 @@ def custom_openapi():
         "/login",
         "/signup",
         "/",          
+        "/ready",
+        "/metrics",
         
     }
 
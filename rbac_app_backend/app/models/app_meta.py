@@ -0,0 +1,10 @@
+from sqlalchemy import Column, String, DateTime, func
+from app.db.base_class import Base
+
+class AppMeta(Base):
+    """Small key/value store for app-managed state (e.g. the seeded catalog's hash)."""
+    __tablename__ = "app_meta"
+
+    key = Column(String(64), primary_key=True)
+    value = Column(String, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, Text, JSON, DateTime, ForeignKey, Index, func
+from app.db.base_class import Base
+from app.db.dialect import partial
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    __table_args__ = (
+        Index("ix_jobs_claimable", "id", **partial("status IN ('queued', 'running')")),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(64), nullable=False)
+    status = Column(String(16), nullable=False, default="queued")
+    params = Column(JSON, nullable=False, default=dict)
+
+    # Progress + resume state (checkpoint is written in the same transaction as each batch)
+    total = Column(Integer, nullable=True)
+    processed = Column(Integer, nullable=False, default=0)
+    checkpoint = Column(JSON, nullable=True)
+
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+
+    created_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,11 +1,13 @@
-from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, ForeignKey, Index, UniqueConstraint
 from app.db.base_class import Base
+from app.db.dialect import partial
 
 class UserPermission(Base):
     __tablename__ = "user_permissions"
 
     __table_args__ = (
         UniqueConstraint("user_id", "module_id", "permission_id", name="uix_user_module_permission"),
+        Index("ix_user_permissions_assigned_by", "assigned_by", **partial("assigned_by IS NOT NULL")),
     )
 
     id = Column(Integer, primary_key=True, index=True)
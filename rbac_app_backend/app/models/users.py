@@ -1,17 +1,35 @@
-from sqlalchemy import Column, Integer, String, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Enum, ForeignKey, Boolean, DateTime, Index, true
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
+from app.db.dialect import partial
 from app.schemas.create_admin import RoleEnum
 
 class User(Base):
     __tablename__ = "users"
 
+    # Partial indexes (built CONCURRENTLY in migrations 167adc4acf57, 4c8e2b7d1a93
+    # and 0d6f3a9c25e8)
+    __table_args__ = (
+        # Unique among active users only: a soft-deleted user's email can be
+        # reused before the reaper purges the row
+        Index("uix_users_email_active", "email", unique=True, **partial("is_active IS TRUE")),
+        Index("ix_users_role_active", "role", "id", **partial("is_active IS TRUE")),
+        Index("ix_users_created_by", "created_by", **partial("created_by IS NOT NULL")),
+        Index("ix_users_inactive", "id", **partial("is_active IS FALSE")),
+        # At most one superadmin; also serves signup's superadmin-exists check
+        Index("uix_users_one_superadmin", "role", unique=True, **partial("role = 'superadmin'")),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     
-    email = Column(String, unique=True, index=True, nullable=False)
+    email = Column(String, nullable=False)
     hashed_password = Column(String, nullable=False)
     role = Column(Enum(RoleEnum), nullable=False)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
 
+    # Soft delete: inactive users are invisible to auth/listing until the reaper purges them
+    is_active = Column(Boolean, nullable=False, default=True, server_default=true())
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+
     created_users = relationship("User", remote_side=[id], backref="creator")
     
@@ -0,0 +1,14 @@
+from pydantic import BaseModel, ConfigDict
+
+class OffboardAdminRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    successor_id: int
+
+class OffboardAdminResponse(BaseModel):
+    message: str
+    admin_id: int
+    successor_id: int
+    reassigned_users: int
+    reassigned_grants: int
+    removed_grants: int
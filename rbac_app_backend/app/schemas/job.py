@@ -0,0 +1,51 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from app.schemas.permission import PermissionEnum
+
+
+class JobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+class JobResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    kind: str
+    status: JobStatus
+    total: Optional[int] = None
+    processed: int = 0
+    progress: Optional[float] = None  # 0..1, None while total is unknown
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_by: Optional[int] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class BulkRevokeRequest(BaseModel):
+    """
+    Revoke the given actions on one module from many users in the background.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    user_ids: List[int] = Field(min_length=1)
+    module_id: int
+    permissions: List[PermissionEnum] = Field(min_length=1)
+
+    @field_validator("user_ids")
+    @classmethod
+    def _dedupe_user_ids(cls, v: List[int]) -> List[int]:
+        return list(dict.fromkeys(v))
+
+    @field_validator("permissions")
+    @classmethod
+    def _dedupe_permissions(cls, v: List[PermissionEnum]) -> List[PermissionEnum]:
+        return list(dict.fromkeys(v))
@@ -0,0 +1,31 @@
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+class StartTraceRequest(BaseModel):
+    frames: int = Field(1, ge=1, description="Stack frames kept per allocation (more = slower)")
+    duration: int = Field(300, ge=10, description="Seconds before tracing stops by itself")
+
+class TraceStatus(BaseModel):
+    tracing: bool
+    frames: Optional[int] = None
+    started_at: Optional[float] = None  # unix time
+    stops_at: Optional[float] = None
+    snapshots: int
+    traced_current_bytes: int
+    traced_peak_bytes: int
+    tracemalloc_overhead_bytes: int
+
+class AllocationDiff(BaseModel):
+    file: str
+    line: Optional[int] = None  # None when grouped by file
+    size_diff_bytes: int
+    count_diff: int
+    size_bytes: int
+    count: int
+
+class SnapshotDiffResponse(TraceStatus):
+    against: Literal["baseline", "previous"]
+    group_by: Literal["lineno", "filename"]
+    total_size_diff_bytes: int
+    top: List[AllocationDiff]
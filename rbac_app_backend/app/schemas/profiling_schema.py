@@ -0,0 +1,18 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+class ProfileTokenResponse(BaseModel):
+    token: str
+    header: str = "X-Profile"
+    expires_in: int  # seconds
+
+class ProfileInfo(BaseModel):
+    id: str
+    method: str
+    path: str
+    status: int
+    wall_ms: float
+    requested_by: str
+
+ProfileFormat = Literal["callgrind", "pstats"]
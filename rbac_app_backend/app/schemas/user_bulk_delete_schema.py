@@ -0,0 +1,17 @@
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import List
+
+class BulkDeleteUsersRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    user_ids: List[int] = Field(min_length=1, max_length=10000)
+
+    @field_validator("user_ids")
+    @classmethod
+    def _dedupe_user_ids(cls, v: List[int]) -> List[int]:
+        return list(dict.fromkeys(v))
+
+class BulkDeleteUsersResponse(BaseModel):
+    message: str
+    deleted: List[int]
+    denied: List[int]  # not found, not a 'user', or not created by the caller
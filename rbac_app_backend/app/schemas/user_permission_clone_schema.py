@@ -0,0 +1,18 @@
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import List
+
+class CloneUserPermissionsRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    target_ids: List[int] = Field(min_length=1)
+
+    @field_validator("target_ids")
+    @classmethod
+    def _dedupe_target_ids(cls, v: List[int]) -> List[int]:
+        return list(dict.fromkeys(v))
+
+class CloneUserPermissionsResponse(BaseModel):
+    detail: str
+    source_id: int
+    target_ids: List[int]
+    cloned: int
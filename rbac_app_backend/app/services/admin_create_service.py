@@ -1,4 +1,3 @@
-import asyncio
 import logging
 
 from fastapi import HTTPException, status
@@ -7,7 +6,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from app.models.users import User, RoleEnum
-from app.core.security import get_password_hash
+from app.core.principal import Principal
+from app.core.security import get_password_hash_async
+from app.db.session import release_connection
 from app.schemas.create_admin import CreateAdminRequest
 
 logger = logging.getLogger(__name__)
@@ -15,7 +16,7 @@ logger = logging.getLogger(__name__)
 
 async def create_admin(
     data: CreateAdminRequest,
-    current_user: User,
+    current_user: Principal,
     db: AsyncSession,
 ) -> User:
     # 1) Authorization (prefer ==/!= for Enum comparison clarity)
@@ -30,9 +31,10 @@ async def create_admin(
     email = str(data.email)  # already lowercased by validator
     password = data.password
 
-    # 3) Hash password off the loop
+    # 3) Hash password off the loop (the auth lookup's connection goes back to the pool first)
+    await release_connection(db)
     try:
-        hashed_password = await asyncio.to_thread(get_password_hash, password)
+        hashed_password = await get_password_hash_async(password)
     except Exception as e:
         logger.error("Password hashing error", exc_info=e)
         raise HTTPException(
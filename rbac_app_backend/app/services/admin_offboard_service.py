@@ -0,0 +1,111 @@
+import logging
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.users import User, RoleEnum
+from app.core.principal import Principal
+from app.models.user_permission import UserPermission
+from app.schemas.admin_offboard_schema import OffboardAdminResponse
+
+logger = logging.getLogger(__name__)
+
+
+def offboard_statements(admin_id: int, successor_id: int):
+    """
+    The set-based offboarding, in execution order:
+    reassigned users, reassigned grants, removed grants, deleted admin.
+    """
+    return [
+        update(User)
+        .where(User.created_by == admin_id)
+        .values(created_by=successor_id),
+        update(UserPermission)
+        .where(UserPermission.assigned_by == admin_id)
+        .values(assigned_by=successor_id),
+        delete(UserPermission).where(UserPermission.user_id == admin_id),
+        delete(User).where(User.id == admin_id),
+    ]
+
+
+async def offboard_admin(
+    admin_id: int,
+    successor_id: int,
+    current_user: Principal,
+    db: AsyncSession,
+) -> OffboardAdminResponse:
+    """
+    Delete an admin without walking their dependents through the ORM:
+    everything they created or assigned moves to `successor_id`, their own
+    grants are dropped, all in one transaction.
+    """
+    # 1. Only superadmin
+    if current_user.role != RoleEnum.superadmin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only superadmins can delete admin users"
+        )
+
+    if admin_id == successor_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Successor must be a different user."
+        )
+
+    try:
+        # 2. Lock the admin row so nothing new can reference it mid-offboarding
+        result = await db.execute(
+            select(User.id, User.role)
+            .where(User.id.in_([admin_id, successor_id]), User.is_active.is_(True))
+            .with_for_update()
+        )
+        roles = {uid: role for uid, role in result.all()}
+
+        if admin_id not in roles:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        if roles[admin_id] != RoleEnum.admin:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Only admin users can be offboarded via this route"
+            )
+        if successor_id not in roles:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Successor not found")
+        if roles[successor_id] not in (RoleEnum.admin, RoleEnum.superadmin):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Successor must be an admin or superadmin."
+            )
+
+        # 3. Four set-based statements, one commit
+        counts = []
+        for stmt in offboard_statements(admin_id, successor_id):
+            counts.append((await db.execute(stmt)).rowcount or 0)
+        await db.commit()
+
+    except HTTPException:
+        await db.rollback()
+        raise
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.error("DB error offboarding admin", exc_info=e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database error during offboarding."
+        )
+
+    reassigned_users, reassigned_grants, removed_grants, _ = counts
+    logger.info(
+        "Superadmin %s offboarded admin %s to %s (%d users, %d grants reassigned; %d grants removed)",
+        current_user.id, admin_id, successor_id, reassigned_users, reassigned_grants, removed_grants
+    )
+
+    return OffboardAdminResponse(
+        message=f"Admin user with ID {admin_id} has been offboarded to {successor_id}.",
+        admin_id=admin_id,
+        successor_id=successor_id,
+        reassigned_users=reassigned_users,
+        reassigned_grants=reassigned_grants,
+        removed_grants=removed_grants,
+    )
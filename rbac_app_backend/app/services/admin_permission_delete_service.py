@@ -7,9 +7,11 @@ from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException, status
 
 from app.models.users import User, RoleEnum
+from app.core.principal import Principal
+from app.db.fast_path import fetch_target_user
 from app.models.module import Module
-from app.models.permission import Permission
 from app.models.user_permission import UserPermission
+from app.db.statements import PERMISSIONS_BY_ACTIONS
 from app.schemas.permission import PermissionEnum
 
 logger = logging.getLogger(__name__)
@@ -19,7 +21,7 @@ async def remove_permissions_from_admin(
     user_id: int,
     module_id: int,
     permissions: List[PermissionEnum],
-    current_user: User,
+    current_user: Principal,
     db: AsyncSession,
 ):
     # 1. Authorization
@@ -30,7 +32,7 @@ async def remove_permissions_from_admin(
         )
 
     # 2. Target user must exist and be admin
-    target_user = await db.get(User, user_id)
+    target_user = await fetch_target_user(db, user_id)
     if not target_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -59,9 +61,7 @@ async def remove_permissions_from_admin(
         )
 
     try:
-        result = await db.execute(
-            select(Permission.id, Permission.action).where(Permission.action.in_(actions))
-        )
+        result = await db.execute(PERMISSIONS_BY_ACTIONS, {"actions": actions})
         perm_rows = result.all()
         requested_perm_ids = [row[0] for row in perm_rows]
     except SQLAlchemyError as e:
@@ -1,12 +1,16 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 from fastapi import HTTPException, status
 from collections import defaultdict
 
-from app.models.users import User, RoleEnum
+from app.models.users import RoleEnum
+from app.core.principal import Principal
 from app.models.module import Module
-from app.models.permission import Permission
 from app.models.user_permission import UserPermission
+from app.db.fast_path import fetch_module_actions, fetch_target_user
+from app.db.statements import (
+    PERMISSIONS_BY_ACTIONS,
+    USER_PERMISSION_MATRIX,
+)
 from app.schemas.permission import (
     AssignPermissionRequest,
    
@@ -16,7 +20,7 @@ from app.schemas.permission import (
 async def assign_permissions_to_admin(
     user_id: int,
     payload: AssignPermissionRequest,
-    current_user: User,
+    current_user: Principal,
     db: AsyncSession
 ):
     # 1. Only superadmin can assign
@@ -27,7 +31,7 @@ async def assign_permissions_to_admin(
         )
 
     # 2. Validate target user
-    target_user = await db.get(User, user_id)
+    target_user = await fetch_target_user(db, user_id)
     if not target_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Target user not found.")
 
@@ -55,15 +59,7 @@ async def assign_permissions_to_admin(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Module not found.")
 
     # 4. Get already assigned permissions for this user-module
-    result = await db.execute(
-        select(Permission.action)
-        .join(UserPermission, UserPermission.permission_id == Permission.id)
-        .where(
-            UserPermission.user_id == user_id,
-            UserPermission.module_id == payload.module_id
-        )
-    )
-    already_assigned = set(result.scalars().all())
+    already_assigned = await fetch_module_actions(db, user_id, payload.module_id)
 
     # 5. If ANY requested permission is already assigned → reject request
     requested_actions = [p.value for p in payload.permissions]
@@ -75,11 +71,9 @@ async def assign_permissions_to_admin(
             detail=f"Cannot assign because these permissions already exist: {duplicates}"
         )
 
-    # 6. Fetch Permission objects for requested actions
-    result = await db.execute(
-        select(Permission).where(Permission.action.in_(requested_actions))
-    )
-    permission_objs = result.scalars().all()
+    # 6. Fetch permission ids for requested actions
+    result = await db.execute(PERMISSIONS_BY_ACTIONS, {"actions": requested_actions})
+    permission_objs = result.all()
 
     if not permission_objs:
         raise HTTPException(
@@ -101,12 +95,7 @@ async def assign_permissions_to_admin(
     await db.commit()
 
     # 8. Return all permissions grouped by module for this user
-    result = await db.execute(
-        select(Module.name, Permission.action)
-        .join(UserPermission, UserPermission.module_id == Module.id)
-        .join(Permission, Permission.id == UserPermission.permission_id)
-        .where(UserPermission.user_id == user_id)
-    )
+    result = await db.execute(USER_PERMISSION_MATRIX, {"user_id": user_id})
     rows = result.all()
 
     module_permission_map = defaultdict(list)
@@ -1,14 +1,14 @@
-import asyncio
 import logging
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
-from sqlalchemy.exc import  SQLAlchemyError
+from sqlalchemy.exc import  IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.users import User, RoleEnum
 from app.schemas.auth import SignupRequest, LoginRequest, TokenResponse, MessageResponse
-from app.core.security import get_password_hash, verify_password, create_access_token
+from app.core.security import get_password_hash_async, verify_password_async, create_access_token
+from app.db.session import release_connection
+from app.db.statements import LOGIN_BY_EMAIL, SUPERADMIN_EXISTS
 
 logger = logging.getLogger(__name__)
 
@@ -20,36 +20,48 @@ async def signup_superadmin(
     """
     Creates the one-and-only superadmin.
     """
-    # 1. Start a transaction block—auto-commits on success, rolls back on error
-    async with db.begin():
-        # 2. Check existence
-        exists = await db.scalar(
-            select(User.id).where(User.role == RoleEnum.superadmin)
+    # 1. Check existence
+    exists = await db.scalar(SUPERADMIN_EXISTS)
+    if exists:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Superadmin already exists."
+        )
+
+    # 2. Hash off the main thread, without holding a pooled connection
+    await release_connection(db)
+    try:
+        hashed = await get_password_hash_async(data.password)
+    except Exception:
+        logger.exception("Password hashing failed")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Password hashing failed."
         )
-        if exists:
+
+    # 3. Start a transaction block—auto-commits on success, rolls back on error.
+    #    The check above ran in another transaction: a concurrent signup can
+    #    pass it too, and uix_users_one_superadmin rejects the second insert.
+    try:
+        async with db.begin():
+            # 4. Create ORM object (simpler than core‐insert)
+            new_user = User(
+                
+                email=str(data.email),
+                hashed_password=hashed,
+                role=RoleEnum.superadmin,
+            )
+            db.add(new_user)
+    except IntegrityError:
+        if await db.scalar(SUPERADMIN_EXISTS):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Superadmin already exists."
             )
-
-        # 3. Hash off the main thread
-        try:
-            hashed = await asyncio.to_thread(get_password_hash, data.password)
-        except Exception:
-            logger.exception("Password hashing failed")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Password hashing failed."
-            )
-
-        # 4. Create ORM object (simpler than core‐insert)
-        new_user = User(
-            
-            email=str(data.email),
-            hashed_password=hashed,
-            role=RoleEnum.superadmin,
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="An account with this email already exists."
         )
-        db.add(new_user)
 
     # If we reach here, transaction has committed
     return MessageResponse(message="Superadmin created successfully. Please log in to continue.")
@@ -64,10 +76,8 @@ async def login_user(
     """
     # 1. Fetch user
     try:
-        result = await db.execute(
-            select(User).where(User.email == str(data.email))
-        )
-        user: User | None = result.scalar_one_or_none()
+        result = await db.execute(LOGIN_BY_EMAIL, {"email": str(data.email)})
+        user = result.first()
     except SQLAlchemyError:
         logger.exception("DB error during login lookup")
         raise HTTPException(
@@ -75,10 +85,10 @@ async def login_user(
             detail="Database error."
         )
 
-    # 2. Verify password off the main thread
-    password_ok = await asyncio.to_thread(
-        verify_password, data.password, user.hashed_password
-    ) if user else False
+    # 2. Verify password off the main thread. The connection goes back to the
+    #    pool first so a login storm doesn't pin it for the whole bcrypt round.
+    await release_connection(db)
+    password_ok = await verify_password_async(data.password, user.hashed_password) if user else False
 
     if not password_ok:
         raise HTTPException(
@@ -0,0 +1,129 @@
+import logging
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.users import User, RoleEnum
+from app.core.principal import Principal
+from app.models.module import Module
+from app.models.user_permission import UserPermission
+from app.db.fast_path import has_grant_on_module
+from app.db.statements import PERMISSIONS_BY_ACTIONS
+from app.schemas.job import BulkRevokeRequest, JobResponse
+from app.services.job_service import JobContext, enqueue_job, job_handler
+
+logger = logging.getLogger(__name__)
+
+BULK_REVOKE_JOB = "bulk_revoke"
+
+
+async def enqueue_bulk_revoke(
+    payload: BulkRevokeRequest,
+    current_user: Principal,
+    db: AsyncSession,
+) -> JobResponse:
+    """
+    Validate a mass revocation up front, then queue it as a background job.
+    Same rules as single-user permission removal:
+    - Only admins & superadmins may call.
+    - Admins only for modules they already manage.
+    - Only permissions of regular users can be revoked.
+    """
+    # 1. Only admin or superadmin
+    if current_user.role not in (RoleEnum.admin, RoleEnum.superadmin):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins or superadmins can remove permissions."
+        )
+
+    # 2. Module must exist
+    module = await db.get(Module, payload.module_id)
+    if not module:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Module not found.")
+
+    # 3. Admins must have access to the module
+    if current_user.role == RoleEnum.admin:
+        if not await has_grant_on_module(db, current_user.id, payload.module_id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You do not have access to this module."
+            )
+
+    # 4. Resolve actions → IDs
+    requested = {p.value for p in payload.permissions}
+    rows = await db.execute(PERMISSIONS_BY_ACTIONS, {"actions": list(requested)})
+    action_to_id = {action: pid for pid, action in rows.all()}
+    invalid = requested - set(action_to_id)
+    if invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid permission(s): {', '.join(sorted(invalid))}"
+        )
+
+    # 5. Every target must be an existing regular user
+    result = await db.execute(
+        select(User.id).where(
+            User.id.in_(payload.user_ids),
+            User.role == RoleEnum.user,
+            User.is_active.is_(True),
+        )
+    )
+    valid_ids = set(result.scalars())
+    rejected = [uid for uid in payload.user_ids if uid not in valid_ids]
+    if rejected:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Not found or not a regular user: {rejected}"
+        )
+
+    return await enqueue_job(
+        db,
+        BULK_REVOKE_JOB,
+        {
+            "user_ids": payload.user_ids,
+            "module_id": payload.module_id,
+            "permission_ids": sorted(action_to_id.values()),
+        },
+        current_user,
+    )
+
+
+def revoke_batch_statement(user_ids: list, module_id: int, permission_ids: list):
+    """One batch of the revoke: the given grants on one module, for `user_ids`."""
+    return delete(UserPermission).where(
+        UserPermission.user_id.in_(user_ids),
+        UserPermission.module_id == module_id,
+        UserPermission.permission_id.in_(permission_ids),
+    )
+
+
+@job_handler(BULK_REVOKE_JOB)
+async def run_bulk_revoke(ctx: JobContext) -> dict:
+    user_ids = ctx.params["user_ids"]
+    module_id = ctx.params["module_id"]
+    permission_ids = ctx.params["permission_ids"]
+
+    checkpoint = ctx.checkpoint or {}
+    offset = checkpoint.get("offset", 0)
+    removed = checkpoint.get("removed", 0)
+
+    # One short transaction per batch: no connection is held between batches
+    while offset < len(user_ids):
+        batch = user_ids[offset:offset + settings.JOB_BATCH_SIZE]
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(revoke_batch_statement(batch, module_id, permission_ids))
+            removed += result.rowcount or 0
+            offset += len(batch)
+            await ctx.save_progress(
+                db,
+                processed=offset,
+                total=len(user_ids),
+                checkpoint={"offset": offset, "removed": removed},
+            )
+            await db.commit()
+
+    logger.info("Bulk revoke job %s removed %d permission row(s)", ctx.id, removed)
+    return {"removed": removed}
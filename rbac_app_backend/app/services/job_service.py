@@ -0,0 +1,276 @@
+import asyncio
+import contextvars
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import insert, or_, select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.job import Job
+from app.models.users import RoleEnum
+from app.core.principal import Principal
+from app.schemas.job import JobResponse, JobStatus
+
+logger = logging.getLogger(__name__)
+
+
+class JobContext:
+    """
+    What a handler sees: its params, the last checkpoint (None on first run)
+    and a way to persist progress together with each batch.
+    """
+
+    def __init__(self, job_id: int, params: Dict[str, Any], checkpoint: Optional[Dict[str, Any]]):
+        self.id = job_id
+        self.params = params
+        self.checkpoint = checkpoint
+
+    async def save_progress(
+        self,
+        db: AsyncSession,
+        *,
+        processed: int,
+        checkpoint: Dict[str, Any],
+        total: Optional[int] = None,
+    ) -> None:
+        # Runs inside the handler's transaction, so the checkpoint commits
+        # atomically with the batch it describes (resume never redoes/skips work).
+        values: Dict[str, Any] = {
+            "processed": processed,
+            "checkpoint": checkpoint,
+            "updated_at": func.now(),
+            "heartbeat_at": _utcnow(),
+        }
+        if total is not None:
+            values["total"] = total
+        await db.execute(update(Job).where(Job.id == self.id).values(**values))
+        self.checkpoint = checkpoint
+
+
+JobHandler = Callable[[JobContext], Awaitable[Any]]
+
+_HANDLERS: Dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Register a coroutine as the handler for jobs of `kind`."""
+    def decorator(fn: JobHandler) -> JobHandler:
+        _HANDLERS[kind] = fn
+        return fn
+    return decorator
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class JobRunner:
+    """
+    In-process worker pool for jobs stored in the `jobs` table.
+
+    - At most `concurrency` jobs run at once in this process.
+    - Jobs are claimed with a conditional UPDATE, so several uvicorn workers can
+      share the table without running the same job twice.
+    - Running jobs heartbeat; a job whose heartbeat goes stale (worker crashed
+      or was restarted) is picked up again and resumes from its checkpoint.
+    """
+
+    def __init__(self, concurrency: int, poll_interval: int, stale_after: int):
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._poll_interval = poll_interval
+        self._stale_after = timedelta(seconds=stale_after)
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._poller: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._poller = asyncio.create_task(self._poll_loop(), name="job-poller")
+
+    async def stop(self) -> None:
+        # Cancelled jobs stay `running`; their heartbeat goes stale and the
+        # next worker to start resumes them from the last checkpoint.
+        tasks = list(self._tasks.values())
+        if self._poller:
+            tasks.append(self._poller)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._poller = None
+
+    def submit(self, job_id: int) -> None:
+        if job_id in self._tasks:
+            return
+        # Fresh context: a task copies the caller's contextvars, and a job
+        # submitted from a request must not inherit its deadline (statement
+        # and lock timeouts) or its query accounting.
+        task = asyncio.create_task(
+            self._run(job_id), name=f"job-{job_id}", context=contextvars.Context()
+        )
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _t: self._tasks.pop(job_id, None))
+
+    async def _poll_loop(self) -> None:
+        while True:
+            try:
+                for job_id in await self._resumable_job_ids():
+                    self.submit(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Job poller failed; retrying")
+            await asyncio.sleep(self._poll_interval)
+
+    async def _resumable_job_ids(self) -> list[int]:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Job.id)
+                .where(self._claimable())
+                .order_by(Job.id)
+                .limit(100)
+            )
+            return list(result.scalars())
+
+    def _claimable(self):
+        stale_before = _utcnow() - self._stale_after
+        return or_(
+            Job.status == JobStatus.queued.value,
+            (Job.status == JobStatus.running.value)
+            & (or_(Job.heartbeat_at.is_(None), Job.heartbeat_at < stale_before)),
+        )
+
+    async def _claim(self, job_id: int) -> Optional[Job]:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(Job)
+                .where(Job.id == job_id, self._claimable())
+                .values(status=JobStatus.running.value, heartbeat_at=_utcnow(), updated_at=func.now())
+                .returning(Job)
+            )
+            job = result.scalar_one_or_none()
+            await db.commit()
+            return job
+
+    async def _heartbeat(self, job_id: int) -> None:
+        interval = max(self._stale_after.total_seconds() / 3, 1)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(
+                        update(Job).where(Job.id == job_id).values(heartbeat_at=_utcnow())
+                    )
+                    await db.commit()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Heartbeat failed for job %s", job_id, exc_info=True)
+
+    async def _finish(self, job_id: int, job_status: JobStatus, **values: Any) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Job)
+                .where(Job.id == job_id)
+                .values(status=job_status.value, updated_at=func.now(), heartbeat_at=None, **values)
+            )
+            await db.commit()
+
+    async def _run(self, job_id: int) -> None:
+        async with self._semaphore:
+            job = await self._claim(job_id)
+            if job is None:
+                return  # finished, or claimed by another worker
+
+            handler = _HANDLERS.get(job.kind)
+            if handler is None:
+                await self._finish(job_id, JobStatus.failed, error=f"Unknown job kind: {job.kind}")
+                return
+
+            ctx = JobContext(job.id, job.params or {}, job.checkpoint)
+            heartbeat = asyncio.create_task(self._heartbeat(job_id))
+            try:
+                result = await handler(ctx)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception("Job %s (%s) failed", job_id, job.kind)
+                await self._finish(job_id, JobStatus.failed, error=str(e) or e.__class__.__name__)
+            else:
+                await self._finish(job_id, JobStatus.succeeded, result=result)
+                logger.info("Job %s (%s) finished", job_id, job.kind)
+            finally:
+                heartbeat.cancel()
+
+
+job_runner = JobRunner(
+    concurrency=settings.JOB_WORKER_CONCURRENCY,
+    poll_interval=settings.JOB_POLL_INTERVAL,
+    stale_after=settings.JOB_STALE_AFTER,
+)
+
+
+def to_job_response(job: Job) -> JobResponse:
+    progress = None
+    if job.total:
+        progress = min(job.processed / job.total, 1.0)
+    elif job.total == 0:
+        progress = 1.0
+    return JobResponse(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        total=job.total,
+        processed=job.processed,
+        progress=progress,
+        result=job.result,
+        error=job.error,
+        created_by=job.created_by,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+    )
+
+
+async def enqueue_job(
+    db: AsyncSession,
+    kind: str,
+    params: Dict[str, Any],
+    current_user: Principal,
+) -> JobResponse:
+    """
+    Persist a queued job and hand it to this worker's runner. The request
+    returns as soon as the row is committed.
+    """
+    if kind not in _HANDLERS:
+        raise ValueError(f"No handler registered for job kind {kind!r}")
+
+    result = await db.execute(
+        insert(Job)
+        .values(
+            kind=kind,
+            status=JobStatus.queued.value,
+            params=params,
+            processed=0,
+            created_by=current_user.id,
+        )
+        .returning(Job)
+    )
+    job = result.scalar_one()
+    await db.commit()
+
+    job_runner.submit(job.id)
+    return to_job_response(job)
+
+
+async def get_job(db: AsyncSession, job_id: int, current_user: Principal) -> JobResponse:
+    job = await db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found.")
+
+    # Superadmins see every job; everybody else only the jobs they started
+    if current_user.role != RoleEnum.superadmin and job.created_by != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found.")
+
+    return to_job_response(job)
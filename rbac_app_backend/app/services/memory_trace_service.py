@@ -0,0 +1,164 @@
+import asyncio
+import gc
+import logging
+import sys
+import time
+import tracemalloc
+from typing import List, Optional
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Allocations made by tracemalloc itself and by the import machinery are noise
+_NOISE = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _short_path(filename: str) -> str:
+    """Path relative to the longest sys.path entry it's under (e.g. sqlalchemy/orm/loading.py)."""
+    best = ""
+    for entry in sys.path:
+        if entry and filename.startswith(entry.rstrip("/\\") + "/") and len(entry) > len(best):
+            best = entry
+    return filename[len(best):].lstrip("/\\") if best else filename
+
+
+def _take_snapshot() -> tracemalloc.Snapshot:
+    # Collect first, so diffs show memory that is really retained rather
+    # than garbage cycles that just haven't been collected yet
+    gc.collect()
+    return tracemalloc.take_snapshot().filter_traces(_NOISE)
+
+
+def _not_tracing() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Memory tracing is not running; start it first",
+    )
+
+
+class MemoryTracer:
+    """
+    One tracemalloc session per worker process, on demand. Tracing slows every
+    allocation and costs memory itself, so a session always ends on its own
+    after its duration (at most MEMORY_TRACE_MAX_SECONDS), and snapshots are
+    rate-limited to one per MEMORY_SNAPSHOT_MIN_INTERVAL seconds.
+    """
+
+    def __init__(self):
+        self.started_at: Optional[float] = None
+        self.stops_at: Optional[float] = None
+        self._frames = 1
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._snapshots = 0
+        self._last_snapshot = 0.0
+        self._shutoff: Optional[asyncio.TimerHandle] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing() and self.started_at is not None
+
+    def status(self) -> dict:
+        current, peak = tracemalloc.get_traced_memory() if self.tracing else (0, 0)
+        return {
+            "tracing": self.tracing,
+            "frames": self._frames if self.tracing else None,
+            "started_at": self.started_at,
+            "stops_at": self.stops_at,
+            "snapshots": self._snapshots,
+            "traced_current_bytes": current,
+            "traced_peak_bytes": peak,
+            "tracemalloc_overhead_bytes": tracemalloc.get_tracemalloc_memory() if self.tracing else 0,
+        }
+
+    async def start(self, frames: int, duration: int) -> dict:
+        if tracemalloc.is_tracing():
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Memory tracing is already running on this worker",
+            )
+        duration = min(duration, settings.MEMORY_TRACE_MAX_SECONDS)
+        self._frames = min(frames, settings.MEMORY_TRACE_MAX_FRAMES)
+
+        tracemalloc.start(self._frames)
+        self.started_at = time.time()
+        self.stops_at = self.started_at + duration
+        self._snapshots = 0
+        self._baseline = await asyncio.to_thread(_take_snapshot)
+        self._previous = self._baseline
+        self._shutoff = asyncio.get_running_loop().call_later(duration, self._expire)
+        logger.info("Memory tracing started (%d frame(s), stops in %d s)", self._frames, duration)
+        return self.status()
+
+    def _expire(self) -> None:
+        logger.info("Memory tracing reached its time limit")
+        self.stop()
+
+    def stop(self) -> dict:
+        if self._shutoff is not None:
+            self._shutoff.cancel()
+            self._shutoff = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            logger.info("Memory tracing stopped after %d snapshot(s)", self._snapshots)
+        self.started_at = self.stops_at = None
+        self._baseline = self._previous = None
+        return self.status()
+
+    async def diff(self, group_by: str, limit: int, against: str) -> dict:
+        """
+        Take a snapshot and compare it with the baseline (taken at start) or
+        the previous snapshot. Returns the `limit` largest changes by size.
+        """
+        if not self.tracing:
+            raise _not_tracing()
+        wait = self._last_snapshot + settings.MEMORY_SNAPSHOT_MIN_INTERVAL - time.monotonic()
+        if wait > 0 or self._lock.locked():
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Snapshots are rate-limited",
+                headers={"Retry-After": str(max(int(wait) + 1, 1))},
+            )
+
+        async with self._lock:
+            self._last_snapshot = time.monotonic()
+            snapshot = await asyncio.to_thread(_take_snapshot)
+            # Stopped (or timed out) while the snapshot was taken
+            reference = self._baseline if against == "baseline" else self._previous
+            if reference is None:
+                raise _not_tracing()
+            if self.tracing:
+                self._previous = snapshot
+                self._snapshots += 1
+            stats = await asyncio.to_thread(snapshot.compare_to, reference, group_by)
+
+        top: List[dict] = []
+        for stat in stats[:limit]:
+            frame = stat.traceback[0]
+            top.append({
+                "file": _short_path(frame.filename),
+                "line": frame.lineno if group_by == "lineno" else None,
+                "size_diff_bytes": stat.size_diff,
+                "count_diff": stat.count_diff,
+                "size_bytes": stat.size,
+                "count": stat.count,
+            })
+        return {
+            "against": against,
+            "group_by": group_by,
+            "total_size_diff_bytes": sum(stat.size_diff for stat in stats),
+            "top": top,
+            **self.status(),
+        }
+
+
+memory_tracer = MemoryTracer()
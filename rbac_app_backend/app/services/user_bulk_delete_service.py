@@ -0,0 +1,83 @@
+import logging
+from typing import List
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.models.users import User, RoleEnum
+from app.core.principal import Principal
+from app.schemas.user_bulk_delete_schema import BulkDeleteUsersResponse
+
+logger = logging.getLogger(__name__)
+
+
+def bulk_delete_statement(user_ids: List[int], admin_id: int):
+    """
+    Soft- or hard-deletes the active regular users in `user_ids` created by
+    `admin_id`, RETURNING the ids it touched.
+    """
+    owned = (
+        User.id.in_(user_ids),
+        User.role == RoleEnum.user,
+        User.created_by == admin_id,
+        User.is_active.is_(True),
+    )
+    if settings.USER_SOFT_DELETE:
+        return (
+            update(User)
+            .where(*owned)
+            .values(is_active=False, deleted_at=func.now())
+            .returning(User.id)
+        )
+    # Grants go with the user via ON DELETE CASCADE
+    return delete(User).where(*owned).returning(User.id)
+
+
+async def bulk_delete_users(
+    user_ids: List[int],
+    current_user: Principal,
+    db: AsyncSession,
+) -> BulkDeleteUsersResponse:
+    """
+    Delete many users with the rules of DELETE /users/{id}:
+    only admins, only role 'user', only users the caller created.
+    The ownership check is part of the WHERE clause, so checking and
+    deleting is a single statement; ids it did not touch are reported as denied.
+    """
+    # 1. Only admins can delete users
+    if current_user.role != RoleEnum.admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins are allowed to delete users."
+        )
+
+    stmt = bulk_delete_statement(user_ids, current_user.id)
+
+    try:
+        result = await db.execute(stmt)
+        deleted_ids = set(result.scalars())
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.error("DB error during bulk user deletion", exc_info=e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database error during deletion."
+        )
+
+    deleted = [uid for uid in user_ids if uid in deleted_ids]
+    denied = [uid for uid in user_ids if uid not in deleted_ids]
+
+    logger.info(
+        "Admin %s bulk-deleted %d user(s), %d denied",
+        current_user.id, len(deleted), len(denied)
+    )
+
+    return BulkDeleteUsersResponse(
+        message=f"Deleted {len(deleted)} of {len(user_ids)} user(s).",
+        deleted=deleted,
+        denied=denied,
+    )
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 
 from fastapi import HTTPException, status
@@ -7,15 +6,17 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from app.models.users import User, RoleEnum
+from app.core.principal import Principal
 from app.schemas.user_create_schema import CreateUserRequest
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async
+from app.db.session import release_connection
 
 logger = logging.getLogger(__name__)
 
 
 async def create_user(
     payload: CreateUserRequest,
-    current_user: User,
+    current_user: Principal,
     db: AsyncSession,
 ) -> User:
     # 1) Authorization
@@ -30,9 +31,10 @@ async def create_user(
     email = str(payload.email)  # lowercased by validator
     password = payload.password
 
-    # 3) Hash password off the event loop
+    # 3) Hash password off the event loop (the auth lookup's connection goes back to the pool first)
+    await release_connection(db)
     try:
-        hashed_password = await asyncio.to_thread(get_password_hash, password)
+        hashed_password = await get_password_hash_async(password)
     except Exception as e:
         logger.error("Password hashing error", exc_info=e)
         raise HTTPException(
@@ -0,0 +1,139 @@
+import logging
+from typing import List
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, exists, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import aliased
+
+from app.db.dialect import insert
+from app.models.users import User, RoleEnum
+from app.core.principal import Principal
+from app.models.user_permission import UserPermission
+from app.schemas.user_permission_clone_schema import CloneUserPermissionsResponse
+
+logger = logging.getLogger(__name__)
+
+
+def clone_statement(source_id: int, target_ids: List[int], granted_by: int, only_held: bool):
+    """
+    INSERT ... SELECT of the source's grants onto every active regular user
+    in `target_ids`. With `only_held`, only (module, permission) pairs that
+    `granted_by` holds are copied.
+    """
+    source = aliased(UserPermission)
+    target = aliased(User)
+    rows = (
+        select(
+            target.id,
+            source.module_id,
+            source.permission_id,
+            literal(granted_by),
+        )
+        .select_from(source)
+        .join(target, target.id.in_(target_ids))
+        .where(
+            source.user_id == source_id,
+            target.role == RoleEnum.user,
+            target.is_active.is_(True),
+        )
+    )
+
+    if only_held:
+        held = aliased(UserPermission)
+        rows = rows.where(
+            exists().where(
+                held.user_id == granted_by,
+                held.module_id == source.module_id,
+                held.permission_id == source.permission_id,
+            )
+        )
+
+    return (
+        insert(UserPermission)
+        .from_select(["user_id", "module_id", "permission_id", "assigned_by"], rows)
+        .on_conflict_do_nothing(index_elements=["user_id", "module_id", "permission_id"])
+    )
+
+
+async def clone_user_permissions(
+    source_id: int,
+    target_ids: List[int],
+    current_user: Principal,
+    db: AsyncSession
+) -> CloneUserPermissionsResponse:
+    """
+    Copy every permission the source user holds onto each target user.
+    - Only admins & superadmins may call.
+    - Source and targets must be regular users.
+    - Admins only pass on (module, action) pairs they hold themselves;
+      anything else on the template is skipped.
+    - Permissions a target already has are left untouched.
+    """
+
+    # 1. Role check
+    if current_user.role not in (RoleEnum.admin, RoleEnum.superadmin):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins or superadmins can update permissions."
+        )
+
+    if source_id in target_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A user cannot be cloned onto themself."
+        )
+
+    # 2. Source and targets must exist and be regular users (one query)
+    result = await db.execute(
+        select(User.id, User.role).where(
+            User.id.in_([source_id, *target_ids]),
+            User.is_active.is_(True),
+        )
+    )
+    roles = {uid: role for uid, role in result.all()}
+
+    if source_id not in roles:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Source user not found.")
+    missing = [uid for uid in target_ids if uid not in roles]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Target user(s) not found: {missing}"
+        )
+    not_users = [uid for uid in [source_id, *target_ids] if roles[uid] != RoleEnum.user]
+    if not_users:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Permissions can only be cloned between users, not admins or superadmins: {not_users}"
+        )
+
+    # 3. INSERT ... SELECT: source grants × targets in a single statement
+    stmt = clone_statement(
+        source_id, target_ids, current_user.id, only_held=current_user.role == RoleEnum.admin
+    )
+
+    try:
+        result = await db.execute(stmt)
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.error("DB error cloning permissions", exc_info=e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database error while cloning permissions."
+        )
+
+    cloned = result.rowcount or 0
+    logger.info(
+        "User %s cloned %d permission row(s) from user %s onto %d user(s)",
+        current_user.id, cloned, source_id, len(target_ids)
+    )
+
+    return CloneUserPermissionsResponse(
+        detail=f"Cloned permissions of user {source_id} onto {len(target_ids)} user(s).",
+        source_id=source_id,
+        target_ids=target_ids,
+        cloned=cloned,
+    )
@@ -2,14 +2,16 @@ from typing import Set
 import logging
 
 from fastapi import HTTPException, status
-from sqlalchemy import select, delete, and_, update
+from sqlalchemy import delete, and_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 
-from app.models.users import User, RoleEnum
+from app.models.users import RoleEnum
+from app.core.principal import Principal
 from app.models.module import Module
-from app.models.permission import Permission
 from app.models.user_permission import UserPermission
+from app.db.fast_path import fetch_target_user, has_grant_on_module
+from app.db.statements import PERMISSIONS_BY_ACTIONS
 from app.schemas.user_permission_delete_schema import RemoveUserPermissionRequest
 
 logger = logging.getLogger(__name__)
@@ -17,7 +19,7 @@ logger = logging.getLogger(__name__)
 async def remove_permissions_from_user(
     target_user_id: int,
     payload: RemoveUserPermissionRequest,
-    current_user: User,
+    current_user: Principal,
     db: AsyncSession
 ):
     """
@@ -35,7 +37,7 @@ async def remove_permissions_from_user(
         )
 
     # 2. Ensure target user exists
-    target = await db.get(User, target_user_id)
+    target = await fetch_target_user(db, target_user_id)
     if not target:
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Target user not found.")
 
@@ -53,13 +55,7 @@ async def remove_permissions_from_user(
 
     # 4. If caller is admin, verify they have any permission on this module
     if current_user.role is RoleEnum.admin:
-        own = await db.execute(
-            select(UserPermission.id).where(
-                UserPermission.user_id == current_user.id,
-                UserPermission.module_id == payload.module_id
-            )
-        )
-        if own.scalars().first() is None:
+        if not await has_grant_on_module(db, current_user.id, payload.module_id):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You do not have access to this module."
@@ -75,10 +71,7 @@ async def remove_permissions_from_user(
     # 6. Dedupe & resolve actions → IDs in a single query
     requested: Set[str] = {p.value for p in payload.permissions}
     try:
-        rows = await db.execute(
-            select(Permission.id, Permission.action)
-            .where(Permission.action.in_(requested))
-        )
+        rows = await db.execute(PERMISSIONS_BY_ACTIONS, {"actions": list(requested)})
     except SQLAlchemyError as e:
         logger.error("DB error loading permissions", exc_info=e)
         raise HTTPException(
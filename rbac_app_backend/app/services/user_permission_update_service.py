@@ -1,14 +1,15 @@
 import logging
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 
-from app.models.users import User, RoleEnum
+from app.models.users import RoleEnum
+from app.core.principal import Principal
 from app.models.module import Module
-from app.models.permission import Permission
 from app.models.user_permission import UserPermission
+from app.db.fast_path import fetch_module_actions, fetch_target_user
+from app.db.statements import PERMISSIONS_BY_ACTIONS
 from app.schemas.user_permission_update_schema import UpdateUserPermissionRequest
 
 logger = logging.getLogger(__name__)
@@ -17,7 +18,7 @@ logger = logging.getLogger(__name__)
 async def update_user_permissions(
     target_user_id: int,
     payload: UpdateUserPermissionRequest,
-    current_user: User,
+    current_user: Principal,
     db: AsyncSession
 ):
     # 1. Role check
@@ -28,7 +29,7 @@ async def update_user_permissions(
         )
 
     # 2. Target user must exist
-    target = await db.get(User, target_user_id)
+    target = await fetch_target_user(db, target_user_id)
     if not target:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Target user not found.")
 
@@ -54,15 +55,7 @@ async def update_user_permissions(
 
     # 5. Admin permission restriction per module
     if current_user.role == RoleEnum.admin:
-        result = await db.execute(
-            select(Permission.action)
-            .join(UserPermission, UserPermission.permission_id == Permission.id)
-            .where(
-                UserPermission.user_id == current_user.id,
-                UserPermission.module_id == payload.module_id
-            )
-        )
-        admin_actions = set(result.scalars().all())
+        admin_actions = await fetch_module_actions(db, current_user.id, payload.module_id)
 
         if not admin_actions:
             raise HTTPException(
@@ -81,15 +74,7 @@ async def update_user_permissions(
             )
 
     # 6. Check already assigned permissions for this module
-    result = await db.execute(
-        select(Permission.action)
-        .join(UserPermission, UserPermission.permission_id == Permission.id)
-        .where(
-            UserPermission.user_id == target_user_id,
-            UserPermission.module_id == payload.module_id
-        )
-    )
-    already_assigned = set(result.scalars().all())
+    already_assigned = await fetch_module_actions(db, target_user_id, payload.module_id)
 
     # 7. Reject if even one permission is already assigned (strict mode)
     duplicates = requested_actions & already_assigned
@@ -100,10 +85,8 @@ async def update_user_permissions(
         )
 
     # 8. Validate requested permissions exist in DB
-    result = await db.execute(
-        select(Permission).where(Permission.action.in_(tuple(requested_actions)))
-    )
-    permission_objs = result.scalars().all()
+    result = await db.execute(PERMISSIONS_BY_ACTIONS, {"actions": list(requested_actions)})
+    permission_objs = result.all()
 
     # 9. Validate none are missing
     found_actions = {perm.action for perm in permission_objs}
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy import delete, select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.users import User
+from app.models.user_permission import UserPermission
+
+logger = logging.getLogger(__name__)
+
+
+async def soft_delete_user(db: AsyncSession, user_id: int) -> int:
+    """
+    Mark a user inactive. One indexed UPDATE; the user disappears from auth and
+    listing immediately and the reaper removes the rows later.
+    Returns how many users were deactivated: 0 if it was already inactive or gone.
+    """
+    result = await db.execute(
+        update(User)
+        .where(User.id == user_id, User.is_active.is_(True))
+        .values(is_active=False, deleted_at=func.now())
+    )
+    await db.commit()
+    return result.rowcount
+
+
+def purge_candidates(batch_size: int):
+    # SKIP LOCKED lets reapers in several workers split the backlog
+    return (
+        select(User.id)
+        .where(User.is_active.is_(False))
+        .order_by(User.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+
+
+async def purge_deleted_users_batch(batch_size: int) -> int:
+    """
+    Hard-delete up to `batch_size` soft-deleted users in one short transaction.
+    Returns how many users were purged.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(purge_candidates(batch_size))
+        ids = list(result.scalars())
+        if not ids:
+            return 0
+
+        # Same end state as the ORM delete: created users are detached,
+        # grants are removed, assigned_by is nulled by its ON DELETE SET NULL.
+        await db.execute(
+            update(User).where(User.created_by.in_(ids)).values(created_by=None)
+        )
+        await db.execute(
+            delete(UserPermission).where(UserPermission.user_id.in_(ids))
+        )
+        await db.execute(delete(User).where(User.id.in_(ids)))
+        await db.commit()
+        return len(ids)
+
+
+class UserReaper:
+    """
+    Periodically purges soft-deleted users in throttled batches.
+    """
+
+    def __init__(self, interval: int, batch_size: int, batch_pause_ms: int):
+        self._interval = interval
+        self._batch_size = batch_size
+        self._batch_pause = batch_pause_ms / 1000
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._loop(), name="user-reaper")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run_once(self) -> int:
+        purged = 0
+        while True:
+            count = await purge_deleted_users_batch(self._batch_size)
+            purged += count
+            if count < self._batch_size:
+                return purged
+            await asyncio.sleep(self._batch_pause)
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                purged = await self.run_once()
+                if purged:
+                    logger.info("User reaper purged %d soft-deleted user(s)", purged)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("User reaper run failed; retrying")
+            await asyncio.sleep(self._interval)
+
+
+user_reaper = UserReaper(
+    interval=settings.USER_PURGE_INTERVAL,
+    batch_size=settings.USER_PURGE_BATCH_SIZE,
+    batch_pause_ms=settings.USER_PURGE_BATCH_PAUSE_MS,
+)
@@ -2,14 +2,12 @@ from typing import List
 import logging
 from collections import defaultdict
 
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
-from app.models.users import User, RoleEnum
-from app.models.module import Module
-from app.models.permission import Permission
-from app.models.user_permission import UserPermission
+from app.models.users import RoleEnum
+from app.core.principal import Principal
+from app.db.statements import OWN_USER_WITH_PERMISSIONS, USERS_WITH_PERMISSIONS
 from app.schemas.get_all_users_with_permission import (
     UserWithPermissionsResponse,
     ModulePermissionInfo,
@@ -19,7 +17,7 @@ logger = logging.getLogger(__name__)
 
 async def get_users_with_permissions(
     db: AsyncSession,
-    current_user: User,
+    current_user: Principal,
 ) -> List[UserWithPermissionsResponse]:
     # 1. Allow superadmins, admins—and individual users—to call
     allowed_roles = {RoleEnum.superadmin, RoleEnum.admin, RoleEnum.user}
@@ -29,33 +27,12 @@ async def get_users_with_permissions(
             detail="Not authorized to view permissions."
         )
 
-    # 2. Build a LEFT JOIN query so even users with no perms show up
+    # 2. LEFT JOIN listing (pre-built) so even users with no perms show up
     #    If a regular user, restrict to their own row
-    user_filter = (
-        User.id == current_user.id
-        if current_user.role == RoleEnum.user
-        else User.role.in_([RoleEnum.admin, RoleEnum.user])
-    )
-
-    stmt = (
-        select(
-            User.id,
-            
-            User.email,
-            User.role,
-            User.created_by,
-            Module.name.label("module_name"),
-            Permission.action.label("action"),
-        )
-        .select_from(User)
-        .outerjoin(UserPermission, User.id == UserPermission.user_id)
-        .outerjoin(Module, Module.id == UserPermission.module_id)
-        .outerjoin(Permission, Permission.id == UserPermission.permission_id)
-        .where(user_filter)
-        .order_by(User.id)
-    )
-
-    result = await db.execute(stmt)
+    if current_user.role == RoleEnum.user:
+        result = await db.execute(OWN_USER_WITH_PERMISSIONS, {"user_id": current_user.id})
+    else:
+        result = await db.execute(USERS_WITH_PERMISSIONS)
     rows = result.all()
 
     # 3. Group by user → module → [actions]
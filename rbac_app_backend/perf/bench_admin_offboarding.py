@@ -0,0 +1,115 @@
+# perf/bench_admin_offboarding.py
+"""
+Compares the set-based admin offboarding against the ORM `db.delete(admin)`
+path on an admin with many dependent rows.
+
+Seeds (directly in the configured database):
+  - one admin + one successor admin
+  - DEPENDENT_ROWS / 2 users created by the admin
+  - DEPENDENT_ROWS / 2 grants assigned by the admin
+Each variant runs inside a transaction that is rolled back, so both see the
+same data. Seed rows are removed at the end.
+
+Run (against a migrated, disposable database):
+  python -m perf.bench_admin_offboarding
+Env overrides:
+  DEPENDENT_ROWS=100000 RUNS=3
+"""
+
+import asyncio
+import os
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app.db.session import AsyncSessionLocal, engine
+from app.models.users import User
+from app.services.admin_offboard_service import offboard_statements
+
+DEPENDENT_ROWS = int(os.getenv("DEPENDENT_ROWS", "100000"))
+RUNS = int(os.getenv("RUNS", "3"))
+PREFIX = "bench-offboard"
+
+
+async def seed() -> tuple[int, int]:
+    half = DEPENDENT_ROWS // 2
+    async with engine.begin() as conn:
+        # Seeding takes longer than any DB_STMT_TIMEOUT_MS meant for requests
+        await conn.execute(text("SET LOCAL statement_timeout = 0"))
+        admin_id = await conn.scalar(text(
+            "INSERT INTO users (email, hashed_password, role) "
+            f"VALUES ('{PREFIX}-admin@example.com', 'x', 'admin') RETURNING id"
+        ))
+        successor_id = await conn.scalar(text(
+            "INSERT INTO users (email, hashed_password, role) "
+            f"VALUES ('{PREFIX}-successor@example.com', 'x', 'admin') RETURNING id"
+        ))
+        await conn.execute(text(
+            "INSERT INTO users (email, hashed_password, role, created_by) "
+            f"SELECT '{PREFIX}-' || g || '@example.com', 'x', 'user', :admin "
+            "FROM generate_series(1, :n) AS g"
+        ), {"admin": admin_id, "n": half})
+        await conn.execute(text(
+            "INSERT INTO user_permissions (user_id, module_id, permission_id, assigned_by) "
+            "SELECT u.id, (SELECT min(id) FROM modules), (SELECT min(id) FROM permissions), :admin "
+            "FROM users u WHERE u.created_by = :admin"
+        ), {"admin": admin_id})
+    return admin_id, successor_id
+
+
+async def cleanup() -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("SET LOCAL statement_timeout = 0"))
+        await conn.execute(text(
+            "DELETE FROM user_permissions WHERE user_id IN "
+            f"(SELECT id FROM users WHERE email LIKE '{PREFIX}-%')"
+        ))
+        await conn.execute(text(f"UPDATE users SET created_by = NULL WHERE email LIKE '{PREFIX}-%'"))
+        await conn.execute(text(f"DELETE FROM users WHERE email LIKE '{PREFIX}-%'"))
+
+
+async def time_set_based(admin_id: int, successor_id: int) -> float:
+    async with AsyncSessionLocal() as db:
+        start = time.perf_counter()
+        for stmt in offboard_statements(admin_id, successor_id):
+            await db.execute(stmt)
+        await db.flush()
+        elapsed = time.perf_counter() - start
+        await db.rollback()
+    return elapsed
+
+
+async def time_orm_delete(admin_id: int) -> float:
+    async with AsyncSessionLocal() as db:
+        start = time.perf_counter()
+        admin = await db.get(User, admin_id)
+        await db.delete(admin)
+        await db.flush()
+        elapsed = time.perf_counter() - start
+        await db.rollback()
+    return elapsed
+
+
+async def main():
+    await cleanup()
+    admin_id, successor_id = await seed()
+    print(f"Seeded admin {admin_id} with {DEPENDENT_ROWS} dependent rows")
+
+    try:
+        for label, fn in (
+            ("set-based offboard", lambda: time_set_based(admin_id, successor_id)),
+            ("ORM db.delete", lambda: time_orm_delete(admin_id)),
+        ):
+            timings = [await fn() for _ in range(RUNS)]
+            print(
+                f"{label:20s} median {statistics.median(timings) * 1000:9.1f} ms "
+                f"(min {min(timings) * 1000:.1f}, max {max(timings) * 1000:.1f})"
+            )
+    finally:
+        await cleanup()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,82 @@
+# perf/bench_auth_fast_path.py
+"""
+Per-request CPU cost of the auth + permission lookups: session path vs. the raw
+asyncpg fast path (AUTH_FAST_PATH).
+
+Each "request" opens a session on the auth pool, loads the principal by email
+and reads its actions on one module, the same work `get_current_user` plus a
+permission check do. CPU time is process time, so waiting on Postgres is
+excluded; wall latency is reported alongside.
+
+Run (needs the database from .env with at least one active user):
+  python -m perf.bench_auth_fast_path
+Env overrides:
+  REQUESTS=5000 MODULE_ID=1 AUTH_EMAIL=someone@example.com
+"""
+
+import asyncio
+import os
+import statistics
+import time
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db import fast_path
+from app.db.session import ClassSessionLocal, TrafficClass, all_engines
+from app.models.users import User
+
+REQUESTS = int(os.getenv("REQUESTS", "5000"))
+MODULE_ID = int(os.getenv("MODULE_ID", "1"))
+
+
+async def pick_email() -> str:
+    if os.getenv("AUTH_EMAIL"):
+        return os.environ["AUTH_EMAIL"]
+    async with ClassSessionLocal[TrafficClass.auth]() as db:
+        email = await db.scalar(select(User.email).where(User.is_active.is_(True)).limit(1))
+    if email is None:
+        raise SystemExit("No active user to authenticate as; seed one or set AUTH_EMAIL")
+    return email
+
+
+async def run(label: str, enabled: bool, email: str) -> None:
+    settings.AUTH_FAST_PATH = enabled
+    latencies: list[float] = []
+
+    async def one_request() -> None:
+        async with ClassSessionLocal[TrafficClass.auth]() as db:
+            principal = await fast_path.fetch_principal(db, email)
+            await fast_path.fetch_module_actions(db, principal.id, MODULE_ID)
+
+    for _ in range(50):  # warm the pool and statement caches
+        await one_request()
+
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        await one_request()
+        latencies.append(time.perf_counter() - start)
+    cpu = time.process_time() - cpu
+    wall = time.perf_counter() - wall
+
+    ordered = sorted(latencies)
+    print(
+        f"{label:<10} cpu {cpu / REQUESTS * 1e6:8.1f} us/request   "
+        f"p50 {statistics.median(ordered) * 1000:.3f} ms   "
+        f"p99 {ordered[int(len(ordered) * 0.99) - 1] * 1000:.3f} ms   "
+        f"({REQUESTS / wall:.0f} req/s sequential)"
+    )
+
+
+async def main() -> None:
+    email = await pick_email()
+    await run("session", False, email)
+    await run("fast path", True, email)
+    for eng in all_engines().values():
+        await eng.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,68 @@
+# perf/bench_checkout_latency.py
+"""
+Checkout latency with pool_pre_ping (a round trip on every checkout) vs. the
+default of background health checking (no ping on the hot path).
+
+Each iteration checks a connection out of a warm pool, runs the hot
+principal lookup and returns it, like a request's session does. Latency is
+measured around the whole thing and around the checkout alone.
+
+Run (needs the database from .env):
+  python -m perf.bench_checkout_latency
+Env overrides:
+  ITERATIONS=5000 CONCURRENCY=1
+"""
+
+import asyncio
+import os
+import statistics
+import time
+
+from app.core.config import settings
+from app.db.session import _make_engine
+from app.db.statements import PRINCIPAL_BY_EMAIL
+
+ITERATIONS = int(os.getenv("ITERATIONS", "5000"))
+CONCURRENCY = int(os.getenv("CONCURRENCY", "1"))
+
+
+def summary(samples: list) -> str:
+    ordered = sorted(samples)
+    return (
+        f"p50 {statistics.median(ordered) * 1000:.3f} ms  "
+        f"p95 {ordered[int(len(ordered) * 0.95) - 1] * 1000:.3f} ms  "
+        f"p99 {ordered[int(len(ordered) * 0.99) - 1] * 1000:.3f} ms"
+    )
+
+
+async def run(pre_ping: bool) -> None:
+    settings.DB_POOL_PRE_PING = pre_ping  # read by _make_engine
+    eng = _make_engine(settings.DATABASE_URL, pool_size=CONCURRENCY, max_overflow=0)
+    checkouts: list = []
+    totals: list = []
+
+    async def worker() -> None:
+        for _ in range(ITERATIONS // CONCURRENCY):
+            start = time.perf_counter()
+            async with eng.connect() as conn:
+                checkouts.append(time.perf_counter() - start)
+                await conn.execute(PRINCIPAL_BY_EMAIL, {"email": "nobody@example.com"})
+            totals.append(time.perf_counter() - start)
+
+    async with eng.connect():  # open the pool's connection(s) up front
+        pass
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    await eng.dispose()
+
+    label = "pre_ping" if pre_ping else "no ping"
+    print(f"{label:<8} checkout  {summary(checkouts)}")
+    print(f"{'':<8} + query   {summary(totals)}")
+
+
+async def main() -> None:
+    await run(pre_ping=True)
+    await run(pre_ping=False)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+# perf/bench_init_db.py
+"""
+Startup cost of init_db when N workers start at once (a rolling deploy):
+first with the catalog hash missing (every worker seeds), then with it in
+place (every worker short-circuits after one query).
+
+Run (needs the database from .env, migrated to head):
+  python -m perf.bench_init_db
+Env overrides:
+  WORKERS=8 ROUNDS=5
+"""
+
+import asyncio
+import os
+import statistics
+import time
+
+from sqlalchemy import delete
+
+from app.db.init_db import CATALOG_HASH_KEY, init_db
+from app.db.session import AsyncSessionLocal, engine
+from app.models.app_meta import AppMeta
+
+WORKERS = int(os.getenv("WORKERS", "8"))
+ROUNDS = int(os.getenv("ROUNDS", "5"))
+
+
+async def timed_init() -> float:
+    start = time.perf_counter()
+    await init_db()
+    return time.perf_counter() - start
+
+
+async def forget_catalog() -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(AppMeta).where(AppMeta.key == CATALOG_HASH_KEY))
+        await db.commit()
+
+
+async def run(label: str, cold: bool) -> None:
+    samples = []
+    for _ in range(ROUNDS):
+        if cold:
+            await forget_catalog()
+        samples.extend(await asyncio.gather(*(timed_init() for _ in range(WORKERS))))
+    print(
+        f"{label:<22} median {statistics.median(samples) * 1000:7.2f} ms   "
+        f"max {max(samples) * 1000:7.2f} ms   ({WORKERS} workers x {ROUNDS} rounds)"
+    )
+
+
+async def main() -> None:
+    await run("hash missing (seed)", cold=True)
+    await run("hash matches (skip)", cold=False)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,146 @@
+# perf/bench_metrics_overhead.py
+"""
+Cost of the Prometheus instrumentation, per operation, against the same
+operation uninstrumented:
+  - MetricsMiddleware around a one-route app (ASGI calls, no server)
+  - decode_access_token vs. a bare jose decode
+  - the bcrypt thread wrapper vs. a bare asyncio.to_thread (no-op work)
+  - TimedPool checkout/checkin vs. the plain queue pool (SQLite in memory)
+  - one /metrics scrape (generate_latest) after the above
+
+No database or server needed. Run:
+  python -m perf.bench_metrics_overhead
+Env overrides:
+  N=20000
+"""
+
+import asyncio
+import os
+import statistics
+import time
+
+from fastapi import FastAPI
+from jose import jwt
+from prometheus_client import REGISTRY, generate_latest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import settings
+from app.core.metrics import MetricsMiddleware
+from app.core.security import _run_bcrypt, create_access_token, decode_access_token
+from app.db.session import TimedPool
+
+N = int(os.getenv("N", "20000"))
+
+
+async def mean_call(fn, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        await fn()
+    return (time.perf_counter() - start) / n
+
+
+async def compare(label: str, bare, instrumented, n: int = N) -> None:
+    """Alternate the two variants over 7 rounds (so drift hits both) and report medians."""
+    await mean_call(bare, n // 10)
+    await mean_call(instrumented, n // 10)
+    bare_runs, instrumented_runs = [], []
+    for _ in range(7):
+        bare_runs.append(await mean_call(bare, n))
+        instrumented_runs.append(await mean_call(instrumented, n))
+    b, i = statistics.median(bare_runs), statistics.median(instrumented_runs)
+    print(
+        f"{label:<24} bare {b * 1e6:8.2f} us   instrumented {i * 1e6:8.2f} us   "
+        f"overhead {(i - b) * 1e6:+7.2f} us"
+    )
+
+
+def asgi_caller(app):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "path": "/items/7", "raw_path": b"/items/7", "root_path": "",
+        "scheme": "http", "query_string": b"", "headers": [],
+        "client": ("127.0.0.1", 1), "server": ("127.0.0.1", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    async def call():
+        await app(dict(scope), receive, send)
+
+    return call
+
+
+async def middleware() -> None:
+    bare = FastAPI()
+
+    @bare.get("/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    await compare("request middleware", asgi_caller(bare), asgi_caller(MetricsMiddleware(bare)))
+
+
+async def jwt_decode() -> None:
+    token = create_access_token("bench@example.invalid")
+
+    async def bare():
+        jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+    async def instrumented():
+        decode_access_token(token)
+
+    await compare("jwt decode", bare, instrumented)
+
+
+async def bcrypt_wrapper() -> None:
+    def noop():
+        return None
+
+    async def bare():
+        await asyncio.to_thread(noop)
+
+    async def instrumented():
+        await _run_bcrypt("hash", noop)
+
+    await compare("bcrypt thread hop", bare, instrumented, N // 10)
+
+
+async def pool_checkout() -> None:
+    plain, timed = (
+        create_async_engine("sqlite+aiosqlite://", poolclass=poolclass, pool_size=1, max_overflow=0)
+        for poolclass in (AsyncAdaptedQueuePool, TimedPool)
+    )
+
+    async def checkout(eng):
+        async with eng.connect():
+            pass
+
+    await compare("pool checkout+checkin", lambda: checkout(plain), lambda: checkout(timed), N // 10)
+    await plain.dispose()
+    await timed.dispose()
+
+
+def scrape() -> None:
+    runs = []
+    for _ in range(20):
+        start = time.perf_counter()
+        body = generate_latest(REGISTRY)
+        runs.append(time.perf_counter() - start)
+    print(f"{'/metrics scrape':<24} {statistics.median(runs) * 1000:8.2f} ms   {len(body)} bytes")
+
+
+async def main() -> None:
+    await middleware()
+    await jwt_decode()
+    await bcrypt_wrapper()
+    await pool_checkout()
+    scrape()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
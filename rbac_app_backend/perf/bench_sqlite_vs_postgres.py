@@ -0,0 +1,169 @@
+# perf/bench_sqlite_vs_postgres.py
+"""
+Embedded SQLite (DB_BACKEND=sqlite) vs. Postgres for the hot paths of a
+single-node install: principal/target lookups, the module permission check,
+the users-with-permissions listing and a committed single-row write.
+
+Both backends get the same seed (SEED_USERS users under SEED_USERS // 50
+admins, two grants each) through engines built by `_make_engine`, so the
+SQLite side runs with the production PRAGMAs. SQLite uses a temp file;
+the Postgres rows are tagged and deleted at the end.
+
+Run (Postgres from .env, migrated to head; pass --sqlite-only without one):
+  python -m perf.bench_sqlite_vs_postgres
+Env overrides:
+  SEED_USERS=2000 ROUNDS=500
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from sqlalchemy import delete, insert, select
+
+from app.core.config import settings
+from app.db.base_class import Base
+from app.db.session import _make_engine
+from app.db.statements import (
+    MODULE_ACTIONS_FOR_USER,
+    PRINCIPAL_BY_EMAIL,
+    TARGET_USER_BY_ID,
+    USERS_WITH_PERMISSIONS,
+)
+from app.models.module import Module
+from app.models.permission import Permission
+from app.models.user_permission import UserPermission
+from app.models.users import RoleEnum, User
+
+SEED_USERS = int(os.getenv("SEED_USERS", "2000"))
+ROUNDS = int(os.getenv("ROUNDS", "500"))
+TAG = "bench-sqlite-pg-"
+
+
+async def seed(eng) -> dict:
+    admins = max(SEED_USERS // 50, 1)
+    async with eng.begin() as conn:
+        if eng.dialect.name == "sqlite":
+            await conn.run_sync(Base.metadata.create_all)
+        for name in ("MQTT", "S7"):
+            if await conn.scalar(select(Module.id).where(Module.name == name)) is None:
+                await conn.execute(insert(Module).values(name=name))
+        for action in ("add", "view"):
+            if await conn.scalar(select(Permission.id).where(Permission.action == action)) is None:
+                await conn.execute(insert(Permission).values(action=action))
+        module_ids = (await conn.scalars(select(Module.id).order_by(Module.id).limit(2))).all()
+        permission_ids = (await conn.scalars(select(Permission.id).order_by(Permission.id).limit(2))).all()
+
+        await conn.execute(insert(User), [
+            {"email": f"{TAG}admin-{i}@example.invalid", "hashed_password": "x", "role": RoleEnum.admin}
+            for i in range(admins)
+        ])
+        admin_ids = (await conn.scalars(
+            select(User.id).where(User.email.like(f"{TAG}admin-%")).order_by(User.id)
+        )).all()
+        await conn.execute(insert(User), [
+            {
+                "email": f"{TAG}user-{i}@example.invalid",
+                "hashed_password": "x",
+                "role": RoleEnum.user,
+                "created_by": admin_ids[i % admins],
+            }
+            for i in range(SEED_USERS)
+        ])
+        users = (await conn.execute(
+            select(User.id, User.created_by).where(User.email.like(f"{TAG}user-%"))
+        )).all()
+        await conn.execute(insert(UserPermission), [
+            {"user_id": uid, "module_id": module_ids[0], "permission_id": pid, "assigned_by": creator}
+            for uid, creator in users
+            for pid in permission_ids
+        ])
+    user_id = users[len(users) // 2][0]
+    return {
+        "email": f"{TAG}user-{SEED_USERS // 2}@example.invalid",
+        "user_id": user_id,
+        "module_id": module_ids[0],
+        "spare_module_id": module_ids[1],
+        "permission_id": permission_ids[0],
+    }
+
+
+async def cleanup(eng) -> None:
+    async with eng.begin() as conn:
+        await conn.execute(delete(User).where(User.email.like(f"{TAG}user-%")))
+        await conn.execute(delete(User).where(User.email.like(f"{TAG}admin-%")))
+
+
+async def timed(label: str, fn) -> None:
+    samples = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    print(
+        f"  {label:<28} median {statistics.median(samples) * 1e6:9.1f} us   "
+        f"p95 {samples[int(len(samples) * 0.95)] * 1e6:9.1f} us"
+    )
+
+
+async def run(label: str, url: str) -> None:
+    eng = _make_engine(url, pool_size=1, max_overflow=0)
+    try:
+        ids = await seed(eng)
+        print(f"{label} ({SEED_USERS} users)")
+        async with eng.connect() as conn:
+            async def principal():
+                (await conn.execute(PRINCIPAL_BY_EMAIL, {"email": ids["email"]})).first()
+
+            async def target():
+                (await conn.execute(TARGET_USER_BY_ID, {"user_id": ids["user_id"]})).first()
+
+            async def module_actions():
+                (await conn.execute(
+                    MODULE_ACTIONS_FOR_USER, {"user_id": ids["user_id"], "module_id": ids["module_id"]}
+                )).all()
+
+            async def listing():
+                (await conn.execute(USERS_WITH_PERMISSIONS)).all()
+
+            async def grant_and_revoke():
+                grant = {
+                    "user_id": ids["user_id"],
+                    "module_id": ids["spare_module_id"],
+                    "permission_id": ids["permission_id"],
+                }
+                await conn.execute(insert(UserPermission).values(**grant))
+                await conn.commit()
+                await conn.execute(delete(UserPermission).filter_by(**grant))
+                await conn.commit()
+
+            await timed("principal by email", principal)
+            await conn.commit()
+            await timed("target user by id", target)
+            await conn.commit()
+            await timed("module actions for user", module_actions)
+            await conn.commit()
+            await timed("users-with-permissions", listing)
+            await conn.commit()
+            await timed("grant + revoke (2 commits)", grant_and_revoke)
+        if eng.dialect.name != "sqlite":
+            await cleanup(eng)
+    finally:
+        await eng.dispose()
+
+
+async def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        await run("sqlite", f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+    if "--sqlite-only" not in sys.argv:
+        if settings.DB_BACKEND != "postgresql":
+            raise SystemExit("Set DB_BACKEND=postgresql (and the POSTGRES_* settings) for the comparison")
+        await run("postgresql", settings.DATABASE_URL)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
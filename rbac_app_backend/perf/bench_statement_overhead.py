@@ -0,0 +1,78 @@
+# perf/bench_statement_overhead.py
+"""
+Python-side cost of a hot lookup before anything reaches the driver:
+building the select() per request vs. reusing the registry statement.
+
+Both paths go through SQLAlchemy's compiled cache the way Connection.execute
+does (cache key -> compiled SQL), so the difference is construction plus
+cache-key generation. No database is needed.
+
+Run:
+  python -m perf.bench_statement_overhead
+Env overrides:
+  ITERATIONS=20000
+"""
+
+import os
+import time
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.db.statements import MODULE_ACTIONS_FOR_USER, PRINCIPAL_BY_EMAIL
+from app.models.permission import Permission
+from app.models.user_permission import UserPermission
+from app.models.users import User
+
+ITERATIONS = int(os.getenv("ITERATIONS", "20000"))
+DIALECT = postgresql.asyncpg.dialect()
+
+
+def compile_cached(stmt, cache: dict):
+    # Mirrors Connection._execute_clauseelement: key lookup, compile on miss
+    key = stmt._generate_cache_key()
+    compiled = cache.get(key.key if key else None)
+    if compiled is None:
+        compiled = stmt.compile(dialect=DIALECT)
+        cache[key.key] = compiled
+    return compiled, key
+
+
+def per_request_user_by_email(i: int):
+    return select(User.id, User.email, User.role, User.created_by).where(
+        User.email == f"user{i}@example.com", User.is_active.is_(True)
+    )
+
+
+def per_request_module_actions(i: int):
+    return (
+        select(Permission.action)
+        .join(UserPermission, UserPermission.permission_id == Permission.id)
+        .where(UserPermission.user_id == i, UserPermission.module_id == 1)
+    )
+
+
+def bench(label: str, make) -> float:
+    cache: dict = {}
+    compile_cached(make(0), cache)  # warm
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        compile_cached(make(i), cache)
+    per_call = (time.perf_counter() - start) / ITERATIONS * 1e6
+    print(f"{label:<40} {per_call:8.2f} us/query  (cache entries: {len(cache)})")
+    return per_call
+
+
+def main() -> None:
+    print(f"{ITERATIONS} iterations\n")
+    for name, build, registry in (
+        ("PRINCIPAL_BY_EMAIL", per_request_user_by_email, PRINCIPAL_BY_EMAIL),
+        ("MODULE_ACTIONS_FOR_USER", per_request_module_actions, MODULE_ACTIONS_FOR_USER),
+    ):
+        built = bench(f"{name}: built per request", build)
+        reused = bench(f"{name}: registry", lambda i: registry)
+        print(f"{'':<40} {built / reused:8.1f}x\n")
+
+
+if __name__ == "__main__":
+    main()
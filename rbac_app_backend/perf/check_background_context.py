@@ -0,0 +1,66 @@
+# perf/check_background_context.py
+"""
+Regression check: a job submitted from inside a request must not inherit
+the request's context. Before the fix, JobRunner.submit copied the caller's
+contextvars, so a bulk-revoke job ran under the 3 s deadline of
+POST /jobs/bulk-revoke (statement_timeout/lock_timeout collapsing once it
+passed), and its statements were counted in that request's RequestTiming,
+against the route's query budget and N+1 check.
+
+Sets request_deadline, request_timing and request_writes the way the
+middlewares do, enqueues a probe job and checks what its handler sees.
+Exits non-zero if anything leaked.
+
+Run (any backend; DB_BACKEND=sqlite needs no server):
+  python -m perf.check_background_context
+"""
+
+import asyncio
+import sys
+import time
+
+from app.core.principal import Principal
+from app.core.server_timing import RequestTiming, request_timing
+from app.db.session import AsyncSessionLocal, request_deadline, request_writes
+from app.main import app
+from app.schemas.create_admin import RoleEnum
+from app.services.job_service import enqueue_job, job_handler
+
+PROBE_KIND = "context_probe"
+seen: dict = {}
+done = asyncio.Event()
+
+
+@job_handler(PROBE_KIND)
+async def probe(ctx) -> dict:
+    seen.update(
+        deadline=request_deadline.get(),
+        timing=request_timing.get(),
+        writes=request_writes.get(),
+    )
+    done.set()
+    return {}
+
+
+async def main() -> int:
+    async with app.router.lifespan_context(app):
+        # What DeadlineMiddleware / ServerTimingMiddleware / ReadYourWritesMiddleware set
+        request_deadline.set(time.monotonic() + 3)
+        request_timing.set(RequestTiming())
+        request_writes.set({})
+
+        caller = Principal(None, "context-probe@example.invalid", RoleEnum.superadmin, None)
+        async with AsyncSessionLocal() as db:
+            await enqueue_job(db, PROBE_KIND, {}, caller)
+        await asyncio.wait_for(done.wait(), timeout=30)
+
+    leaked = {name: value for name, value in seen.items() if value is not None}
+    for name, value in leaked.items():
+        print(f"FAIL job task inherited request {name}: {value!r}")
+    if not leaked:
+        print("OK job task runs in a clean context")
+    return 1 if leaked else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,191 @@
+# perf/explain_hot_queries.py
+"""
+Query-plan regression check: EXPLAINs the statements the services issue and
+fails if any of them sequentially scans a large table (users,
+user_permissions, jobs). Small lookup tables (modules, permissions) may be
+scanned.
+
+Statements built at request time (clone, bulk delete, bulk revoke,
+offboarding, purge) come from the builder each service uses, so the check
+sees the SQL the service sends. Bulk delete is checked in the configured
+USER_SOFT_DELETE mode; run once per mode.
+
+The data is seeded inside a transaction and ANALYZEd, and the transaction
+is rolled back at the end, so this can point at any local database that is
+migrated to head (the indexes come from the migrations, not from here).
+
+Run:
+  alembic upgrade head
+  python -m perf.explain_hot_queries          # exits 1 on a regression
+Env overrides:
+  SEED_USERS=50000 VERBOSE=1
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import settings
+from app.db.fast_path import _PRINCIPAL_BY_EMAIL_SQL, _TARGET_USER_BY_ID_SQL
+from app.db.session import engine
+from app.db.statements import (
+    HAS_ANY_GRANT_ON_MODULE,
+    LOGIN_BY_EMAIL,
+    MODULE_ACTIONS_FOR_USER,
+    OWN_USER_WITH_PERMISSIONS,
+    PERMISSIONS_BY_ACTIONS,
+    PRINCIPAL_BY_EMAIL,
+    SUPERADMIN_EXISTS,
+    TARGET_USER_BY_ID,
+    USER_PERMISSION_MATRIX,
+    USERS_WITH_PERMISSIONS,
+)
+from app.models.job import Job
+from app.services.admin_offboard_service import offboard_statements
+from app.services.bulk_revoke_service import revoke_batch_statement
+from app.services.job_service import job_runner
+from app.services.user_bulk_delete_service import bulk_delete_statement
+from app.services.user_permission_clone_service import clone_statement
+from app.services.user_purge_service import purge_candidates
+
+SEED_USERS = int(os.getenv("SEED_USERS", "50000"))
+VERBOSE = os.getenv("VERBOSE") == "1"
+HOT_TABLES = {"users", "user_permissions", "jobs"}
+DIALECT = postgresql.asyncpg.dialect()
+
+SEED_SQL = [
+    # Seeding takes longer than any DB_STMT_TIMEOUT_MS meant for requests
+    "SET LOCAL statement_timeout = 0",
+    # 1 admin per 50 users; 1 in 20 soft-deleted
+    """
+    INSERT INTO users (email, hashed_password, role, is_active)
+    SELECT 'explain-admin-' || g || '@example.invalid', 'x', 'admin', true
+    FROM generate_series(1, {admins}) g
+    """,
+    """
+    INSERT INTO users (email, hashed_password, role, created_by, is_active)
+    SELECT 'explain-user-' || g || '@example.invalid', 'x', 'user',
+           (SELECT id FROM users WHERE email = 'explain-admin-' || (g % ({admins}) + 1) || '@example.invalid'),
+           g % 20 <> 0
+    FROM generate_series(1, {users}) g
+    """,
+    # Two modules x two actions per seeded user, assigned by its creator
+    """
+    INSERT INTO user_permissions (user_id, module_id, permission_id, assigned_by)
+    SELECT u.id, m.id, p.id, u.created_by
+    FROM users u
+    CROSS JOIN (SELECT id FROM modules ORDER BY id LIMIT 2) m
+    CROSS JOIN (SELECT id FROM permissions ORDER BY id LIMIT 2) p
+    WHERE u.email LIKE 'explain-%'
+    """,
+    # Mostly finished jobs, a handful still claimable
+    """
+    INSERT INTO jobs (kind, status, params, processed)
+    SELECT 'explain', CASE WHEN g % 1000 = 0 THEN 'queued' ELSE 'succeeded' END, '{{}}', 0
+    FROM generate_series(1, {users}) g
+    """,
+    "ANALYZE users",
+    "ANALYZE user_permissions",
+    "ANALYZE jobs",
+]
+
+
+async def sample_ids(conn) -> dict:
+    row = (await conn.execute(text("""
+        SELECT u.id, u.email, u.created_by, up.module_id
+        FROM users u JOIN user_permissions up ON up.user_id = u.id
+        WHERE u.email LIKE 'explain-user-%' AND u.is_active
+        LIMIT 1
+    """))).one()
+    siblings = (await conn.execute(text("""
+        SELECT id FROM users
+        WHERE created_by = :admin_id AND id <> :user_id AND is_active
+        ORDER BY id LIMIT :n
+    """), {"admin_id": row[2], "user_id": row[0], "n": settings.JOB_BATCH_SIZE})).scalars().all()
+    return {
+        "user_id": row[0], "email": row[1], "admin_id": row[2], "module_id": row[3],
+        "user_ids": list(siblings),
+    }
+
+
+def raw_sql(sql: str, *values):
+    """A fast-path asyncpg statement with its $n placeholders bound to `values`."""
+    params = {f"p{n}": value for n, value in enumerate(values, 1)}
+    for name in params:
+        sql = sql.replace(f"${name[1:]}", f":{name}")
+    return text(sql).bindparams(**params)
+
+
+def hot_statements(ids: dict) -> list:
+    """(name, statement) for everything checked; statements carry their params."""
+    statements = [
+        ("PRINCIPAL_BY_EMAIL", PRINCIPAL_BY_EMAIL.params(email=ids["email"])),
+        ("LOGIN_BY_EMAIL", LOGIN_BY_EMAIL.params(email=ids["email"])),
+        ("TARGET_USER_BY_ID", TARGET_USER_BY_ID.params(user_id=ids["user_id"])),
+        ("fast path: principal", raw_sql(_PRINCIPAL_BY_EMAIL_SQL, ids["email"])),
+        ("fast path: target user", raw_sql(_TARGET_USER_BY_ID_SQL, ids["user_id"])),
+        ("SUPERADMIN_EXISTS", SUPERADMIN_EXISTS),
+        ("MODULE_ACTIONS_FOR_USER", MODULE_ACTIONS_FOR_USER.params(user_id=ids["user_id"], module_id=ids["module_id"])),
+        ("HAS_ANY_GRANT_ON_MODULE", HAS_ANY_GRANT_ON_MODULE.params(user_id=ids["admin_id"], module_id=ids["module_id"])),
+        ("PERMISSIONS_BY_ACTIONS", PERMISSIONS_BY_ACTIONS.params(actions=["add", "view"])),
+        ("USER_PERMISSION_MATRIX", USER_PERMISSION_MATRIX.params(user_id=ids["user_id"])),
+        ("OWN_USER_WITH_PERMISSIONS", OWN_USER_WITH_PERMISSIONS.params(user_id=ids["user_id"])),
+        ("USERS_WITH_PERMISSIONS", USERS_WITH_PERMISSIONS),
+        ("clone (admin)", clone_statement(ids["user_id"], ids["user_ids"][:50], ids["admin_id"], only_held=True)),
+        ("clone (superadmin)", clone_statement(ids["user_id"], ids["user_ids"][:50], ids["admin_id"], only_held=False)),
+        (
+            "bulk delete (" + ("soft" if settings.USER_SOFT_DELETE else "hard") + ")",
+            bulk_delete_statement(ids["user_ids"][:50], ids["admin_id"]),
+        ),
+        ("bulk revoke batch", revoke_batch_statement(ids["user_ids"], ids["module_id"], [1, 2])),
+        ("purge_candidates", purge_candidates(settings.USER_PURGE_BATCH_SIZE)),
+        ("job claim scan", select(Job.id).where(job_runner._claimable()).order_by(Job.id).limit(100)),
+    ]
+    labels = ["reassign users", "reassign grants", "remove grants", "delete admin"]
+    for label, stmt in zip(labels, offboard_statements(ids["admin_id"], ids["admin_id"])):
+        statements.append((f"offboard: {label}", stmt))
+    return statements
+
+
+def seq_scans(plan: dict) -> list:
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in HOT_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+async def main() -> int:
+    failures = 0
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            for sql in SEED_SQL:
+                await conn.execute(text(sql.format(users=SEED_USERS, admins=max(SEED_USERS // 50, 1))))
+            ids = await sample_ids(conn)
+
+            for name, stmt in hot_statements(ids):
+                sql = str(stmt.compile(dialect=DIALECT, compile_kwargs={"literal_binds": True}))
+                result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+                explained = result.scalar()  # asyncpg's json codec already decodes it
+                plan = (json.loads(explained) if isinstance(explained, str) else explained)[0]["Plan"]
+                scans = seq_scans(plan)
+                status = "SEQ SCAN on " + ", ".join(scans) if scans else "ok"
+                failures += bool(scans)
+                print(f"{name:<32} {status}")
+                if VERBOSE or scans:
+                    print(json.dumps(plan, indent=2))
+        finally:
+            await trans.rollback()
+    await engine.dispose()
+    print(f"\n{failures} regression(s)")
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(1 if asyncio.run(main()) else 0)
@@ -0,0 +1,140 @@
+# perf/import_budget.py
+"""
+Import-time budget for worker cold start.
+
+Runs `python -X importtime -c "import app.main"` RUNS times in fresh
+interpreters, takes the median cumulative time per module, and checks it
+against perf/import_budget.json:
+  - "total_ms":        cumulative import time of app.main
+  - "first_request_ms": process start -> first response from GET / (no lifespan)
+  - "modules_ms":      per-module ceilings for the heavy hitters
+  - "deferred":        modules that must NOT be imported by `import app.main`
+                       (they load on first use / after readiness)
+Exits non-zero on any violation.
+
+Run:
+  python -m perf.import_budget            # check
+  python -m perf.import_budget --update   # rewrite the budget from this machine (+HEADROOM)
+Env overrides:
+  RUNS=7 HEADROOM=1.3
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+RUNS = int(os.getenv("RUNS", "7"))
+HEADROOM = float(os.getenv("HEADROOM", "1.3"))
+BUDGET_FILE = Path(__file__).with_name("import_budget.json")
+ROOT = Path(__file__).resolve().parent.parent
+
+# Serve one request straight through the ASGI app: no server, no lifespan (DB)
+FIRST_REQUEST = """
+import asyncio
+import app.main
+
+async def first_request():
+    sent = []
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+             "method": "GET", "path": "/", "raw_path": b"/", "root_path": "",
+             "scheme": "http", "query_string": b"", "headers": [],
+             "client": ("127.0.0.1", 1), "server": ("127.0.0.1", 80)}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app.main.app(scope, receive, send)
+    assert sent[0]["status"] == 200, sent[0]
+
+asyncio.run(first_request())
+"""
+
+
+def import_times() -> dict:
+    """Cumulative import time in ms per module, for one fresh interpreter."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def first_request_ms() -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", FIRST_REQUEST], cwd=ROOT, check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def measure() -> tuple:
+    samples = defaultdict(list)
+    for _ in range(RUNS):
+        for name, ms in import_times().items():
+            samples[name].append(ms)
+    medians = {name: statistics.median(values) for name, values in samples.items()}
+    first = statistics.median(first_request_ms() for _ in range(RUNS))
+    return medians, first
+
+
+def main() -> int:
+    medians, first = measure()
+    total = medians["app.main"]
+    budget = json.loads(BUDGET_FILE.read_text())
+
+    if "--update" in sys.argv:
+        budget["total_ms"] = round(total * HEADROOM)
+        budget["first_request_ms"] = round(first * HEADROOM)
+        budget["modules_ms"] = {
+            name: round(medians.get(name, 0) * HEADROOM, 1) for name in budget["modules_ms"]
+        }
+        BUDGET_FILE.write_text(json.dumps(budget, indent=2) + "\n")
+        print(f"Budget updated: {BUDGET_FILE}")
+        return 0
+
+    failures = []
+    print(f"{'app.main (total)':<32} {total:8.1f} ms  / {budget['total_ms']} ms")
+    if total > budget["total_ms"]:
+        failures.append("total")
+    print(f"{'first request':<32} {first:8.1f} ms  / {budget['first_request_ms']} ms")
+    if first > budget["first_request_ms"]:
+        failures.append("first request")
+    for name, limit in budget["modules_ms"].items():
+        ms = medians.get(name, 0.0)
+        print(f"{name:<32} {ms:8.1f} ms  / {limit} ms")
+        if ms > limit:
+            failures.append(name)
+    for name in budget["deferred"]:
+        loaded = name in medians or any(m.startswith(name + ".") for m in medians)
+        print(f"{name:<32} {'IMPORTED' if loaded else 'deferred'}")
+        if loaded:
+            failures.append(f"{name} imported eagerly")
+
+    slowest = sorted(
+        ((ms, name) for name, ms in medians.items() if not name.startswith(("app.", "encodings"))),
+        reverse=True,
+    )[:10]
+    print("\nHeaviest third-party imports (cumulative):")
+    for ms, name in slowest:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    if failures:
+        print(f"\nOver budget: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+# perf/measure_query_budgets.py
+"""
+Measures the statements each budgeted route runs, from its Server-Timing
+header, and prints them next to ROUTE_QUERY_BUDGETS. Use it to set or
+re-check the budgets after changing a route. Exits non-zero if a route is
+over its budget.
+
+Drives one pass through every budgeted route through the ASGI app (with
+its lifespan), starting with the first superadmin signup, so it needs an
+empty, migrated Postgres database. Run it once per delete mode:
+
+  USER_SOFT_DELETE=true  python -m perf.measure_query_budgets
+  USER_SOFT_DELETE=false python -m perf.measure_query_budgets   # fresh database again
+"""
+
+import asyncio
+import os
+import re
+import sys
+
+os.environ["SERVER_TIMING_ENABLED"] = "true"
+
+import httpx  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.main import app  # noqa: E402
+
+PASSWORD = "Budget-Passw0rd!"
+_QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+
+measured: dict[str, int] = {}
+
+
+async def call(client, key: str, path: str, headers=None, **kwargs) -> httpx.Response:
+    method = key.split(" ", 1)[0]
+    response = await client.request(method, path, headers=headers, **kwargs)
+    if response.status_code >= 400:
+        raise SystemExit(f"{key} ({path}) answered {response.status_code}: {response.text[:200]}")
+    count = int(_QUERIES_RE.search(response.headers["server-timing"]).group(1))
+    measured[key] = max(measured.get(key, 0), count)
+    return response
+
+
+async def login(client, email: str) -> dict:
+    token = (await call(client, "POST /login", "/login", json={"email": email, "password": PASSWORD})).json()
+    return {"Authorization": f"Bearer {token['access_token']}"}
+
+
+async def drive(client) -> None:
+    await call(client, "POST /signup", "/signup", json={"email": "root@example.com", "password": PASSWORD})
+    root = await login(client, "root@example.com")
+
+    admins = [
+        (await call(client, "POST /admins/", "/admins/", root, json={"email": email, "password": PASSWORD})).json()["id"]
+        for email in ("admin1@example.com", "admin2@example.com")
+    ]
+    for admin_id in admins:
+        await call(
+            client, "PUT /admins/{id}/permissions", f"/admins/{admin_id}/permissions", root,
+            json={"module_id": 1, "permissions": ["add", "view", "edit", "delete"]},
+        )
+    admin = await login(client, "admin1@example.com")
+
+    users = [
+        (await call(client, "POST /users/", "/users/", admin, json={"email": f"user{i}@example.com", "password": PASSWORD})).json()["id"]
+        for i in range(6)
+    ]
+    await call(
+        client, "PUT /users/{user_id}/permissions", f"/users/{users[0]}/permissions", admin,
+        json={"module_id": 1, "permissions": ["view", "add", "edit"]},
+    )
+    await call(
+        client, "POST /users/{user_id}/permissions/clone-from/{source_id}",
+        f"/users/{users[1]}/permissions/clone-from/{users[0]}", admin,
+    )
+    await call(
+        client, "POST /users/permissions/clone-from/{source_id}",
+        f"/users/permissions/clone-from/{users[0]}", admin, json={"target_ids": users[2:4]},
+    )
+    await call(client, "GET /users-with-permissions", "/users-with-permissions", root)
+    await call(client, "GET /users-with-permissions", "/users-with-permissions", admin)
+
+    job = (await call(
+        client, "POST /jobs/bulk-revoke", "/jobs/bulk-revoke", admin,
+        json={"user_ids": users[:4], "module_id": 1, "permissions": ["view"]},
+    )).json()
+    await asyncio.sleep(1)
+    await call(client, "GET /jobs/{job_id}", f"/jobs/{job['id']}", admin)
+
+    await call(client, "DELETE /users/{user_id}", f"/users/{users[5]}", admin)
+    await call(client, "POST /users/bulk-delete", "/users/bulk-delete", admin, json={"user_ids": users[3:5]})
+    await call(client, "POST /admins/{user_id}/offboard", f"/admins/{admins[1]}/offboard", root, json={"successor_id": admins[0]})
+    await call(client, "DELETE /admins/{user_id}", f"/admins/{admins[0]}", root)
+    await call(client, "GET /system/db-pools", "/system/db-pools", root)
+
+
+async def main() -> int:
+    if settings.DB_BACKEND != "postgresql":
+        raise SystemExit("Budgets are Postgres counts: run with DB_BACKEND=postgresql")
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://budget") as client:
+            await drive(client)
+
+    over = 0
+    print(f"USER_SOFT_DELETE={settings.USER_SOFT_DELETE}")
+    for key, budget in settings.ROUTE_QUERY_BUDGETS.items():
+        count = measured.get(key)
+        flag = "" if count is None or count <= budget else "  OVER"
+        over += bool(flag)
+        print(f"{key:<58} measured {'-' if count is None else count:>3}  budget {budget:>3}{flag}")
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,80 @@
+# perf/pool_occupancy.py
+"""
+Samples what the app's pooled connections are doing while a load test runs.
+
+A connection held across bcrypt shows up in pg_stat_activity as
+"idle in transaction"; one that was released shows up as "idle". Run this
+next to the locust login scenario, once before and once after a change:
+
+  locust -f locustfile.py --headless \\
+    -u 500 -r 25 -t 2m -H http://127.0.0.1:8000 LoginOnlyUser &
+  python -m perf.pool_occupancy
+
+Size -u to what the box can hash (one bcrypt verify is ~250 ms per core):
+far past that, logins queue into their deadline and most answer 504.
+
+Env overrides:
+  APP_NAME=rbac_app DURATION=120 INTERVAL=0.1
+"""
+
+import asyncio
+import os
+import statistics
+import time
+from collections import defaultdict
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+
+APP_NAME = os.getenv("APP_NAME", "rbac_app")
+DURATION = float(os.getenv("DURATION", "120"))
+INTERVAL = float(os.getenv("INTERVAL", "0.1"))
+
+STATES = ("active", "idle in transaction", "idle")
+
+
+async def main():
+    # Separate NullPool engine with its own application_name so the sampler
+    # never counts itself. Autocommit: pg_stat_activity is snapshotted once
+    # per transaction, so samples inside one transaction would all repeat
+    # the first.
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        poolclass=NullPool,
+        isolation_level="AUTOCOMMIT",
+        connect_args={"server_settings": {"application_name": "rbac_pool_sampler"}},
+    )
+    samples: dict[str, list[int]] = defaultdict(list)
+
+    async with engine.connect() as conn:
+        deadline = time.monotonic() + DURATION
+        while time.monotonic() < deadline:
+            rows = await conn.execute(
+                text(
+                    "SELECT state, count(*) FROM pg_stat_activity "
+                    "WHERE application_name = :app GROUP BY state"
+                ),
+                {"app": APP_NAME},
+            )
+            counts = dict(rows.all())
+            for state in STATES:
+                samples[state].append(counts.get(state, 0))
+            await asyncio.sleep(INTERVAL)
+
+    await engine.dispose()
+
+    print(f"{len(samples['idle'])} samples of application_name={APP_NAME!r}")
+    for state in STATES:
+        values = samples[state]
+        p95 = sorted(values)[int(len(values) * 0.95) - 1] if values else 0
+        print(
+            f"{state:22s} mean {statistics.fmean(values):6.1f}  "
+            f"p95 {p95:4d}  max {max(values, default=0):4d}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
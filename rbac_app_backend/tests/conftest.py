@@ -0,0 +1,62 @@
+# tests/conftest.py
+"""
+Integration-test fixtures on a throwaway Postgres database.
+
+The session builds (or reuses) the template database and clones it once
+(tests/db_template.py); each test then runs inside `savepoint_session`,
+which every route gets in place of `get_db`, and is rolled back afterwards.
+Needs the postgresql backend and a role allowed to create databases:
+
+    python -m pytest
+
+Run with QUERY_BUDGET_ENFORCE=true so a route that goes over its
+ROUTE_QUERY_BUDGETS entry (or repeats a statement N+1-style) answers 500.
+"""
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.db.session import get_db
+from app.main import app
+from db_template import build_template, clone_database, db_override, drop_database, savepoint_session
+
+TEST_DB = f"{settings.POSTGRES_DB}_test"
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def test_engine():
+    if settings.DB_BACKEND != "postgresql":
+        pytest.skip("the integration tests need DB_BACKEND=postgresql")
+    await build_template()
+    engine = create_async_engine(await clone_database(TEST_DB), poolclass=NullPool)
+    yield engine
+    await engine.dispose()
+    await drop_database(TEST_DB)
+
+
+@pytest.fixture
+async def db(test_engine):
+    async with savepoint_session(test_engine) as session:
+        app.dependency_overrides[get_db] = db_override(session)
+        try:
+            yield session
+        finally:
+            app.dependency_overrides.clear()
+
+
+def api_client() -> httpx.AsyncClient:
+    # No lifespan: the routes only reach the database through get_db
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.fixture
+async def client(db):
+    async with api_client() as client:
+        yield client
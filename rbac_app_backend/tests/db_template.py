@@ -0,0 +1,261 @@
+# tests/db_template.py
+"""
+Fast schema bootstrap for the integration tests.
+
+Replaying the Alembic chain for every test database is slow, so instead:
+
+1. `build_template()` creates the schema once from the models and stamps
+   it at head (`app.db.fresh_install.create_schema`, as a fresh install
+   does), seeds the catalog and marks the database as a template.
+   It is rebuilt only when the models, the migration head or the catalog
+   change (a fingerprint is kept in the database comment).
+2. `clone_database(name)` copies it with `CREATE DATABASE ... TEMPLATE`:
+   a file-level copy, well under a second.
+3. `savepoint_session(engine)` wraps each test in a transaction that is
+   rolled back; the code under test can commit freely (commits only
+   release SAVEPOINTs).
+4. `check_schema_sync()` replays the real migration chain into a scratch
+   database and diffs it against the models, so the create_all schema
+   can't drift from what existing databases reach with
+   `alembic upgrade head`. tests/test_schema_sync.py runs it.
+
+The pytest fixtures built on these live in tests/conftest.py.
+
+CLI (from the project root): python -m tests.db_template {build|check|clone NAME|drop NAME}
+"""
+import asyncio
+import hashlib
+import os
+import subprocess
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncGenerator, Callable, List
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlalchemy.schema import CreateIndex, CreateTable
+from sqlalchemy.sql.expression import ReleaseSavepointClause, RollbackToSavepointClause, SavepointClause
+
+from app.core.config import settings
+from app.db.base_class import Base
+from app.db.fresh_install import create_schema, migration_head
+from app.db.init_db import CATALOG_HASH_KEY, catalog_hash, module_names, valid_actions
+from app.models import users, module, permission, user_permission, job, app_meta  # noqa: F401  (register tables)
+from app.models.app_meta import AppMeta
+from app.models.module import Module
+from app.models.permission import Permission
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+# The revisions up to here build tables that aa2e49d60f91 creates again, so
+# the chain replays on an empty database stamped at this one
+REPLAY_FROM = "956c2e9932f6"
+TEMPLATE_DB = f"{settings.POSTGRES_DB}_template"
+_COMMENT_PREFIX = "rbac-template:"
+
+
+def database_url(name: str) -> str:
+    return (
+        f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}"
+        f"@{settings.POSTGRES_SERVER}:{settings.POSTGRES_PORT}/{name}"
+    )
+
+
+def _admin_engine() -> AsyncEngine:
+    # CREATE/DROP DATABASE can't run in a transaction or from the target database
+    return create_async_engine(
+        database_url("postgres"), poolclass=NullPool, isolation_level="AUTOCOMMIT"
+    )
+
+
+def _quote(name: str) -> str:
+    return postgresql.dialect().identifier_preparer.quote(name)
+
+
+def schema_fingerprint(head: str) -> str:
+    dialect = postgresql.dialect()
+    ddl = [str(CreateTable(table).compile(dialect=dialect)) for table in Base.metadata.sorted_tables]
+    ddl += [
+        str(CreateIndex(index).compile(dialect=dialect))
+        for table in Base.metadata.sorted_tables
+        for index in sorted(table.indexes, key=lambda i: i.name)
+    ]
+    ddl += [head, catalog_hash()]
+    return hashlib.sha256("\n".join(ddl).encode()).hexdigest()
+
+
+async def _drop(admin: AsyncEngine, name: str) -> None:
+    async with admin.connect() as conn:
+        exists = await conn.scalar(text("SELECT 1 FROM pg_database WHERE datname = :n"), {"n": name})
+        if exists:
+            await conn.execute(text(f"ALTER DATABASE {_quote(name)} IS_TEMPLATE false"))
+            await conn.execute(text(f"DROP DATABASE {_quote(name)} WITH (FORCE)"))
+
+
+async def build_template(force: bool = False) -> bool:
+    """Create or refresh the template database. Returns True if it was (re)built."""
+    head = migration_head()
+    fingerprint = _COMMENT_PREFIX + schema_fingerprint(head)
+    admin = _admin_engine()
+    try:
+        async with admin.connect() as conn:
+            current = await conn.scalar(
+                text("SELECT shobj_description(oid, 'pg_database') FROM pg_database WHERE datname = :n"),
+                {"n": TEMPLATE_DB},
+            )
+        if current == fingerprint and not force:
+            return False
+
+        await _drop(admin, TEMPLATE_DB)
+        async with admin.connect() as conn:
+            await conn.execute(text(f"CREATE DATABASE {_quote(TEMPLATE_DB)} TEMPLATE template0"))
+
+        template = create_async_engine(database_url(TEMPLATE_DB), poolclass=NullPool)
+        try:
+            async with template.begin() as conn:
+                await create_schema(conn, head)
+                await conn.execute(insert(Module).values([{"name": n} for n in module_names]))
+                await conn.execute(insert(Permission).values([{"action": a} for a in valid_actions]))
+                await conn.execute(insert(AppMeta).values(key=CATALOG_HASH_KEY, value=catalog_hash()))
+        finally:
+            await template.dispose()
+
+        async with admin.connect() as conn:
+            await conn.execute(text(f"ALTER DATABASE {_quote(TEMPLATE_DB)} IS_TEMPLATE true"))
+            await conn.execute(text(f"COMMENT ON DATABASE {_quote(TEMPLATE_DB)} IS '{fingerprint}'"))
+        return True
+    finally:
+        await admin.dispose()
+
+
+async def clone_database(name: str) -> str:
+    """Fresh copy of the template (replacing `name` if it exists); returns its URL."""
+    admin = _admin_engine()
+    try:
+        await _drop(admin, name)
+        async with admin.connect() as conn:
+            await conn.execute(text(f"CREATE DATABASE {_quote(name)} TEMPLATE {_quote(TEMPLATE_DB)}"))
+    finally:
+        await admin.dispose()
+    return database_url(name)
+
+
+async def drop_database(name: str) -> None:
+    admin = _admin_engine()
+    try:
+        await _drop(admin, name)
+    finally:
+        await admin.dispose()
+
+
+def _exempt_savepoints(bind: AsyncEngine) -> None:
+    # A production commit is one COMMIT; here it's a RELEASE plus a new
+    # SAVEPOINT, which would count against the route's query budget
+    exempt = {"query_budget_exempt": True}
+    dialect = bind.sync_engine.dialect
+    dialect.do_savepoint = lambda conn, name: conn.execute(SavepointClause(name), execution_options=exempt)
+    dialect.do_release_savepoint = lambda conn, name: conn.execute(
+        ReleaseSavepointClause(name), execution_options=exempt
+    )
+    dialect.do_rollback_to_savepoint = lambda conn, name: conn.execute(
+        RollbackToSavepointClause(name), execution_options=exempt
+    )
+
+
+@asynccontextmanager
+async def savepoint_session(bind: AsyncEngine) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session inside an outer transaction that is always rolled back. The
+    session's own commit()/rollback() only release/roll back SAVEPOINTs,
+    which are kept out of the per-request query count.
+    """
+    _exempt_savepoints(bind)
+    async with bind.connect() as conn:
+        outer = await conn.begin()
+        session = AsyncSession(
+            bind=conn,
+            expire_on_commit=False,
+            autoflush=False,
+            join_transaction_mode="create_savepoint",
+        )
+        try:
+            yield session
+        finally:
+            await session.close()
+            await outer.rollback()
+
+
+def db_override(session: AsyncSession) -> Callable:
+    """`app.dependency_overrides[get_db]` value that hands out `session`."""
+    async def override():
+        try:
+            yield session
+        finally:
+            # get_db closes its session after each request, dropping whatever
+            # wasn't committed; roll back to the last commit the same way
+            await session.rollback()
+    return override
+
+
+async def check_schema_sync() -> List[tuple]:
+    """
+    Replay the Alembic chain into a scratch database and diff it against the
+    models. Returns the differences (empty = models and migrations agree).
+    """
+    from alembic.autogenerate import compare_metadata
+    from alembic.migration import MigrationContext
+
+    scratch = f"{settings.POSTGRES_DB}_migration_check"
+    admin = _admin_engine()
+    try:
+        await _drop(admin, scratch)
+        async with admin.connect() as conn:
+            await conn.execute(text(f"CREATE DATABASE {_quote(scratch)} TEMPLATE template0"))
+
+        for command in (["stamp", REPLAY_FROM], ["upgrade", "head"]):
+            subprocess.run(
+                [sys.executable, "-m", "alembic", *command],
+                cwd=PROJECT_ROOT,
+                env={**os.environ, "POSTGRES_DB": scratch},
+                check=True,
+            )
+
+        migrated = create_async_engine(database_url(scratch), poolclass=NullPool)
+        try:
+            async with migrated.connect() as conn:
+                return await conn.run_sync(
+                    lambda sync_conn: compare_metadata(MigrationContext.configure(sync_conn), Base.metadata)
+                )
+        finally:
+            await migrated.dispose()
+    finally:
+        await _drop(admin, scratch)
+        await admin.dispose()
+
+
+async def _main(argv: List[str]) -> int:
+    command = argv[0] if argv else "build"
+    if command == "build":
+        rebuilt = await build_template(force="--force" in argv)
+        print(f"{TEMPLATE_DB}: {'built' if rebuilt else 'up to date'}")
+    elif command == "clone":
+        print(await clone_database(argv[1]))
+    elif command == "drop":
+        await drop_database(argv[1])
+    elif command == "check":
+        diffs = await check_schema_sync()
+        for diff in diffs:
+            print(diff)
+        print(f"{len(diffs)} difference(s) between the migration chain and the models")
+        return 1 if diffs else 0
+    else:
+        print(__doc__)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv[1:])))
@@ -0,0 +1,34 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db import health
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    monkeypatch.setattr(health, "_ping_until", {})
+    eng = create_async_engine("sqlite+aiosqlite://")
+    health._install("test", eng)
+    yield eng
+    eng.sync_engine.dispose()
+
+
+def raise_error(eng, error: BaseException) -> None:
+    context = SimpleNamespace(connection=None, is_disconnect=True, original_exception=error)
+    eng.sync_engine.dialect.dispatch.handle_error(context)
+
+
+def test_disconnect_opens_failover_window(engine):
+    raise_error(engine, ConnectionResetError())
+
+    assert "test" in health._ping_until
+
+
+def test_cancelled_query_opens_no_failover_window(engine):
+    # asyncio.timeout() cancels the query mid-flight, which SQLAlchemy reports as a disconnect
+    raise_error(engine, asyncio.CancelledError())
+
+    assert health._ping_until == {}
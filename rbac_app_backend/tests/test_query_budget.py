@@ -0,0 +1,29 @@
+# tests/test_query_budget.py
+import pytest
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.users import User
+
+pytestmark = [
+    pytest.mark.anyio,
+    pytest.mark.skipif(not settings.QUERY_BUDGET_ENFORCE, reason="needs QUERY_BUDGET_ENFORCE=true"),
+]
+
+PASSWORD = "Test-Passw0rd!"
+
+
+async def test_write_over_budget_is_rolled_back(db, client, monkeypatch):
+    await client.post("/signup", json={"email": "root@example.com", "password": PASSWORD})
+    login = await client.post("/login", json={"email": "root@example.com", "password": PASSWORD})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    # The auth lookup and the INSERT are two statements
+    monkeypatch.setitem(settings.ROUTE_QUERY_BUDGETS, "POST /users/", 1)
+
+    created = await client.post(
+        "/users/", headers=headers, json={"email": "user@example.com", "password": PASSWORD}
+    )
+
+    assert created.status_code == 500
+    assert "Query budget exceeded" in created.json()["detail"]
+    assert await db.scalar(select(User.id).where(User.email == "user@example.com")) is None
@@ -0,0 +1,20 @@
+from types import SimpleNamespace
+
+from app.db.session import _commit_lsn
+
+
+class FailingConnection:
+    dialect = SimpleNamespace(name="postgresql")
+
+    def exec_driver_sql(self, statement, execution_options=None):
+        raise ConnectionResetError("connection lost after COMMIT")
+
+
+def test_failed_lsn_read_skips_the_watermark(caplog):
+    # The write is already committed: the response must still go out
+    assert _commit_lsn(FailingConnection()) is None
+    assert "sending no watermark" in caplog.text
+
+
+def test_no_lsn_off_postgres():
+    assert _commit_lsn(SimpleNamespace(dialect=SimpleNamespace(name="sqlite"))) is None
@@ -0,0 +1,48 @@
+# tests/test_savepoint_session.py
+import pytest
+from sqlalchemy import func, select
+
+from app.db.session import get_db
+from app.main import app
+from app.models.users import User
+from conftest import api_client
+from db_template import db_override, savepoint_session
+
+pytestmark = pytest.mark.anyio
+
+PASSWORD = "Test-Passw0rd!"
+
+
+async def create_user_through_api(client) -> int:
+    # Signup, login and create each commit, or release the connection mid-request
+    signup = await client.post("/signup", json={"email": "root@example.com", "password": PASSWORD})
+    assert signup.status_code == 200, signup.text
+    login = await client.post("/login", json={"email": "root@example.com", "password": PASSWORD})
+    assert login.status_code == 200, login.text
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    created = await client.post(
+        "/users/", headers=headers, json={"email": "user@example.com", "password": PASSWORD}
+    )
+    assert created.status_code == 200, created.text
+    return created.json()["id"]
+
+
+async def test_committed_writes_are_visible_within_the_test(db, client):
+    user_id = await create_user_through_api(client)
+
+    row = (await db.execute(select(User.email, User.is_active).where(User.id == user_id))).one()
+    assert row == ("user@example.com", True)
+
+
+async def test_writes_are_rolled_back_after_the_test(test_engine):
+    async with savepoint_session(test_engine) as session:
+        app.dependency_overrides[get_db] = db_override(session)
+        try:
+            async with api_client() as client:
+                await create_user_through_api(client)
+            assert await session.scalar(select(func.count()).select_from(User)) == 2
+        finally:
+            app.dependency_overrides.clear()
+
+    async with test_engine.connect() as conn:
+        assert await conn.scalar(select(func.count()).select_from(User)) == 0
@@ -0,0 +1,13 @@
+import pytest
+
+from app.core.config import settings
+from db_template import check_schema_sync
+
+pytestmark = [
+    pytest.mark.anyio,
+    pytest.mark.skipif(settings.DB_BACKEND != "postgresql", reason="migrations target postgresql"),
+]
+
+
+async def test_migrations_match_models():
+    assert await check_schema_sync() == []
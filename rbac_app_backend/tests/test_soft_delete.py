@@ -0,0 +1,20 @@
+import pytest
+from sqlalchemy import insert
+
+from app.models.users import User
+from app.schemas.create_admin import RoleEnum
+from app.services.user_purge_service import soft_delete_user
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_second_soft_delete_reports_nothing_deleted(db):
+    user_id = await db.scalar(
+        insert(User)
+        .values(email="user@example.com", hashed_password="x", role=RoleEnum.user)
+        .returning(User.id)
+    )
+
+    assert await soft_delete_user(db, user_id) == 1
+    # A repeated or concurrent DELETE must not report success again
+    assert await soft_delete_user(db, user_id) == 0
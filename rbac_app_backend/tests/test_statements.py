@@ -0,0 +1,23 @@
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.db.statements import _prepare_on_connect, prepared_sql
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_hot_statements_are_cached_on_connect(test_engine):
+    # Guards the private adapter API the connect hook relies on: after a
+    # SQLAlchemy upgrade this fails instead of every first request re-preparing.
+    engine = create_async_engine(test_engine.url, poolclass=NullPool)
+    _prepare_on_connect(engine)
+    try:
+        async with engine.connect() as conn:
+            dbapi_connection = (await conn.get_raw_connection()).dbapi_connection
+            cached = dbapi_connection._prepared_statement_cache
+            assert cached is not None
+            missing = [sql for sql in prepared_sql(engine.sync_engine.dialect) if sql not in cached]
+            assert missing == []
+    finally:
+        await engine.dispose()